@@ -0,0 +1,7 @@
+"""Performance benchmarks for the Warcraft Rumble data extractor."""
+
+import sys
+from pathlib import Path
+
+# Make the package importable when running ``python -m benchmarks``
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
@@ -0,0 +1,90 @@
+"""Run the extraction benchmark suite.
+
+``python -m benchmarks`` runs all benchmarks on the synthetic fixtures and
+appends the timings to ``benchmarks/results/history.jsonl``. With
+``--compare`` the run is checked against the median of the last five
+entries from the same machine and parser, and the exit code is 1 if a
+benchmark got slower by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from wcr_data_extraction.fetcher import configure_structlog
+from wcr_data_extraction.parsing import DEFAULT_PARSER, PARSERS
+
+from .history import (
+    DEFAULT_THRESHOLD,
+    HISTORY_PATH,
+    append_history,
+    compare,
+    find_baseline,
+    load_history,
+    make_entry,
+)
+from .suite import BENCHMARKS, run_suite
+
+
+def format_table(
+    results: dict[str, float], baseline: dict[str, float] | None = None
+) -> str:
+    """Return ``results`` in milliseconds, with the change to ``baseline``."""
+
+    lines = [f"{'benchmark':<16} {'ms':>10} {'baseline':>10} {'change':>8}"]
+    for name, seconds in results.items():
+        before = (baseline or {}).get(name)
+        if before:
+            extra = f"{before * 1000:>10.3f} {(seconds / before - 1):>+8.1%}"
+        else:
+            extra = f"{'-':>10} {'-':>8}"
+        lines.append(f"{name:<16} {seconds * 1000:>10.3f} {extra}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds")
+    parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER)
+    parser.add_argument("--workers", type=int, default=1, help="fetch_units workers")
+    parser.add_argument(
+        "--only", nargs="+", choices=BENCHMARKS, help="Benchmarks to run"
+    )
+    parser.add_argument("--history", default=str(HISTORY_PATH), help="Results file")
+    parser.add_argument("--compare", action="store_true", help="Fail on regressions")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown before --compare fails (0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not append to the history"
+    )
+    args = parser.parse_args(argv)
+
+    configure_structlog("WARNING")
+    history = load_history(args.history)
+    baseline = find_baseline(history, parser=args.parser)
+
+    results = run_suite(
+        repeat=args.repeat, parser=args.parser, workers=args.workers, only=args.only
+    )
+    print(format_table(results, baseline))
+    if not args.no_save:
+        append_history(make_entry(results, parser=args.parser), args.history)
+
+    if not args.compare:
+        return 0
+    if baseline is None:
+        print("No baseline in the history yet, nothing to compare")
+        return 0
+    regressions = compare(baseline, results, args.threshold)
+    for name, change in regressions.items():
+        print(f"REGRESSION {name}: {change:+.1%} (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Store benchmark results and compare runs against earlier ones."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+HISTORY_PATH = Path(__file__).resolve().parent / "results" / "history.jsonl"
+DEFAULT_THRESHOLD = 0.2
+BASELINE_WINDOW = 5
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def make_entry(results: dict[str, float], *, parser: str) -> dict:
+    """Return a history entry describing ``results`` and where they came from."""
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "parser": parser,
+        "results": results,
+    }
+
+
+def load_history(path: Path | str = HISTORY_PATH) -> list[dict]:
+    """Return all entries stored in the JSON lines file ``path``."""
+
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(entry: dict, path: Path | str = HISTORY_PATH) -> None:
+    """Append ``entry`` as one line to ``path``."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+
+def find_baseline(
+    history: list[dict], *, parser: str, window: int = BASELINE_WINDOW
+) -> dict[str, float] | None:
+    """Return median timings of the last ``window`` matching entries.
+
+    Only entries recorded on this machine with ``parser`` are used; the
+    median keeps a single noisy run from skewing the comparison.
+    """
+
+    machine = platform.node()
+    entries = [
+        entry["results"]
+        for entry in history
+        if entry.get("parser") == parser and entry.get("machine") == machine
+    ][-window:]
+    if not entries:
+        return None
+    names = {name for results in entries for name in results}
+    return {
+        name: statistics.median(r[name] for r in entries if name in r)
+        for name in sorted(names)
+    }
+
+
+def compare(
+    baseline: dict[str, float],
+    current: dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> dict[str, float]:
+    """Return the relative slowdown of benchmarks slower by over ``threshold``."""
+
+    regressions = {}
+    for name, seconds in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        change = seconds / before - 1
+        if change > threshold:
+            regressions[name] = change
+    return regressions
@@ -0,0 +1,58 @@
+"""Measure the import cost of the package with ``python -X importtime``.
+
+Every measurement runs in a fresh interpreter, so modules imported by an
+earlier benchmark or test do not hide the cost.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import wcr_data_extraction
+
+# Imported by the fetch run only; importing the package must not load them
+HEAVY_MODULES = ("requests", "urllib3", "bs4", "structlog", "httpx", "asyncio")
+
+SRC_DIR = Path(wcr_data_extraction.__file__).resolve().parents[1]
+
+
+def importtime(code: str) -> dict[str, int]:
+    """Run ``code`` in a new interpreter and return its imports.
+
+    Maps every imported module to its cumulative import time in
+    microseconds, as reported by ``-X importtime``.
+    """
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    modules: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def cli_import_time(repeat: int) -> float:
+    """Return the fastest import of :mod:`wcr_data_extraction.cli` in seconds."""
+
+    return (
+        min(
+            importtime("import wcr_data_extraction.cli")["wcr_data_extraction.cli"]
+            for _ in range(repeat)
+        )
+        / 1e6
+    )
@@ -0,0 +1,126 @@
+"""Load test the fetchers against the local stand-in server.
+
+Run ``python -m benchmarks.load --workers 1 4 16 --latency 0.05`` from the
+repository root. Every worker count gets a fresh :class:`.server.StandInServer`
+with the same seed, so the injected failures repeat exactly between runs.
+``--cache`` adds a second, warm pass over the same HTTP cache and ``--gzip``
+shows the effect of compression on the transferred kilobytes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.fetcher import (
+    FetchError,
+    configure_structlog,
+    fetch_units,
+    fetch_units_async,
+)
+from wcr_data_extraction.instrumentation import Timings
+
+from .server import (
+    StandInServer,
+    add_server_arguments,
+    faults_from_args,
+    pages_from_args,
+)
+from .stub import FIXTURE_DIR
+
+
+def run_once(
+    server: StandInServer,
+    workdir: Path,
+    *,
+    workers: int,
+    engine: str = "threads",
+    adaptive: bool = False,
+    cache_dir: Path | None = None,
+    parse_processes: int = 0,
+) -> dict:
+    """Fetch all units from ``server`` once and return timing and counters."""
+
+    before = dict(server.stats)
+    timings = Timings()
+    previous_site = fetcher.SITE_URL
+    fetcher.set_site_url(server.url)
+    kwargs = dict(
+        out_path=workdir / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        cache_dir=cache_dir,
+        adaptive=adaptive,
+        parse_processes=parse_processes,
+        timings=timings,
+    )
+    error = None
+    start = time.perf_counter()
+    try:
+        if engine == "async":
+            asyncio.run(fetch_units_async(max_concurrency=workers, **kwargs))
+        else:
+            fetch_units(max_workers=workers, **kwargs)
+    except FetchError as exc:
+        error = str(exc)
+    finally:
+        fetcher.set_site_url(previous_site)
+    seconds = time.perf_counter() - start
+    counts = {key: server.stats[key] - before[key] for key in server.stats}
+    bandwidth = timings.bandwidth()
+    return {
+        "workers": workers,
+        "seconds": seconds,
+        "error": error,
+        "wire_bytes": bandwidth["wire_bytes"],
+        "body_bytes": bandwidth["body_bytes"],
+        **counts,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads")
+    parser.add_argument("--adaptive", action="store_true")
+    parser.add_argument("--parse-processes", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="Add a warm pass")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_structlog("WARNING")
+    overview, details = pages_from_args(args)
+    print(
+        f"{'workers':>7} {'pass':>5} {'seconds':>8} {'requests':>8} "
+        f"{'ok':>5} {'304':>5} {'5xx':>5} {'429':>5} {'reset':>5} {'wire KB':>8}"
+        "  error"
+    )
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp, StandInServer(
+            overview, details, faults=faults_from_args(args)
+        ) as server:
+            cache_dir = Path(tmp) / "cache" if args.cache else None
+            passes = ["cold", "warm"] if args.cache else ["cold"]
+            for name in passes:
+                row = run_once(
+                    server,
+                    Path(tmp),
+                    workers=workers,
+                    engine=args.engine,
+                    adaptive=args.adaptive,
+                    cache_dir=cache_dir,
+                    parse_processes=args.parse_processes,
+                )
+                print(
+                    f"{workers:>7} {name:>5} {row['seconds']:>8.2f} "
+                    f"{row['requests']:>8} {row['ok']:>5} {row['not_modified']:>5} "
+                    f"{row['errors']:>5} {row['throttled']:>5} {row['resets']:>5}"
+                    f" {row['wire_bytes'] / 1024:>8.1f}  {row['error'] or ''}"
+                )
+
+
+if __name__ == "__main__":
+    main()
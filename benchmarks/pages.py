@@ -0,0 +1,170 @@
+"""Render method.gg-like HTML pages from exported unit data.
+
+The markup mirrors the structure the extractors rely on (``mini-wrapper``
+cards, ``mini-section`` blocks) and surrounds it with navigation, ads and a
+footer so page sizes resemble the real site.
+"""
+
+from __future__ import annotations
+
+import json
+from html import escape
+from pathlib import Path
+
+EXPORT_DIR = Path(__file__).resolve().parents[1] / "data" / "export"
+
+
+def load_dataset(
+    units_path: Path | str | None = None,
+    categories_path: Path | str | None = None,
+) -> tuple[list[dict], dict]:
+    """Return the exported units and categories used to render pages."""
+
+    units_path = Path(units_path or EXPORT_DIR / "units.json")
+    categories_path = Path(categories_path or EXPORT_DIR / "categories.json")
+    with open(units_path, encoding="utf-8") as f:
+        units = json.load(f)
+    with open(categories_path, encoding="utf-8") as f:
+        categories = json.load(f)
+    return units, categories
+
+
+def _names(categories: dict, key: str) -> dict[str, str]:
+    return {item["id"]: item["names"]["en"] for item in categories.get(key, [])}
+
+
+def _chrome(title: str, body: str) -> str:
+    nav = "".join(
+        f'<li class="nav-item"><a href="/warcraft-rumble/guides/{i}">'
+        f"Guide {i}</a></li>"
+        for i in range(120)
+    )
+    footer = "".join(f"<p class='legal'>Footer paragraph {i}.</p>" for i in range(30))
+    return (
+        "<!DOCTYPE html><html lang='en'><head>"
+        f"<title>{escape(title)} - Warcraft Rumble - Method</title>"
+        "<meta charset='utf-8'>"
+        "<script>window.dataLayer = window.dataLayer || [];</script>"
+        "<style>.mini-section{margin:0}.nav-item{display:inline}</style>"
+        "</head><body>"
+        f"<header><nav class='site-nav'><ul>{nav}</ul></nav></header>"
+        "<div class='ad-slot'><div class='ad'>Advertisement</div></div>"
+        f"<main class='content'>{body}</main>"
+        f"<footer class='site-footer'>{footer}</footer>"
+        "</body></html>"
+    )
+
+
+def render_overview(units: list[dict], categories: dict) -> str:
+    """Return an overview page with one ``mini-wrapper`` card per unit."""
+
+    factions = _names(categories, "factions")
+    types = _names(categories, "types")
+    traits = _names(categories, "traits")
+    speeds = _names(categories, "speeds")
+    cards = []
+    for unit in units:
+        family = ",".join(factions.get(f, f.title()) for f in unit["faction_ids"])
+        speed = speeds.get(unit.get("speed_id"), "Stationary")
+        trait_names = ",".join(traits.get(t, t) for t in unit.get("trait_ids", []))
+        attrs = {
+            "data-name": unit["names"]["en"],
+            "data-family": family,
+            "data-type": types.get(unit.get("type_id"), unit.get("type_id") or ""),
+            "data-cost": unit.get("cost"),
+            "data-damage": unit.get("damage"),
+            "data-health": unit.get("health"),
+            "data-dps": unit.get("dps"),
+            "data-speed": speed,
+            "data-traits": trait_names,
+        }
+        attr_html = " ".join(
+            f'{key}="{escape(str(value))}"'
+            for key, value in attrs.items()
+            if value is not None
+        )
+        cards.append(
+            f'<div class="mini-wrapper" {attr_html}>'
+            f'<a class="mini-link" href="/warcraft-rumble/minis/{unit["id"]}">'
+            f'<img src="{escape(unit.get("image") or "")}" '
+            f'alt="{escape(unit["names"]["en"])}"></a>'
+            f'<span class="mini-name">{escape(unit["names"]["en"])}</span></div>'
+        )
+    body = "<div class='minis-grid'>" + "".join(cards) + "</div>"
+    return _chrome("Minis", body)
+
+
+def _tile(label: str, info: str) -> str:
+    return (
+        '<div class="mini-details-tile">'
+        f'<div class="detail-label">{escape(label)}</div>'
+        f'<div class="detail-info">{escape(info)}</div></div>'
+    )
+
+
+def _trait_tile(name: str, description: str | None) -> str:
+    desc = (
+        f'<div class="mini-talent__description">{escape(description)}</div>'
+        if description
+        else ""
+    )
+    return (
+        '<div class="mini-trait-tile">'
+        f'<div class="detail-info">{escape(name)}</div>{desc}</div>'
+    )
+
+
+def _section(title: str, content: str) -> str:
+    return f'<div class="mini-section"><h2>{escape(title)}</h2>{content}</div>'
+
+
+def render_detail(unit: dict, categories: dict) -> str:
+    """Return a details page for ``unit`` with the five ``mini-section`` blocks."""
+
+    traits = _names(categories, "traits")
+    trait_desc = {
+        item["id"]: item.get("descriptions", {}).get("en")
+        for item in categories.get("traits", [])
+    }
+    details = unit.get("details", {})
+
+    core = details.get("core_trait", {})
+    info_tiles = [_tile("Cost", str(unit.get("cost")))]
+    if "attack_id" in core:
+        info_tiles.append(
+            _tile("Core Trait Attack", traits.get(core["attack_id"], core["attack_id"]))
+        )
+    if "type_id" in core:
+        info_tiles.append(
+            _tile("Core Trait Type", traits.get(core["type_id"], core["type_id"]))
+        )
+    sections = [_section("Mini Information", "".join(info_tiles))]
+
+    stats = "".join(_tile(k, v) for k, v in details.get("stats", {}).items())
+    sections.append(_section("Stats", stats))
+
+    trait_tiles = "".join(
+        _trait_tile(traits.get(t, t), trait_desc.get(t))
+        for t in details.get("traits", [])
+    )
+    sections.append(_section("Traits", trait_tiles))
+
+    talent_tiles = "".join(
+        _trait_tile(t["name"]["en"], t.get("description", {}).get("en"))
+        for t in details.get("talents", [])
+    )
+    sections.append(_section("Talents", talent_tiles))
+
+    if "advanced_info" in details:
+        lines = details["advanced_info"].splitlines()
+        slots = details.get("army_bonus_slots", [])
+        if slots:
+            lines = ["Available army bonus slots for the bottom row"] + slots + lines
+        paragraphs = "".join(f"<p>{escape(line)}</p>" for line in lines)
+        sections.append(
+            _section(
+                "Advanced Mini Information",
+                f'<div class="mini-content">{paragraphs}</div>',
+            )
+        )
+    return _chrome(unit["names"]["en"], "".join(sections))
@@ -0,0 +1,96 @@
+"""Measure the per-page parse cost of each HTML parser backend.
+
+Run ``python -m benchmarks.parsers`` from the repository root. Pages are
+rendered from ``data/export`` unless HTML files are passed as arguments.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from wcr_data_extraction.fetcher import (
+    _parse_overview,
+    load_categories,
+    parse_unit_details,
+)
+from wcr_data_extraction.parsing import PARSERS, get_parser
+
+from .pages import load_dataset, render_detail, render_overview
+
+
+def available_parsers() -> list[str]:
+    """Return the backends whose optional dependencies are installed."""
+
+    names = []
+    for name in PARSERS:
+        try:
+            get_parser(name).parse("<p></p>")
+        except Exception:  # missing lxml raises bs4.FeatureNotFound
+            continue
+        names.append(name)
+    return names
+
+
+def time_per_page(func, pages: list[str], repeat: int) -> float:
+    """Return the best average seconds per page over ``repeat`` rounds."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, (time.perf_counter() - start) / len(pages))
+    return best
+
+
+def bench_parsers(
+    detail_pages: list[str],
+    overview_pages: list[str],
+    *,
+    repeat: int = 3,
+    parsers: list[str] | None = None,
+) -> dict[str, dict[str, float]]:
+    """Return seconds per page for detail and overview parsing by backend."""
+
+    cats = load_categories()
+    results: dict[str, dict[str, float]] = {}
+    for name in parsers or available_parsers():
+        results[name] = {
+            "detail": time_per_page(
+                lambda html: parse_unit_details(html, cats, parser=name),
+                detail_pages,
+                repeat,
+            ),
+            "overview": time_per_page(
+                lambda html: _parse_overview(html, name), overview_pages, repeat
+            ),
+        }
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="Detail page HTML files")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds")
+    args = parser.parse_args(argv)
+
+    units, categories = load_dataset()
+    if args.pages:
+        details = [Path(p).read_text(encoding="utf-8") for p in args.pages]
+    else:
+        details = [render_detail(unit, categories) for unit in units]
+    overview = [render_overview(units, categories)]
+
+    results = bench_parsers(details, overview, repeat=args.repeat)
+    print(f"{'parser':<12} {'detail ms/page':>15} {'overview ms/page':>17}")
+    for name, timings in results.items():
+        print(
+            f"{name:<12} {timings['detail'] * 1000:>15.2f} "
+            f"{timings['overview'] * 1000:>17.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
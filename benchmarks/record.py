@@ -0,0 +1,72 @@
+"""Render the synthetic HTML fixtures used by the benchmark suite.
+
+Run ``python -m benchmarks.record`` from the repository root. An evenly
+spaced sample of the units in ``data/export`` is rendered with
+:mod:`.pages` into ``benchmarks/fixtures``: ``overview.html``, one page per
+mini under ``minis/`` and the matching ``units.json``/``categories.json``.
+The pages are generated, not captured from method.gg, so they only cover
+the markup :mod:`.pages` produces. Re-record after changing :mod:`.pages`
+so timings stay comparable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+from .pages import load_dataset, render_detail, render_overview
+from .stub import FIXTURE_DIR
+
+SAMPLE_SIZE = 16
+
+
+def sample_units(units: list[dict], size: int = SAMPLE_SIZE) -> list[dict]:
+    """Return ``size`` units spread evenly over ``units``."""
+
+    step = max(1, len(units) // size)
+    return units[::step][:size]
+
+
+def record(
+    fixture_dir: Path | str = FIXTURE_DIR,
+    *,
+    size: int = SAMPLE_SIZE,
+    units_path: Path | str | None = None,
+    categories_path: Path | str | None = None,
+) -> list[str]:
+    """Write the fixtures to ``fixture_dir`` and return the rendered unit ids."""
+
+    fixture_dir = Path(fixture_dir)
+    units, categories = load_dataset(units_path, categories_path)
+    chosen = sample_units(units, size)
+
+    minis_dir = fixture_dir / "minis"
+    shutil.rmtree(minis_dir, ignore_errors=True)
+    minis_dir.mkdir(parents=True)
+    (fixture_dir / "overview.html").write_text(
+        render_overview(chosen, categories) + "\n", encoding="utf-8"
+    )
+    for unit in chosen:
+        (minis_dir / f"{unit['id']}.html").write_text(
+            render_detail(unit, categories) + "\n", encoding="utf-8"
+        )
+    for name, data in (("units.json", chosen), ("categories.json", categories)):
+        with open(fixture_dir / name, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+    return [unit["id"] for unit in chosen]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=str(FIXTURE_DIR), help="Fixture dir")
+    parser.add_argument("--size", type=int, default=SAMPLE_SIZE, help="Pages")
+    args = parser.parse_args(argv)
+    ids = record(args.output, size=args.size)
+    print(f"Recorded {len(ids)} detail pages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
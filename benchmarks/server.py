@@ -0,0 +1,318 @@
+"""Local stand-in for method.gg with latency and failure injection.
+
+The server answers the overview and detail page URLs with the fixtures
+rendered by :mod:`.record` or with any number of pages rendered by
+:mod:`.pages`, optionally gzip compressed. Each request can be delayed,
+throttled to a bandwidth, answered with a random ``5xx``/``429`` or dropped
+with a TCP reset. Random decisions come from a seeded generator, so the same
+configuration produces the same sequence of failures.
+
+Run ``python -m benchmarks.server --latency 0.05 --error-rate 0.02`` and
+point the extractor at it with ``--site-url http://127.0.0.1:8000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import random
+import socket
+import ssl
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from wcr_data_extraction.fetcher import MINIS_PATH
+
+from .pages import load_dataset, render_detail, render_overview
+from .stub import load_fixtures
+
+
+@dataclass
+class Faults:
+    """Per-request behaviour of the stand-in server.
+
+    ``latency`` and ``jitter`` are seconds added before answering,
+    ``bandwidth`` limits the body to that many bytes per second (``0`` means
+    unlimited) and the rates are probabilities per request. ``429`` answers
+    carry ``Retry-After: retry_after`` unless it is ``None``. With ``gzip``
+    pages are compressed for clients accepting it.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    bandwidth: int = 0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    reset_rate: float = 0.0
+    retry_after: int | None = 1
+    etag: bool = True
+    gzip: bool = False
+    seed: int = 0
+
+
+def synthetic_pages(count: int) -> tuple[str, dict[str, str]]:
+    """Return an overview and ``count`` detail pages built from ``data/export``.
+
+    Exported units are reused round robin with numbered ids, so any number of
+    distinct minis can be served.
+    """
+
+    units, categories = load_dataset()
+    generated = []
+    for index in range(count):
+        unit = dict(units[index % len(units)])
+        unit["id"] = f"{unit['id']}-{index}"
+        unit["names"] = {"en": f"{unit['names']['en']} {index}"}
+        generated.append(unit)
+    details = {unit["id"]: render_detail(unit, categories) for unit in generated}
+    return render_overview(generated, categories), details
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP(S) server answering like method.gg."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        overview: str,
+        details: dict[str, str],
+        *,
+        faults: Faults | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        certfile: str | None = None,
+        keyfile: str | None = None,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.pages = {MINIS_PATH: overview.encode("utf-8")}
+        for unit_id, html in details.items():
+            self.pages[f"{MINIS_PATH}/{unit_id}"] = html.encode("utf-8")
+        self.etags = {
+            path: '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            for path, body in self.pages.items()
+        }
+        self.faults = faults or Faults()
+        self.compressed = (
+            {path: gzip.compress(body, mtime=0) for path, body in self.pages.items()}
+            if self.faults.gzip
+            else {}
+        )
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0}
+        self.stats.update(errors=0, throttled=0, resets=0, not_found=0)
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.scheme = "http"
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+            self.scheme = "https"
+
+    @property
+    def url(self) -> str:
+        """Return the site URL to pass to ``set_site_url``/``--site-url``."""
+
+        host, port = self.server_address[:2]
+        return f"{self.scheme}://{host}:{port}"
+
+    def decide(self) -> tuple[str, float]:
+        """Return the outcome and delay for the next request."""
+
+        faults = self.faults
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            delay = faults.latency + self._random.uniform(0, faults.jitter)
+        if roll < faults.reset_rate:
+            return "reset", delay
+        roll -= faults.reset_rate
+        if roll < faults.error_rate:
+            return "error", delay
+        roll -= faults.error_rate
+        if roll < faults.throttle_rate:
+            return "throttle", delay
+        return "ok", delay
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def start(self) -> StandInServer:
+        """Serve in a background thread and return ``self``."""
+
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> StandInServer:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        outcome, delay = self.server.decide()
+        if delay:
+            time.sleep(delay)
+        if outcome == "reset":
+            self.server.count("resets")
+            self._reset()
+            return
+        if outcome == "error":
+            self.server.count("errors")
+            self._send(503, b"Service Unavailable")
+            return
+        if outcome == "throttle":
+            self.server.count("throttled")
+            retry_after = self.server.faults.retry_after
+            headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+            self._send(429, b"Too Many Requests", headers)
+            return
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        body = self.server.pages.get(path)
+        if body is None:
+            self.server.count("not_found")
+            self._send(404, b"Not Found")
+            return
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if self.server.faults.etag:
+            etag = self.server.etags[path]
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self.server.count("not_modified")
+                self._send(304, b"", headers)
+                return
+        if path in self.server.compressed:
+            headers["Vary"] = "Accept-Encoding"
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                headers["Content-Encoding"] = "gzip"
+                body = self.server.compressed[path]
+        self.server.count("ok")
+        self._send(200, body, headers)
+
+    def _send(self, status: int, body: bytes, headers: dict | None = None) -> None:
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status == 304:
+            return
+        bandwidth = self.server.faults.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        # Send in tenths of a second worth of bytes to cap the rate
+        chunk = max(1, bandwidth // 10)
+        for start in range(0, len(body), chunk):
+            part = body[start : start + chunk]
+            time.sleep(len(part) / bandwidth)
+            self.wfile.write(part)
+            self.wfile.flush()
+
+    def _reset(self) -> None:
+        # SO_LINGER with a zero timeout makes close() send RST instead of FIN
+        self.connection.setsockopt(
+            socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+        )
+        self.close_connection = True
+        self.connection.close()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the page source and fault injection options to ``parser``."""
+
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Serve N generated minis"
+    )
+    parser.add_argument("--fixtures", default=None, help="Fixture directory")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra seconds")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Bytes/second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 share")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="429 share")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="RST share")
+    parser.add_argument("--no-etag", action="store_true", help="Omit ETags")
+    parser.add_argument("--gzip", action="store_true", help="Compress pages")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+
+def pages_from_args(args: argparse.Namespace) -> tuple[str, dict[str, str]]:
+    """Return the overview and detail pages selected by the options."""
+
+    if args.synthetic:
+        return synthetic_pages(args.synthetic)
+    return load_fixtures(args.fixtures)
+
+
+def faults_from_args(args: argparse.Namespace) -> Faults:
+    """Return the :class:`Faults` described by the options."""
+
+    return Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        bandwidth=args.bandwidth,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        reset_rate=args.reset_rate,
+        etag=not args.no_etag,
+        gzip=args.gzip,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_server_arguments(parser)
+    parser.add_argument("--certfile", help="PEM certificate to serve HTTPS")
+    parser.add_argument("--keyfile", help="PEM key for --certfile")
+    args = parser.parse_args(argv)
+
+    overview, details = pages_from_args(args)
+    server = StandInServer(
+        overview,
+        details,
+        faults=faults_from_args(args),
+        host=args.host,
+        port=args.port,
+        certfile=args.certfile,
+        keyfile=args.keyfile,
+    )
+    print(f"Serving {len(details)} minis at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(server.stats)
+
+
+if __name__ == "__main__":
+    main()
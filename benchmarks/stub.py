@@ -0,0 +1,88 @@
+"""Serve the synthetic fixture pages to ``requests`` without network access."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+from wcr_data_extraction import fetcher
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_fixtures(fixture_dir: Path | str | None = None) -> tuple[str, dict[str, str]]:
+    """Return the fixture overview page and detail pages keyed by unit id."""
+
+    fixture_dir = Path(fixture_dir or FIXTURE_DIR)
+    overview = (fixture_dir / "overview.html").read_text(encoding="utf-8")
+    details = {
+        path.stem: path.read_text(encoding="utf-8")
+        for path in sorted((fixture_dir / "minis").glob("*.html"))
+    }
+    return overview, details
+
+
+class StubAdapter(BaseAdapter):
+    """Answer overview and detail page requests from memory.
+
+    ``latency`` seconds are slept before every answer to imitate the network.
+    Unknown paths get a ``404``.
+    """
+
+    def __init__(
+        self, overview: str, details: dict[str, str], *, latency: float = 0.0
+    ) -> None:
+        super().__init__()
+        self.overview = overview
+        self.details = details
+        self.latency = latency
+        self.requests = 0
+        self._base_path = urlsplit(fetcher.BASE_URL).path.rstrip("/")
+
+    def page(self, path: str) -> str | None:
+        """Return the page served for the URL ``path`` or ``None``."""
+
+        path = path.rstrip("/")
+        if path == self._base_path:
+            return self.overview
+        if path.startswith(self._base_path + "/"):
+            return self.details.get(path.rsplit("/", 1)[1])
+        return None
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        body = self.page(urlsplit(request.url).path)
+        response = Response()
+        response.status_code = 404 if body is None else 200
+        response.reason = "Not Found" if body is None else "OK"
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "text/html; charset=utf-8"}
+        )
+        response._content = (body or "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def stub_session(
+    overview: str, details: dict[str, str], *, latency: float = 0.0
+) -> requests.Session:
+    """Return a session whose requests are answered by a :class:`StubAdapter`."""
+
+    session = requests.Session()
+    adapter = StubAdapter(overview, details, latency=latency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,132 @@
+"""Benchmarks of the extraction pipeline on the synthetic fixtures.
+
+Every benchmark reports the best time over ``repeat`` rounds in seconds:
+
+``parse_detail``
+    :func:`parse_unit_details` per detail page.
+``parse_overview``
+    Parsing the overview page into cards.
+``fetch_units``
+    A complete :func:`fetch_units` run against a :class:`.stub.StubAdapter`.
+``json_dump``
+    Serialising the fixture units like ``units.json`` is written.
+``merge``
+    :func:`is_unit_changed` per unit against the fixture units.
+``import_cli``
+    Importing :mod:`wcr_data_extraction.cli` in a fresh interpreter.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from wcr_data_extraction.fetcher import (
+    _build_unit,
+    _card_link,
+    _parse_overview,
+    fetch_units,
+    is_unit_changed,
+    load_categories,
+    load_existing_units,
+    parse_unit_details,
+)
+from wcr_data_extraction.parsing import DEFAULT_PARSER
+
+from .imports import cli_import_time
+from .parsers import time_per_page
+from .stub import FIXTURE_DIR, load_fixtures, stub_session
+
+BENCHMARKS = (
+    "parse_detail",
+    "parse_overview",
+    "fetch_units",
+    "json_dump",
+    "merge",
+    "import_cli",
+)
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Return the fastest of ``repeat`` calls of ``func`` in seconds."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(
+    *,
+    repeat: int = 5,
+    parser: str = DEFAULT_PARSER,
+    workers: int = 1,
+    fixture_dir: Path | str | None = None,
+    only: list[str] | None = None,
+) -> dict[str, float]:
+    """Run the benchmarks named in ``only`` (default all) and return timings."""
+
+    fixture_dir = Path(fixture_dir or FIXTURE_DIR)
+    overview_html, pages = load_fixtures(fixture_dir)
+    categories_path = fixture_dir / "categories.json"
+    units_path = fixture_dir / "units.json"
+    cats = load_categories(categories_path)
+    existing = load_existing_units(units_path)
+
+    scraped = []
+    for card in _parse_overview(overview_html, parser).cards:
+        details = parse_unit_details(pages[_card_link(card)[1]], cats, parser=parser)
+        details.pop("trait_descriptions", None)
+        scraped.append(_build_unit(card, details, cats))
+    # Single comparisons take microseconds, so time many for a stable average
+    pairs = [(existing[u["id"]], u) for u in scraped if u["id"] in existing] * 100
+    units = list(existing.values())
+
+    def run_fetch_units(out_dir: Path) -> None:
+        session = stub_session(overview_html, pages)
+        fetch_units(
+            out_path=out_dir / "units.json",
+            categories_path=categories_path,
+            session=session,
+            existing_path=units_path,
+            max_workers=workers,
+            parser=parser,
+        )
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmarks: dict[str, Callable[[], float]] = {
+            "parse_detail": lambda: time_per_page(
+                lambda html: parse_unit_details(html, cats, parser=parser),
+                list(pages.values()),
+                repeat,
+            ),
+            "parse_overview": lambda: time_per_page(
+                lambda html: _parse_overview(html, parser), [overview_html], repeat
+            ),
+            "fetch_units": lambda: best_time(
+                lambda: run_fetch_units(Path(tmp)), repeat
+            ),
+            "json_dump": lambda: best_time(
+                lambda: json.dumps(units, indent=2, ensure_ascii=False), repeat
+            ),
+            "merge": lambda: time_per_page(
+                lambda pair: is_unit_changed(*pair), pairs, repeat
+            ),
+            "import_cli": lambda: cli_import_time(repeat),
+        }
+        for name in only or BENCHMARKS:
+            # Collector pauses would otherwise land in random rounds
+            gc.collect()
+            gc.disable()
+            try:
+                results[name] = benchmarks[name]()
+            finally:
+                gc.enable()
+    return results
@@ -5,7 +5,7 @@ All command line arguments are passed directly to :mod:`wcr_data_extraction.cli`
 """
 
 import argparse
-import json
+from functools import partial
 from pathlib import Path
 import sys
 from typing import List
@@ -15,12 +15,15 @@ sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 from wcr_data_extraction import cli  # noqa: E402
 from wcr_data_extraction import fetcher  # noqa: E402
 from wcr_data_extraction.fetcher import (  # noqa: E402
-    fetch_units,
-    fetch_categories,
+    create_session,
+    fetch_overview,
     configure_structlog,
     FetchError,
+    log_cache_summary,
+    log_pool_summary,
     logger,
 )
+from wcr_data_extraction.instrumentation import Timings, profiled  # noqa: E402
 
 DEFAULT_UNITS_PATH = (
     Path(__file__).resolve().parents[1] / "data" / "export" / "units.json"
@@ -30,23 +33,6 @@ DEFAULT_CATEGORIES_PATH = (
 )
 
 
-def _load_json(path: Path) -> object | None:
-    """Return JSON data from ``path`` if it exists."""
-
-    if not path.exists():
-        return None
-    try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError) as exc:
-        logger.warning("Could not read %s: %s", path, exc)
-        return None
-
-
-def _dump_sorted(data: object) -> str:
-    return json.dumps(data, sort_keys=True, ensure_ascii=False)
-
-
 def main(argv: List[str] | None = None) -> None:
     """Execute the extractor CLI.
 
@@ -66,58 +52,65 @@ def main(argv: List[str] | None = None) -> None:
     fetcher.CATEGORIES_PATH = DEFAULT_CATEGORIES_PATH
     parsed = cli.parse_args(rest)
     configure_structlog(parsed.log_level, Path(parsed.log_file))
+    fetcher.set_site_url(parsed.site_url)
     logger.info("Starting fetch")
 
-    cats_path = Path(parsed.categories)
-    units_path = Path(parsed.output)
-
-    units_tmp = units_path.with_suffix(".tmp")
-    try:
-        trait_descs = fetch_units(
-            out_path=units_tmp,
-            categories_path=cats_path,
-            timeout=parsed.timeout,
-            max_workers=parsed.workers,
-            existing_path=units_path,
+    with profiled(parsed.profile):
+        session = create_session(
+            parsed.cache_dir,
+            pool_size=parsed.workers,
+            http2=parsed.http2,
+            adaptive=parsed.adaptive,
         )
-        new_units = _load_json(units_tmp) or []
-        logger.info("%s units fetched", len(new_units))
-    except FetchError as exc:
-        logger.warning("Fetching units failed: %s", exc)
-        units_tmp.unlink(missing_ok=True)
-        return
+        if parsed.watch:
+            cli._watch(parsed, session, partial(_scrape, parsed, session))
+            return
+        timings = Timings()
+        try:
+            _update(parsed, session, timings)
+        finally:
+            log_cache_summary(session)
+            log_pool_summary(session)
+            timings.log_summary()
+            session.close()
+
+
+def _scrape(parsed: argparse.Namespace, session, overview, timings: Timings) -> None:
+    """Run :func:`_update` for ``overview`` in ``--watch`` mode.
+
+    Raises :class:`FetchError` if a step failed so the watcher retries.
+    """
+
+    if not _update(parsed, session, timings, overview):
+        raise FetchError("Update incomplete")
+
 
-    existing_units = _load_json(units_path) or []
-    if _dump_sorted(existing_units) == _dump_sorted(new_units):
-        logger.info("No changes detected for units")
-        units_tmp.unlink(missing_ok=True)
-    else:
-        units_tmp.replace(units_path)
-        logger.info("Units updated at %s", units_path)
+def _update(
+    parsed: argparse.Namespace, session, timings: Timings, overview=None
+) -> bool:
+    """Fetch units and categories, replacing files only when they changed.
+
+    Runs :func:`wcr_data_extraction.cli._scrape` with ``--only-if-changed``
+    always on, so the writers compare the content hash with the export
+    manifest instead of reading the existing files back. A pre-fetched
+    ``overview`` is used as is. Returns ``False`` if fetching failed.
+    """
 
-    cats_tmp = cats_path.with_suffix(".tmp")
     try:
-        fetch_categories(
-            out_path=cats_tmp,
-            timeout=parsed.timeout,
-            existing_path=cats_path,
-            units_path=units_path,
-            trait_desc_map=trait_descs,
+        if overview is None:
+            overview = fetch_overview(
+                session, timeout=parsed.timeout, parser=parsed.parser, timings=timings
+            )
+        cli._scrape(
+            argparse.Namespace(**{**vars(parsed), "only_if_changed": True}),
+            session,
+            overview,
+            timings,
         )
-        new_cats = _load_json(cats_tmp) or {}
-        logger.info("%s category items fetched", sum(len(v) for v in new_cats.values()))
     except FetchError as exc:
-        logger.warning("Fetching categories failed: %s", exc)
-        cats_tmp.unlink(missing_ok=True)
-        return
-
-    existing_cats = _load_json(cats_path) or {}
-    if _dump_sorted(existing_cats) == _dump_sorted(new_cats):
-        logger.info("No changes detected for categories")
-        cats_tmp.unlink(missing_ok=True)
-    else:
-        cats_tmp.replace(cats_path)
-        logger.info("Categories updated at %s", cats_path)
+        logger.warning("Fetching failed: %s", exc)
+        return False
+    return True
 
 
 if __name__ == "__main__":
@@ -1,23 +1,39 @@
-"""Warcraft Rumble data extraction package."""
-
-from .fetcher import (
-    fetch_units,
-    fetch_categories,
-    load_categories,
-    load_existing_units,
-    is_unit_changed,
-    fetch_unit_details,
-    configure_structlog,
-    create_session,
-)
-
-__all__ = [
-    "fetch_units",
-    "fetch_categories",
-    "load_categories",
-    "load_existing_units",
-    "is_unit_changed",
-    "fetch_unit_details",
-    "configure_structlog",
-    "create_session",
-]
+"""Warcraft Rumble data extraction package.
+
+The public names are imported from their modules on first access, so
+importing the package stays cheap.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
+_EXPORTS = {
+    "fetch_units": "fetcher",
+    "fetch_units_async": "fetcher",
+    "iter_units": "fetcher",
+    "fetch_categories": "fetcher",
+    "fetch_overview": "fetcher",
+    "Overview": "fetcher",
+    "load_categories": "fetcher",
+    "load_existing_units": "fetcher",
+    "is_unit_changed": "fetcher",
+    "fetch_unit_details": "fetcher",
+    "configure_structlog": "fetcher",
+    "create_session": "fetcher",
+    "UnitIndex": "index",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,110 @@
+"""Compact MessagePack export of units and categories with lookup indexes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from .fetcher import load_existing_units
+from .log import get_logger
+from .manifest import commit_export
+
+logger = get_logger(__name__)
+
+# Bumped whenever the layout of the payload changes
+BINARY_VERSION = 1
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError("msgpack is required for the binary export") from exc
+    return msgpack
+
+
+def build_indexes(units: list[dict]) -> dict[str, dict]:
+    """Return lookup tables from category ids and costs to unit ids.
+
+    ``id`` maps every unit id to its position in the units list. ``faction``,
+    ``trait``, ``type`` and ``cost`` map a value to the ids of all units
+    having it, in export order.
+    """
+
+    indexes: dict[str, dict] = {
+        "id": {},
+        "faction": {},
+        "trait": {},
+        "type": {},
+        "cost": {},
+    }
+    for position, unit in enumerate(units):
+        unit_id = unit["id"]
+        indexes["id"][unit_id] = position
+        for faction_id in unit.get("faction_ids", []):
+            indexes["faction"].setdefault(faction_id, []).append(unit_id)
+        for trait_id in unit.get("trait_ids", []):
+            indexes["trait"].setdefault(trait_id, []).append(unit_id)
+        if unit.get("type_id") is not None:
+            indexes["type"].setdefault(unit["type_id"], []).append(unit_id)
+        if unit.get("cost") is not None:
+            indexes["cost"].setdefault(unit["cost"], []).append(unit_id)
+    return indexes
+
+
+def write_binary(path: Path | str, units: list[dict], categories: dict) -> bool:
+    """Write ``units``, ``categories`` and their indexes to ``path``.
+
+    The payload is ``{"version", "units", "categories", "indexes"}`` encoded
+    with MessagePack. Unchanged files are kept, see :mod:`.manifest`.
+    Returns ``True`` if ``path`` was written.
+    """
+
+    payload = {
+        "version": BINARY_VERSION,
+        "units": units,
+        "categories": categories,
+        "indexes": build_indexes(units),
+    }
+    data = _msgpack().packb(payload, use_bin_type=True)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(data)
+    digest = hashlib.sha256(data).hexdigest()
+    written = commit_export(tmp_path, path, digest, only_if_changed=True)
+    if written:
+        logger.info("Binary export of %s units saved to %s", len(units), path)
+    return written
+
+
+def export_binary(
+    path: Path | str, units_path: Path | str, categories_path: Path | str
+) -> bool:
+    """Write the binary export at ``path`` from the JSON export files.
+
+    ``units_path`` may hold a JSON array or NDJSON, see
+    :func:`.fetcher.load_existing_units`.
+    """
+
+    units = list(load_existing_units(units_path).values())
+    with open(categories_path, encoding="utf-8") as f:
+        categories = json.load(f)
+    return write_binary(path, units, categories)
+
+
+def load_binary(path: Path | str) -> dict:
+    """Return the payload written by :func:`write_binary`.
+
+    Raises ``ValueError`` for files of another :data:`BINARY_VERSION`.
+    """
+
+    data = Path(path).read_bytes()
+    # Cost indexes use integer keys
+    payload = _msgpack().unpackb(data, raw=False, strict_map_key=False)
+    if payload.get("version") != BINARY_VERSION:
+        raise ValueError(
+            f"Unsupported binary export version {payload.get('version')!r}"
+        )
+    return payload
@@ -0,0 +1,248 @@
+"""Persistent HTTP response cache with conditional revalidation."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# Headers describing the stored body. Transfer related headers are dropped
+# because the cached body is kept decoded.
+_STORED_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Cache-Control",
+    "Date",
+    "Expires",
+)
+
+
+def _max_age(headers: CaseInsensitiveDict) -> int | None:
+    """Return the ``max-age`` directive from ``Cache-Control`` if present."""
+
+    directives = [
+        d.strip().lower() for d in headers.get("Cache-Control", "").split(",")
+    ]
+    if "no-cache" in directives or "no-store" in directives:
+        return None
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return int(directive.split("=", 1)[1])
+            except ValueError:
+                return None
+    return None
+
+
+def is_cacheable(headers) -> bool:
+    """Return ``True`` if a ``200`` response with ``headers`` may be stored."""
+
+    return (
+        "ETag" in headers or "Last-Modified" in headers or _max_age(headers) is not None
+    )
+
+
+def is_fresh(meta: dict) -> bool:
+    """Return ``True`` if a cached entry may be served without a request."""
+
+    expires_at = meta.get("expires_at")
+    return expires_at is not None and expires_at > time.time()
+
+
+def conditional_headers(meta: dict) -> dict[str, str]:
+    """Return revalidation headers for a cached entry's metadata."""
+
+    headers: dict[str, str] = {}
+    etag = meta["headers"].get("ETag")
+    last_modified = meta["headers"].get("Last-Modified")
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class HTTPCache:
+    """Store response bodies and validators on disk keyed by URL.
+
+    Each entry consists of a ``<key>.body`` file with the decoded body and a
+    ``<key>.json`` file with the validators (``ETag``/``Last-Modified``) and
+    the response headers needed to rebuild the response.
+    """
+
+    def __init__(self, cache_dir: Path | str) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def record(self, kind: str) -> None:
+        """Increment the counter for ``kind`` (hits, revalidated or misses)."""
+
+        with self._lock:
+            self.stats[kind] += 1
+
+    def get(self, url: str) -> tuple[dict, bytes] | None:
+        """Return the stored metadata and body for ``url`` if available."""
+
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except (json.JSONDecodeError, OSError) as exc:
+            logger.warning("Could not read cache entry for %s: %s", url, exc)
+            return None
+        return meta, body
+
+    def store(self, url: str, headers: CaseInsensitiveDict, body: bytes) -> None:
+        """Persist ``body`` and its validators for ``url``."""
+
+        meta_path, body_path = self._paths(url)
+        tmp_body = body_path.with_suffix(".body.tmp")
+        tmp_body.write_bytes(body)
+        tmp_body.replace(body_path)
+        self._write_meta(url, headers)
+
+    def refresh(self, url: str, headers: CaseInsensitiveDict) -> None:
+        """Update the metadata of ``url`` after a ``304 Not Modified``."""
+
+        entry = self.get(url)
+        merged = CaseInsensitiveDict(entry[0]["headers"] if entry else {})
+        for name in _STORED_HEADERS:
+            if name in headers:
+                merged[name] = headers[name]
+        self._write_meta(url, merged)
+
+    def _write_meta(self, url: str, headers: CaseInsensitiveDict) -> None:
+        meta_path, _ = self._paths(url)
+        max_age = _max_age(headers)
+        meta = {
+            "url": url,
+            "headers": {k: headers[k] for k in _STORED_HEADERS if k in headers},
+            "stored_at": time.time(),
+            "expires_at": time.time() + max_age if max_age is not None else None,
+        }
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        tmp_meta.replace(meta_path)
+
+
+class CachingAdapter(BaseAdapter):
+    """Transport adapter that serves GET requests from an :class:`HTTPCache`.
+
+    Requests are forwarded to ``adapter`` with ``If-None-Match`` and
+    ``If-Modified-Since`` headers taken from the cached entry. A ``304``
+    answer is turned into a ``200`` response carrying the cached body.
+    """
+
+    def __init__(self, cache: HTTPCache, adapter: BaseAdapter) -> None:
+        super().__init__()
+        self.cache = cache
+        self.adapter = adapter
+
+    def send(self, request: PreparedRequest, stream: bool = False, **kwargs):
+        if request.method != "GET" or stream:
+            return self.adapter.send(request, stream=stream, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None:
+            meta, body = entry
+            if is_fresh(meta):
+                self.cache.record("hits")
+                return self._build_response(request, meta["headers"], body)
+            for name, value in conditional_headers(meta).items():
+                request.headers.setdefault(name, value)
+
+        response = self.adapter.send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            # Drain the empty body so the connection returns to the pool
+            response.content
+            self.cache.refresh(request.url, response.headers)
+            self.cache.record("revalidated")
+            return self._build_response(request, entry[0]["headers"], entry[1])
+
+        self.cache.record("misses")
+        if response.status_code == 200 and is_cacheable(response.headers):
+            self.cache.store(request.url, response.headers, response.content)
+        return response
+
+    def _build_response(
+        self, request: PreparedRequest, headers: dict, body: bytes
+    ) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+def is_cached(response) -> bool:
+    """Return ``True`` if ``response`` was served or revalidated by the cache."""
+
+    return isinstance(getattr(response, "connection", None), CachingAdapter)
+
+
+def uncached_session(session):
+    """Return a session sending through the adapters of ``session`` uncached.
+
+    Mounted :class:`CachingAdapter` instances are replaced by the adapters
+    they wrap, so connection pools are shared but answers such as a ``304``
+    reach the caller unchanged and bodies are not stored. Sessions without
+    a caching adapter are returned as they are.
+    """
+
+    adapters = getattr(session, "adapters", None)
+    if not isinstance(adapters, dict) or not any(
+        isinstance(mounted, CachingAdapter) for mounted in adapters.values()
+    ):
+        return session
+    uncached = requests.Session()
+    uncached.headers = session.headers
+    uncached.adapters.clear()
+    for prefix, mounted in adapters.items():
+        if isinstance(mounted, CachingAdapter):
+            mounted = mounted.adapter
+        uncached.mount(prefix, mounted)
+    return uncached
+
+
+def cache_stats(session) -> dict[str, int] | None:
+    """Return the cache counters of ``session`` or ``None`` if uncached."""
+
+    adapters = getattr(session, "adapters", None)
+    if not isinstance(adapters, dict):
+        return None
+    for mounted in adapters.values():
+        if isinstance(mounted, CachingAdapter):
+            return dict(mounted.cache.stats)
+    return None
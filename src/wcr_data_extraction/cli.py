@@ -3,19 +3,41 @@
 from __future__ import annotations
 
 import argparse
+import os
+import signal
 import sys
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Callable
 
 from .fetcher import (
     fetch_units,
+    fetch_units_async,
     fetch_categories,
     OUT_PATH,
     CATEGORIES_PATH,
     FetchError,
+    Overview,
     logger,
     configure_structlog,
+    create_session,
+    fetch_overview,
+    is_allowed_url,
+    load_existing_units,
+    log_cache_summary,
+    log_pool_summary,
+    OUTPUT_FORMATS,
+    set_site_url,
+    SITE_URL,
 )
+from .binary import export_binary
+from .database import export_sqlite
+from .images import mirror_images
+from .incremental import DEFAULT_REFRESH_TTL
+from .instrumentation import Timings, profiled
+from .parsing import DEFAULT_PARSER, PARSERS
+from .watch import Watcher
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -27,6 +49,17 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
             raise argparse.ArgumentTypeError("must be >0")
         return ivalue
 
+    def non_negative_int(value: str) -> int:
+        ivalue = int(value)
+        if ivalue < 0:
+            raise argparse.ArgumentTypeError("must be >=0")
+        return ivalue
+
+    def site_url(value: str) -> str:
+        if not is_allowed_url(value):
+            raise argparse.ArgumentTypeError("must use https or a loopback host")
+        return value
+
     parser = argparse.ArgumentParser(description="Fetch minis from method.gg")
     parser.add_argument(
         "--output", default=str(OUT_PATH), help="Path to write units JSON"
@@ -34,19 +67,129 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--categories", default=str(CATEGORIES_PATH), help="Path to categories JSON"
     )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Write units as one JSON array or stream them as NDJSON lines",
+    )
     parser.add_argument(
         "--timeout", type=positive_int, default=10, help="HTTP timeout in seconds"
     )
     parser.add_argument(
         "--workers", type=positive_int, default=1, help="Number of parallel workers"
     )
+    parser.add_argument(
+        "--parse-processes",
+        type=non_negative_int,
+        nargs="?",
+        const=os.cpu_count() or 1,
+        default=0,
+        help="Parse detail pages in N processes (default without N: CPU count)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adapt concurrency to server health, using --workers as the ceiling",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        default="threads",
+        help="Fetch detail pages with a thread pool or an asyncio event loop",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Multiplex requests over HTTP/2 connections instead of HTTP/1.1",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSERS,
+        default=DEFAULT_PARSER,
+        help="HTML parser backend used for overview and detail pages",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch detail pages of new or changed minis",
+    )
+    parser.add_argument(
+        "--refresh-ttl",
+        type=positive_int,
+        default=DEFAULT_REFRESH_TTL,
+        help="Refetch unchanged minis after this many seconds in incremental mode",
+    )
+    parser.add_argument(
+        "--only-if-changed",
+        action="store_true",
+        help="Keep output files whose content hash matches the export manifest",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Also write a JSON Patch from the previous export next to each file",
+    )
+    parser.add_argument(
+        "--binary-export",
+        default=None,
+        help="Also write units, categories and lookup indexes as MessagePack here",
+    )
+    parser.add_argument(
+        "--sqlite",
+        default=None,
+        help="Also write units and categories to an indexed SQLite database here",
+    )
+    parser.add_argument(
+        "--mirror-images",
+        default=None,
+        metavar="DIR",
+        help="Download the mini images into this content-addressed directory",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip minis already fetched by an interrupted run of the same overview",
+    )
+    parser.add_argument(
+        "--watch",
+        type=positive_int,
+        default=None,
+        metavar="INTERVAL",
+        help="Keep running and scrape whenever the overview changes, "
+        "probing every INTERVAL seconds",
+    )
+    parser.add_argument(
+        "--status-file",
+        default=None,
+        help="Write probe, success and change timestamps here in --watch mode",
+    )
+    parser.add_argument(
+        "--site-url",
+        type=site_url,
+        default=SITE_URL,
+        help="Site to fetch from, e.g. a local stand-in server",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the HTTP response cache (disabled if omitted)",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="Write cProfile statistics of the whole run to this file",
+    )
     parser.add_argument("--log-level", default="INFO", help="Logging level")
     parser.add_argument(
         "--log-file",
         default=f"logs/runtime-{datetime.now():%Y-%m-%d-%H}.json",
         help="Path to the log file (stored under logs/)",
     )
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if args.delta and args.format != "json":
+        parser.error("--delta requires --format json")
+    return args
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -54,20 +197,139 @@ def main(argv: list[str] | None = None) -> None:
 
     args = parse_args(argv)
     configure_structlog(args.log_level, Path(args.log_file))
+    with profiled(args.profile):
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Fetch units and categories as configured by ``args``."""
+
+    set_site_url(args.site_url)
+    session = create_session(
+        args.cache_dir,
+        pool_size=args.workers,
+        http2=args.http2,
+        adaptive=args.adaptive,
+    )
+    if args.watch:
+        _watch(args, session, partial(_scrape, args, session))
+        return
+    timings = Timings()
     try:
+        overview = fetch_overview(
+            session, timeout=args.timeout, parser=args.parser, timings=timings
+        )
+        _scrape(args, session, overview, timings)
+        log_cache_summary(session)
+        log_pool_summary(session)
+        timings.log_summary()
+    except FetchError as exc:
+        logger.error("Fehler beim Abrufen: %s", exc)
+        sys.exit(1)
+    finally:
+        session.close()
+
+
+def _watch(
+    args: argparse.Namespace,
+    session,
+    scrape: Callable[[Overview, Timings], None],
+) -> None:
+    """Call ``scrape`` with one warm ``session`` whenever the overview changes.
+
+    Runs until ``SIGTERM`` or ``SIGINT``; a running scrape is finished first.
+    """
+
+    def run_scrape(overview: Overview) -> None:
+        timings = Timings()
+        scrape(overview, timings)
+        log_cache_summary(session)
+        log_pool_summary(session)
+        timings.log_summary()
+
+    watcher = Watcher(
+        run_scrape,
+        session=session,
+        interval=args.watch,
+        timeout=args.timeout,
+        parser=args.parser,
+        status_path=args.status_file,
+    )
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, watcher.stop)
+    try:
+        watcher.run()
+    finally:
+        session.close()
+
+
+def _scrape(args: argparse.Namespace, session, overview, timings: Timings) -> None:
+    """Write units, categories and the extra exports from ``overview``."""
+
+    if args.engine == "async":
+        import asyncio
+
+        trait_descs = asyncio.run(
+            fetch_units_async(
+                out_path=Path(args.output),
+                categories_path=Path(args.categories),
+                timeout=args.timeout,
+                max_concurrency=args.workers,
+                cache_dir=args.cache_dir,
+                overview=overview,
+                parser=args.parser,
+                incremental=args.incremental,
+                refresh_ttl=args.refresh_ttl,
+                adaptive=args.adaptive,
+                timings=timings,
+                output_format=args.format,
+                parse_processes=args.parse_processes,
+                resume=args.resume,
+                only_if_changed=args.only_if_changed,
+                delta=args.delta,
+                http2=args.http2,
+            )
+        )
+    else:
         trait_descs = fetch_units(
             out_path=Path(args.output),
             categories_path=Path(args.categories),
             timeout=args.timeout,
             max_workers=args.workers,
+            session=session,
+            overview=overview,
+            parser=args.parser,
+            incremental=args.incremental,
+            refresh_ttl=args.refresh_ttl,
+            adaptive=args.adaptive,
+            timings=timings,
+            output_format=args.format,
+            parse_processes=args.parse_processes,
+            resume=args.resume,
+            only_if_changed=args.only_if_changed,
+            delta=args.delta,
         )
-        fetch_categories(
-            out_path=Path(args.categories),
+    fetch_categories(
+        out_path=Path(args.categories),
+        timeout=args.timeout,
+        session=session,
+        existing_path=Path(args.categories),
+        units_path=Path(args.output),
+        trait_desc_map=trait_descs,
+        overview=overview,
+        timings=timings,
+        only_if_changed=args.only_if_changed,
+        delta=args.delta,
+    )
+    if args.binary_export:
+        export_binary(args.binary_export, args.output, args.categories)
+    if args.sqlite:
+        export_sqlite(args.sqlite, args.output, args.categories)
+    if args.mirror_images:
+        mirror_images(
+            load_existing_units(args.output).values(),
+            args.mirror_images,
+            session=session,
             timeout=args.timeout,
-            existing_path=Path(args.categories),
-            units_path=Path(args.output),
-            trait_desc_map=trait_descs,
+            timings=timings,
         )
-    except FetchError as exc:
-        logger.error("Fehler beim Abrufen: %s", exc)
-        sys.exit(1)
@@ -0,0 +1,158 @@
+"""Adaptive limits for the number of detail page requests in flight."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from .log import get_logger
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    import asyncio
+
+
+logger = get_logger(__name__)
+
+# Latencies below this are treated as equal, e.g. cache hits served locally
+MIN_LATENCY = 0.05
+
+
+class AdaptiveLimiter:
+    """Limit requests in flight with additive increase/multiplicative decrease.
+
+    The limit starts at ``initial`` and doubles per window of responses until
+    the first sign of congestion, then grows by one per window, never above
+    ``max_limit``. An overload response (429/5xx) or a smoothed latency above
+    ``latency_factor`` times the best smoothed latency seen multiplies the
+    limit by ``decrease``. Only responses to requests started after the last
+    cut can cut again, so a burst of failures counts once.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        *,
+        initial: int = 1,
+        min_limit: int = 1,
+        decrease: float = 0.5,
+        latency_factor: float = 2.0,
+        smoothing: float = 0.2,
+    ) -> None:
+        if max_limit < 1:
+            raise ValueError("max_limit must be >0")
+        self.max_limit = max_limit
+        self.min_limit = max(1, min(min_limit, max_limit))
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.smoothing = smoothing
+        self._limit = float(min(max(initial, self.min_limit), max_limit))
+        self._slow_start = True
+        self._window = 0
+        self._latency: float | None = None
+        self._best: float | None = None
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.peak = self.limit
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Return the current number of requests allowed in flight."""
+
+        return int(self._limit)
+
+    def acquire(self) -> int:
+        """Block until a slot is free and return a token for :meth:`release`."""
+
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            return self._window
+
+    def release(self, token: int, latency: float, *, overloaded: bool = False) -> None:
+        """Free a slot and adjust the limit from the request's outcome."""
+
+        with self._cond:
+            self.in_flight -= 1
+            self._update(token, latency, overloaded)
+            self._cond.notify_all()
+
+    def log_summary(self) -> None:
+        """Log the final and peak limit of this run."""
+
+        logger.info(
+            "Adaptive concurrency summary",
+            limit=self.limit,
+            peak=self.peak,
+            decreases=self.decreases,
+        )
+
+    def _update(self, token: int, latency: float, overloaded: bool) -> None:
+        previous = self.limit
+        reason = "overload"
+        congested = overloaded
+        if not overloaded:
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += self.smoothing * (latency - self._latency)
+            if self._best is None or self._latency < self._best:
+                self._best = self._latency
+            baseline = max(self._best, MIN_LATENCY)
+            if self._latency > self.latency_factor * baseline:
+                congested = True
+                reason = "latency"
+
+        if congested:
+            if token != self._window:
+                return
+            self._limit = max(self.min_limit, self._limit * self.decrease)
+            self._window += 1
+            self._slow_start = False
+            self._latency = None
+            self.decreases += 1
+        elif self._slow_start:
+            self._limit = min(self.max_limit, self._limit + 1)
+        else:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+        if self.limit != previous:
+            self.peak = max(self.peak, self.limit)
+            logger.info(
+                "Concurrency adjusted",
+                limit=self.limit,
+                previous=previous,
+                in_flight=self.in_flight,
+                reason=reason if congested else "healthy",
+            )
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """Variant of :class:`AdaptiveLimiter` for tasks on one event loop."""
+
+    def __init__(self, max_limit: int, **kwargs) -> None:
+        super().__init__(max_limit, **kwargs)
+        self._async_cond: asyncio.Condition | None = None
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the condition binds to the running loop
+        if self._async_cond is None:
+            import asyncio
+
+            self._async_cond = asyncio.Condition()
+        return self._async_cond
+
+    async def acquire(self) -> int:  # type: ignore[override]
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            return self._window
+
+    async def release(  # type: ignore[override]
+        self, token: int, latency: float, *, overloaded: bool = False
+    ) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._update(token, latency, overloaded)
+            self._condition.notify_all()
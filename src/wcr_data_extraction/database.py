@@ -0,0 +1,213 @@
+"""Normalised SQLite export of units and categories."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+from .fetcher import load_existing_units
+from .log import get_logger
+from .stats import normalize_stats
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE units (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    type_id TEXT,
+    cost INTEGER,
+    speed_id TEXT,
+    damage REAL,
+    health REAL,
+    dps REAL,
+    image TEXT,
+    core_attack_id TEXT,
+    core_type_id TEXT,
+    advanced_info TEXT
+);
+CREATE TABLE unit_factions (
+    unit_id TEXT NOT NULL REFERENCES units(id),
+    faction_id TEXT NOT NULL,
+    PRIMARY KEY (unit_id, faction_id)
+);
+CREATE TABLE unit_traits (
+    unit_id TEXT NOT NULL REFERENCES units(id),
+    trait_id TEXT NOT NULL,
+    PRIMARY KEY (unit_id, trait_id)
+);
+CREATE TABLE talents (
+    unit_id TEXT NOT NULL REFERENCES units(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (unit_id, position)
+);
+CREATE TABLE stats (
+    unit_id TEXT NOT NULL REFERENCES units(id),
+    name TEXT NOT NULL,
+    value TEXT,
+    key TEXT,
+    number REAL,
+    unit TEXT,
+    PRIMARY KEY (unit_id, name)
+);
+CREATE TABLE categories (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE TABLE translations (
+    owner TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    language TEXT NOT NULL,
+    text TEXT,
+    PRIMARY KEY (owner, owner_id, field, language)
+);
+CREATE INDEX units_cost ON units (cost);
+CREATE INDEX units_type ON units (type_id);
+CREATE INDEX units_speed ON units (speed_id);
+CREATE INDEX unit_factions_faction ON unit_factions (faction_id);
+CREATE INDEX unit_traits_trait ON unit_traits (trait_id);
+CREATE INDEX stats_name ON stats (name);
+CREATE INDEX stats_key_number ON stats (key, number);
+"""
+
+# Owner names used in ``translations`` for the category lists
+CATEGORY_OWNERS = {
+    "factions": "faction",
+    "types": "type",
+    "traits": "trait",
+    "speeds": "speed",
+}
+
+
+def talent_key(unit_id: str, position: int) -> str:
+    """Return the ``translations.owner_id`` of a talent."""
+
+    return f"{unit_id}/{position}"
+
+
+def _translations(owner: str, owner_id: str, field: str, texts: dict) -> list:
+    return [(owner, owner_id, field, lang, text) for lang, text in texts.items()]
+
+
+def _stat_rows(unit_id: str, details: dict) -> list:
+    stats = details.get("stats", {})
+    normalized = details.get("stats_normalized")
+    if normalized is None:
+        # Exports written before ``stats_normalized`` existed
+        normalized = normalize_stats(stats)
+    by_label = {entry["label"]: (key, entry) for key, entry in normalized.items()}
+    rows = []
+    for name, value in stats.items():
+        key, entry = by_label.get(name, (None, {}))
+        rows.append((unit_id, name, value, key, entry.get("value"), entry.get("unit")))
+    return rows
+
+
+def _unit_rows(position: int, unit: dict) -> dict[str, list]:
+    details = unit.get("details", {})
+    core = details.get("core_trait", {})
+    rows: dict[str, list] = {
+        "units": [
+            (
+                unit["id"],
+                position,
+                unit.get("type_id"),
+                unit.get("cost"),
+                unit.get("speed_id"),
+                unit.get("damage"),
+                unit.get("health"),
+                unit.get("dps"),
+                unit.get("image"),
+                core.get("attack_id"),
+                core.get("type_id"),
+                details.get("advanced_info"),
+            )
+        ],
+        "unit_factions": [(unit["id"], fid) for fid in unit.get("faction_ids", [])],
+        "unit_traits": [
+            (unit["id"], tid) for tid in dict.fromkeys(unit.get("trait_ids", []))
+        ],
+        "talents": [],
+        "stats": _stat_rows(unit["id"], details),
+        "translations": _translations("unit", unit["id"], "name", unit["names"]),
+    }
+    for index, talent in enumerate(details.get("talents", [])):
+        key = talent_key(unit["id"], index)
+        rows["talents"].append((unit["id"], index))
+        rows["translations"] += _translations(
+            "talent", key, "name", talent.get("name", {})
+        )
+        rows["translations"] += _translations(
+            "talent", key, "description", talent.get("description", {})
+        )
+    return rows
+
+
+def write_sqlite(path: Path | str, units: list[dict], categories: dict) -> None:
+    """Write ``units`` and ``categories`` to a new SQLite database at ``path``.
+
+    All rows are inserted in one transaction into a temporary file which then
+    replaces ``path``, so readers never see a partial database. Localised
+    names and descriptions go to ``translations`` keyed by owner (``unit``,
+    ``talent``, ``faction``, ``type``, ``trait`` or ``speed``), owner id,
+    field and language; talents are identified by :func:`talent_key`.
+    ``stats`` keeps the display ``value`` next to the ``key``, ``number``
+    and ``unit`` of ``stats_normalized``; they are ``NULL`` for stats that
+    are not numbers.
+    """
+
+    rows: dict[str, list] = {
+        "units": [],
+        "unit_factions": [],
+        "unit_traits": [],
+        "talents": [],
+        "stats": [],
+        "categories": [],
+        "translations": [],
+    }
+    for position, unit in enumerate(units):
+        for table, unit_rows in _unit_rows(position, unit).items():
+            rows[table] += unit_rows
+    for kind, items in categories.items():
+        owner = CATEGORY_OWNERS.get(kind, kind)
+        for item in items:
+            rows["categories"].append((kind, item["id"]))
+            rows["translations"] += _translations(
+                owner, item["id"], "name", item.get("names", {})
+            )
+            rows["translations"] += _translations(
+                owner, item["id"], "description", item.get("descriptions", {})
+            )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        with conn:
+            # Schema and rows share one transaction
+            conn.executescript("BEGIN;" + SCHEMA)
+            for table, table_rows in rows.items():
+                if not table_rows:
+                    continue
+                marks = ", ".join("?" * len(table_rows[0]))
+                conn.executemany(f"INSERT INTO {table} VALUES ({marks})", table_rows)
+    finally:
+        conn.close()
+    tmp_path.replace(path)
+    logger.info("SQLite export of %s units saved to %s", len(units), path)
+
+
+def export_sqlite(
+    path: Path | str, units_path: Path | str, categories_path: Path | str
+) -> None:
+    """Write the SQLite export at ``path`` from the JSON export files."""
+
+    units = list(load_existing_units(units_path).values())
+    with open(categories_path, encoding="utf-8") as f:
+        categories = json.load(f)
+    write_sqlite(path, units, categories)
@@ -0,0 +1,157 @@
+"""RFC 6902 JSON Patch deltas between two exports."""
+
+from __future__ import annotations
+
+import copy
+import json
+from collections import Counter
+from pathlib import Path
+
+from .log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def delta_path(export_path: Path | str) -> Path:
+    """Return the delta file stored next to ``export_path``."""
+
+    path = Path(export_path)
+    return path.with_name(f"{path.stem}.patch.json")
+
+
+def _pointer(path: str, token: str | int) -> str:
+    text = str(token).replace("~", "~0").replace("/", "~1")
+    return f"{path}/{text}"
+
+
+def _is_keyed(items: list) -> bool:
+    ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+    return None not in ids and len(set(ids)) == len(ids)
+
+
+def _diff_keyed(old: list[dict], new: list[dict], path: str) -> list[dict]:
+    """Return operations turning ``old`` into ``new``, matching items by id."""
+
+    ops: list[dict] = []
+    new_ids = {item["id"] for item in new}
+    current = [item["id"] for item in old]
+    for index in reversed(range(len(old))):
+        if old[index]["id"] not in new_ids:
+            ops.append({"op": "remove", "path": _pointer(path, index)})
+            del current[index]
+
+    old_by_id = {item["id"]: item for item in old}
+    for index, item in enumerate(new):
+        if item["id"] not in old_by_id:
+            ops.append({"op": "add", "path": _pointer(path, index), "value": item})
+            current.insert(index, item["id"])
+            continue
+        position = current.index(item["id"])
+        if position != index:
+            ops.append(
+                {
+                    "op": "move",
+                    "from": _pointer(path, position),
+                    "path": _pointer(path, index),
+                }
+            )
+            current.insert(index, current.pop(position))
+        ops.extend(diff(old_by_id[item["id"]], item, _pointer(path, index)))
+    return ops
+
+
+def diff(old, new, path: str = "") -> list[dict]:
+    """Return the JSON Patch operations that turn ``old`` into ``new``.
+
+    Objects are compared key by key. Lists of objects with unique ``id``
+    values, such as the units and the category lists, are matched by id so
+    a changed unit yields operations on its fields only. Other values are
+    replaced as a whole.
+    """
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                ops.extend(diff(old[key], value, _pointer(path, key)))
+        return ops
+    if (
+        isinstance(old, list)
+        and isinstance(new, list)
+        and old != new
+        and _is_keyed(old)
+        and _is_keyed(new)
+    ):
+        return _diff_keyed(old, new, path)
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def _resolve(doc, pointer: str):
+    tokens = [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]
+    ]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def apply_patch(doc, ops: list[dict]):
+    """Return a copy of ``doc`` with the JSON Patch ``ops`` applied.
+
+    Supports the ``add``, ``remove``, ``replace`` and ``move`` operations
+    produced by :func:`diff`.
+    """
+
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            doc = copy.deepcopy(op["value"])
+            continue
+        if op["op"] == "move":
+            parent, token = _resolve(doc, op["from"])
+            value = parent.pop(int(token) if isinstance(parent, list) else token)
+        else:
+            value = copy.deepcopy(op.get("value"))
+        parent, token = _resolve(doc, op["path"])
+        if isinstance(parent, list):
+            index = len(parent) if token == "-" else int(token)
+            if op["op"] == "remove":
+                del parent[index]
+            elif op["op"] == "replace":
+                parent[index] = value
+            else:
+                parent.insert(index, value)
+        elif op["op"] == "remove":
+            del parent[token]
+        else:
+            parent[token] = value
+    return doc
+
+
+def write_delta(path: Path | str, old, new) -> list[dict]:
+    """Write the JSON Patch from ``old`` to ``new`` to ``path`` and return it.
+
+    An empty patch is written when nothing changed, so consumers can tell an
+    unchanged export from a missing delta.
+    """
+
+    ops = diff(old, new)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(ops, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    tmp_path.replace(path)
+    counts = Counter(op["op"] for op in ops)
+    logger.info("Delta summary", path=str(path), operations=len(ops), **counts)
+    return ops
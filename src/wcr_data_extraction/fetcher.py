@@ -2,41 +2,185 @@
 
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
 import logging
-from logging.handlers import TimedRotatingFileHandler
-import structlog
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+from importlib.util import find_spec
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
-
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    import requests
+    from requests.adapters import HTTPAdapter
+
+from .concurrency import AdaptiveLimiter, AsyncAdaptiveLimiter
+from .delta import delta_path, write_delta
+from .instrumentation import CACHED, UNIT_PHASE, Timings
+from .journal import Journal, journal_path, overview_snapshot
+from .log import get_logger
+from .manifest import HashingWriter, commit_export, unordered_digest
+from .incremental import (
+    DEFAULT_REFRESH_TTL,
+    card_fingerprint,
+    fingerprint_path,
+    load_fingerprints,
+    save_fingerprints,
+)
+from .parsing import DEFAULT_PARSER, get_parser
+from .snapshot import load_snapshot
+from .stats import normalize_stats
 
-BASE_URL = "https://www.method.gg/warcraft-rumble/minis"
+SITE_URL = "https://www.method.gg"
+MINIS_PATH = "/warcraft-rumble/minis"
+BASE_URL = SITE_URL + MINIS_PATH
 OUT_PATH = Path(__file__).resolve().parents[1] / "data" / "export" / "units.json"
 CATEGORIES_PATH = (
     Path(__file__).resolve().parents[1] / "data" / "export" / "categories.json"
 )
 STATIONARY = "Stationary"
+OUTPUT_FORMATS = ("json", "ndjson")
+# Detail pages fetched ahead of the consumer per worker when streaming units,
+# and pages queued per process when parsing in a process pool
+PREFETCH_FACTOR = 2
+# Connections kept open per host, the ``requests`` default
+DEFAULT_POOL_SIZE = 10
 
-# HTTP session with retry logic and backoff
-_retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
-adapter = HTTPAdapter(max_retries=_retry)
+T = TypeVar("T")
 
 _session: requests.Session | None = None
 
 
-def create_session() -> requests.Session:
-    """Return a configured ``requests.Session`` with retry logic."""
+def _retrying_adapter(
+    pool_size: int = DEFAULT_POOL_SIZE, *, status_retries: bool = True
+) -> HTTPAdapter:
+    """Return a new ``HTTPAdapter`` with retry logic and backoff.
+
+    It keeps up to ``pool_size`` connections per host, at least
+    :data:`DEFAULT_POOL_SIZE`. Without ``status_retries`` only connection
+    errors are retried and ``5xx`` answers are returned as they are.
+    """
+
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    statuses = [500, 502, 503, 504] if status_retries else []
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=statuses)
+    return HTTPAdapter(
+        max_retries=retry, pool_maxsize=max(pool_size, DEFAULT_POOL_SIZE)
+    )
+
+
+def _default_adapter() -> HTTPAdapter:
+    """Return the shared retrying ``HTTPAdapter``.
+
+    It is created on first use, so importing this module does not load
+    ``requests``, and is available as the module attribute ``adapter``.
+    """
+
+    if "adapter" not in globals():
+        globals()["adapter"] = _retrying_adapter()
+    return globals()["adapter"]
+
+
+def __getattr__(name: str):
+    if name == "adapter":
+        return _default_adapter()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_session(
+    cache_dir: Path | str | None = None,
+    *,
+    pool_size: int | None = None,
+    http2: bool = False,
+    adaptive: bool = False,
+) -> requests.Session:
+    """Return a configured ``requests.Session`` with retry logic.
+
+    If ``cache_dir`` is provided, responses are cached there and revalidated
+    with ``If-None-Match``/``If-Modified-Since`` on later requests. Without
+    ``pool_size`` the session shares one adapter with all other sessions;
+    otherwise it gets its own pool sized for ``pool_size`` workers. With
+    ``http2`` requests are multiplexed over HTTP/2 by a
+    :class:`.transport.HTTP2Adapter` of at most ``pool_size`` connections.
+
+    With ``adaptive`` detail pages below ``BASE_URL`` go through an adapter
+    that does not retry ``5xx`` answers, so the
+    :class:`~.concurrency.AdaptiveLimiter` sees the first one and retries it
+    itself instead of on top of the adapter retries.
+    """
+
+    import requests
+
+    from .cache import HTTPCache
 
     session = requests.Session()
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = accept_encoding()
+    cache = HTTPCache(cache_dir) if cache_dir is not None else None
+    transport = _transport(cache, pool_size, http2)
+    session.mount("http://", transport)
+    session.mount("https://", transport)
+    if adaptive:
+        session.mount(
+            BASE_URL + "/", _transport(cache, pool_size, http2, status_retries=False)
+        )
     return session
 
 
+def _transport(
+    cache,
+    pool_size: int | None,
+    http2: bool,
+    *,
+    status_retries: bool = True,
+):
+    """Return the adapter to mount for :func:`create_session`."""
+
+    from .cache import CachingAdapter
+
+    if http2:
+        from .transport import HTTP2Adapter
+
+        transport = HTTP2Adapter(
+            max_connections=pool_size or DEFAULT_POOL_SIZE,
+            status_retries=status_retries,
+        )
+    elif pool_size is not None or not status_retries:
+        transport = _retrying_adapter(
+            pool_size or DEFAULT_POOL_SIZE, status_retries=status_retries
+        )
+    else:
+        transport = _default_adapter()
+    if cache is not None:
+        transport = CachingAdapter(cache, transport)
+    return transport
+
+
+def accept_encoding() -> str:
+    """Return an ``Accept-Encoding`` value with the decodable codecs, best first.
+
+    ``br`` and ``zstd`` are offered only if ``brotli``/``brotlicffi`` or
+    ``zstandard`` is installed; both HTTP clients decode them with these.
+    """
+
+    codecs = []
+    if find_spec("brotli") or find_spec("brotlicffi"):
+        codecs.append("br")
+    if find_spec("zstandard"):
+        codecs.append("zstd")
+    return ", ".join(codecs + ["gzip", "deflate"])
+
+
 def _get_session() -> requests.Session:
     """Return a global session instance to reuse connections."""
     global _session
@@ -51,6 +195,10 @@ def configure_structlog(level: str, log_file: str | Path | None = None) -> None:
     If ``log_file`` is provided, logs are also written there with rotation.
     """
 
+    from logging.handlers import TimedRotatingFileHandler
+
+    import structlog
+
     handlers: list[logging.Handler] = [logging.StreamHandler()]
     if log_file is not None:
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
@@ -80,15 +228,238 @@ def configure_structlog(level: str, log_file: str | Path | None = None) -> None:
     )
 
 
-logger = structlog.get_logger(__name__)
+logger = get_logger(__name__)
 
 
 class FetchError(Exception):
-    """Raised when fetching data from method.gg fails."""
+    """Raised when fetching data from method.gg fails.
+
+    ``status`` holds the HTTP status code if the server answered.
+    """
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# Retries per detail page after overload answers in adaptive mode, which
+# replace the status retries of the transport
+OVERLOAD_RETRIES = 3
+OVERLOAD_BACKOFF = 0.5
+
+
+def _is_overload(exc: FetchError) -> bool:
+    """Return ``True`` if ``exc`` signals an overloaded server."""
+
+    if exc.status is not None:
+        return exc.status == 429 or exc.status >= 500
+    import requests
+
+    # urllib3 gives up on repeated 5xx answers with a RetryError
+    return isinstance(exc.__cause__, requests.exceptions.RetryError)
+
+
+_LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+def is_allowed_url(url: str) -> bool:
+    """Return ``True`` for HTTPS URLs and plain HTTP URLs on loopback hosts."""
+
+    parts = urlsplit(url)
+    if parts.scheme == "https":
+        return True
+    return parts.scheme == "http" and parts.hostname in _LOOPBACK_HOSTS
+
+
+def set_site_url(url: str) -> None:
+    """Fetch from ``url`` instead of method.gg, e.g. a local stand-in server.
+
+    Both ``BASE_URL`` and the prefix of the detail page links are updated.
+    """
+
+    global SITE_URL, BASE_URL
+    url = url.rstrip("/")
+    if not is_allowed_url(url):
+        raise FetchError(f"Insecure URL not allowed: {url}")
+    SITE_URL = url
+    BASE_URL = SITE_URL + MINIS_PATH
+
+
+def decode_body(body: bytes, headers) -> str:
+    """Decode ``body`` the same way ``requests.Response.text`` would."""
+
+    from requests.compat import chardet
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    encoding = get_encoding_from_headers(CaseInsensitiveDict(headers))
+    if encoding is None:
+        encoding = chardet.detect(body)["encoding"]
+    try:
+        return str(body, encoding, errors="replace")
+    except (LookupError, TypeError):
+        return str(body, errors="replace")
+
+
+def _wire_bytes(response, body: bytes) -> int:
+    """Return the body size of ``response`` as received, before decoding."""
+
+    raw = getattr(response, "raw", None)
+    for source in (response, raw):
+        # httpx responses, also kept as ``raw`` by the HTTP/2 adapter
+        downloaded = getattr(source, "num_bytes_downloaded", None)
+        if isinstance(downloaded, int):
+            return downloaded
+    # urllib3 counts the bytes read from the socket
+    tell = getattr(raw, "tell", None)
+    read = tell() if callable(tell) else None
+    if isinstance(read, int):
+        return read
+    length = response.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else len(body)
+
+
+def _record_transfer(
+    timings: Timings,
+    url: str,
+    response,
+    ttfb: float | None = None,
+    unit: str | None = None,
+) -> None:
+    """Add the sizes and content coding of ``response`` to ``timings``.
+
+    Pages served by the HTTP cache are recorded as :data:`.CACHED` with no
+    wire bytes.
+    """
+
+    from .cache import is_cached
+
+    body = getattr(response, "content", None)
+    if not isinstance(body, bytes):
+        return
+    if is_cached(response):
+        wire, encoding = 0, CACHED
+    else:
+        wire = _wire_bytes(response, body)
+        encoding = response.headers.get("Content-Encoding", "identity")
+    timings.transfer(
+        url,
+        wire_bytes=wire,
+        body_bytes=len(body),
+        encoding=encoding,
+        ttfb=ttfb,
+        unit=unit,
+    )
+
+
+def _elapsed(response) -> float | None:
+    """Return the time until the headers of ``response`` arrived."""
+
+    elapsed = getattr(response, "elapsed", None)
+    return elapsed.total_seconds() if isinstance(elapsed, timedelta) else None
+
+
+def log_cache_summary(session: requests.Session) -> None:
+    """Log hit, revalidation and miss counts if ``session`` uses a cache."""
+
+    from .cache import cache_stats
+
+    stats = cache_stats(session)
+    if stats is not None:
+        logger.info("HTTP cache summary", **stats)
+
+
+def log_pool_summary(session: requests.Session) -> None:
+    """Log opened, reused and discarded connections of ``session``."""
+
+    from .transport import pool_stats
+
+    stats = pool_stats(session)
+    if stats is not None:
+        logger.info("HTTP pool summary", **stats)
+
+
+@dataclass(frozen=True)
+class Overview:
+    """Snapshot of the method.gg overview page.
+
+    The page is fetched and parsed once per run and shared by
+    :func:`fetch_units` and :func:`fetch_categories`. Only the parsed cards
+    are kept, not the page itself.
+    """
+
+    cards: list
+
+
+def fetch_overview(
+    session: requests.Session | None = None,
+    *,
+    timeout: int = 10,
+    parser: str = DEFAULT_PARSER,
+    timings: Timings | None = None,
+) -> Overview:
+    """Download and parse the overview page at ``BASE_URL``.
+
+    ``parser`` selects the HTML backend, see :mod:`.parsing`. Request and
+    parse durations and the transfer are added to ``timings`` if given.
+    """
+
+    if not is_allowed_url(BASE_URL):
+        raise FetchError("BASE_URL must use HTTPS")
+
+    import requests
+
+    sess = session or _get_session()
+    timings = timings if timings is not None else Timings()
+
+    logger.info("Fetching overview from %s", BASE_URL)
+    try:
+        with timings.phase("overview_request"):
+            response = sess.get(
+                BASE_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
+            )
+    except requests.RequestException as exc:
+        raise FetchError(f"Error fetching {BASE_URL}: {exc}") from exc
+    _record_transfer(timings, BASE_URL, response, _elapsed(response))
+    if response.status_code != 200:
+        raise FetchError(
+            f"Error fetching {BASE_URL}: Status {response.status_code}",
+            response.status_code,
+        )
+    with timings.phase("overview_parse"):
+        return _parse_overview(response.text, parser)
+
+
+def _parse_overview(html: str, parser: str = DEFAULT_PARSER) -> Overview:
+    doc = get_parser(parser).parse(html, only="mini-wrapper")
+    return Overview(cards=doc.select("div.mini-wrapper"))
+
+
+def _category_maps(text: str) -> dict:
+    data = json.loads(text)
+
+    def to_map(items: Iterable[dict]) -> dict:
+        return {item["names"]["en"]: item["id"] for item in items}
+
+    trait_desc = {
+        item["id"]: item.get("descriptions", {}).get("en")
+        for item in data.get("traits", [])
+    }
+
+    return {
+        "faction": to_map(data.get("factions", [])),
+        "type": to_map(data.get("types", [])),
+        "trait": to_map(data.get("traits", [])),
+        "speed": to_map(data.get("speeds", [])),
+        "trait_desc": trait_desc,
+    }
 
 
 def load_categories(categories_path: Path | str | None = None) -> dict:
-    """Return mappings for category lookups."""
+    """Return read-only mappings for category lookups.
+
+    Parsed files are cached until they change, see :mod:`.snapshot`.
+    """
 
     path = Path(categories_path or CATEGORIES_PATH)
     if not path.exists():
@@ -100,8 +471,7 @@ def load_categories(categories_path: Path | str | None = None) -> dict:
             "trait_desc": {},
         }
     try:
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
+        return load_snapshot(path, _category_maps)
     except (json.JSONDecodeError, OSError) as exc:
         logger.warning("Could not read categories from %s: %s", path, exc)
         return {
@@ -112,33 +482,28 @@ def load_categories(categories_path: Path | str | None = None) -> dict:
             "trait_desc": {},
         }
 
-    def to_map(items: Iterable[dict]) -> dict:
-        return {item["names"]["en"]: item["id"] for item in items}
 
-    trait_desc = {
-        item["id"]: item.get("descriptions", {}).get("en")
-        for item in data.get("traits", [])
-    }
-
-    return {
-        "faction": to_map(data.get("factions", [])),
-        "type": to_map(data.get("types", [])),
-        "trait": to_map(data.get("traits", [])),
-        "speed": to_map(data.get("speeds", [])),
-        "trait_desc": trait_desc,
-    }
+def _units_by_id(text: str) -> dict:
+    if text.lstrip().startswith("["):
+        units = json.loads(text)
+    else:
+        units = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return {unit.get("id"): unit for unit in units}
 
 
 def load_existing_units(out_path: Path | str | None = None) -> dict:
-    """Return existing units indexed by ``id`` if the JSON file exists."""
+    """Return existing units indexed by ``id`` if the JSON file exists.
+
+    Both a JSON array and NDJSON with one unit per line are accepted. The
+    units are read-only and cached until the file changes, see
+    :mod:`.snapshot`.
+    """
 
     path = Path(out_path or OUT_PATH)
     if not path.exists():
         return {}
     try:
-        with open(path, encoding="utf-8") as f:
-            units = json.load(f)
-        return {unit.get("id"): unit for unit in units}
+        return load_snapshot(path, _units_by_id)
     except (json.JSONDecodeError, OSError):
         return {}
 
@@ -182,43 +547,51 @@ def fetch_categories(
     existing_path: Path | str | None = None,
     units_path: Path | str | None = None,
     trait_desc_map: dict[str, str] | None = None,
+    cache_dir: Path | str | None = None,
+    overview: Overview | None = None,
+    parser: str = DEFAULT_PARSER,
+    timings: Timings | None = None,
+    only_if_changed: bool = False,
+    delta: bool = False,
 ) -> None:
     """Download category data from method.gg and store it as JSON.
 
     ``trait_desc_map`` may contain descriptions keyed by trait id. When
     provided, these values are preferred over any descriptions found in the
-    units file.
+    units file. ``cache_dir`` enables the HTTP cache for a newly created
+    session. A pre-fetched ``overview`` avoids downloading the page again,
+    otherwise it is parsed with the ``parser`` backend. Phase durations go to
+    ``timings``; without it a timing summary is logged at the end.
+
+    The content hash of the file is stored in the export manifest. With
+    ``only_if_changed`` an existing file with the same hash is not replaced.
+    With ``delta`` a JSON Patch from the existing categories is written next
+    to ``out_path``.
     """
 
-    if not BASE_URL.startswith("https://"):
+    if not is_allowed_url(BASE_URL):
         raise FetchError("BASE_URL must use HTTPS")
 
     out_path = Path(out_path or CATEGORIES_PATH)
     source_path = Path(existing_path or out_path)
+    created_timings = timings is None
+    timings = timings if timings is not None else Timings()
 
     created_session = False
     if session is None:
-        sess = create_session()
+        sess = create_session(cache_dir)
         created_session = True
     else:
         sess = session
 
     try:
-        logger.info("Fetching categories from %s", BASE_URL)
-        try:
-            response = sess.get(
-                BASE_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
-            )
-        except requests.RequestException as exc:
-            raise FetchError(f"Error fetching {BASE_URL}: {exc}") from exc
-        if response.status_code != 200:
-            raise FetchError(
-                f"Error fetching {BASE_URL}: Status {response.status_code}"
+        if overview is None:
+            overview = fetch_overview(
+                sess, timeout=timeout, parser=parser, timings=timings
             )
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        minis = soup.select("div.mini-wrapper")
+        build_start = time.perf_counter()
+        minis = overview.cards
         factions_raw = set()
         speeds_map: dict[str, str] = {}
         for mini in minis:
@@ -258,8 +631,7 @@ def fetch_categories(
         existing: dict = {}
         if source_path.exists():
             try:
-                with open(source_path, encoding="utf-8") as f:
-                    existing = json.load(f)
+                existing = load_snapshot(source_path, json.loads)
             except (json.JSONDecodeError, OSError) as exc:
                 logger.warning(
                     "Could not read categories from %s: %s", source_path, exc
@@ -275,7 +647,7 @@ def fetch_categories(
                 cat_id = "-".join(p.lower() for p in parts)
                 en_name = " & ".join(parts)
                 item = dict(existing_map.get(cat_id, {"id": cat_id}))
-                names = item.get("names", {})
+                names = dict(item.get("names", {}))
                 names["en"] = en_name
                 item["names"] = names
                 items.append(item)
@@ -296,7 +668,7 @@ def fetch_categories(
                     else cat_id.replace("-", " ").title()
                 )
                 item = dict(existing_map.get(cat_id, {"id": cat_id}))
-                names = item.get("names", {})
+                names = dict(item.get("names", {}))
                 names["en"] = en_name
                 item["names"] = names
                 desc_value = desc_map.get(cat_id) if desc_map else None
@@ -320,18 +692,29 @@ def fetch_categories(
             "traits": build_from_ids("traits", traits_raw, None, trait_descs),
             "speeds": build_from_ids("speeds", speed_ids, speeds_map),
         }
+        timings.record("categories_build", time.perf_counter() - build_start)
 
         out_path.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = out_path.with_suffix(".tmp")
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write("\n")
-        tmp_path.replace(out_path)
-
-        total = sum(len(v) for v in data.values())
-        logger.info("%s categories saved to %s", total, out_path)
+        with timings.phase("categories_dump"), open(
+            tmp_path, "w", encoding="utf-8"
+        ) as f:
+            writer = HashingWriter(f)
+            json.dump(data, writer, indent=2, ensure_ascii=False)
+            writer.write("\n")
+        if commit_export(
+            tmp_path, out_path, writer.hexdigest(), only_if_changed=only_if_changed
+        ):
+            total = sum(len(v) for v in data.values())
+            logger.info("%s categories saved to %s", total, out_path)
+        if delta:
+            write_delta(delta_path(out_path), existing, data)
+        if created_timings:
+            timings.log_summary()
     finally:
         if created_session:
+            log_cache_summary(sess)
+            log_pool_summary(sess)
             sess.close()
 
 
@@ -341,26 +724,97 @@ def fetch_unit_details(
     *,
     timeout: int = 10,
     session: requests.Session | None = None,
+    parser: str = DEFAULT_PARSER,
+    timings: Timings | None = None,
 ) -> dict:
-    """Fetch and parse the details page for a single mini."""
+    """Fetch and parse the details page for a single mini.
 
-    if not url.startswith("https://"):
+    The ``request``, ``ttfb`` and ``parse`` durations and the transfer
+    sizes are added to ``timings`` under the unit id taken from ``url``.
+    """
+
+    timings = timings if timings is not None else Timings()
+    html = _fetch_unit_page(url, timeout=timeout, session=session, timings=timings)
+    with timings.phase("parse", _unit_label(url)):
+        return parse_unit_details(html, categories, parser=parser)
+
+
+def _fetch_unit_page(
+    url: str,
+    *,
+    timeout: int,
+    session: requests.Session | None,
+    timings: Timings,
+) -> str:
+    """Return the HTML of the details page at ``url``."""
+
+    if not is_allowed_url(url):
         raise FetchError(f"Insecure URL not allowed: {url}")
 
+    import requests
+
     sess = session or _get_session()
+    unit = _unit_label(url)
 
     try:
-        response = sess.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout)
+        with timings.phase("request", unit):
+            response = sess.get(
+                url, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
+            )
     except requests.RequestException as exc:
         raise FetchError(f"Error fetching {url}: {exc}") from exc
+    # Time until the headers arrived, including DNS, connect and TLS
+    _record_transfer(timings, url, response, _elapsed(response), unit)
     if response.status_code != 200:
-        raise FetchError(f"Error fetching {url}: Status {response.status_code}")
+        raise FetchError(
+            f"Error fetching {url}: Status {response.status_code}",
+            response.status_code,
+        )
+    return response.text
 
-    soup = BeautifulSoup(response.text, "html.parser")
+
+def _unit_label(url: str) -> str:
+    """Return the unit id used in timings for a details page ``url``."""
+
+    return url.rstrip("/").rsplit("/", 1)[-1].lower()
+
+
+def _fetch_adaptive(limiter: AdaptiveLimiter, url: str, fetch: Callable[[], T]) -> T:
+    """Call ``fetch`` for ``url`` in a ``limiter`` slot, retrying overload answers."""
+
+    for attempt in range(OVERLOAD_RETRIES + 1):
+        token = limiter.acquire()
+        start = time.perf_counter()
+        try:
+            result = fetch()
+        except FetchError as exc:
+            overloaded = _is_overload(exc)
+            limiter.release(token, time.perf_counter() - start, overloaded=overloaded)
+            if not overloaded or attempt == OVERLOAD_RETRIES:
+                raise
+            logger.warning("Server overloaded, retrying %s", url)
+            time.sleep(OVERLOAD_BACKOFF * 2**attempt)
+        else:
+            limiter.release(token, time.perf_counter() - start)
+            return result
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def parse_unit_details(
+    html: str, categories: dict, *, parser: str = DEFAULT_PARSER
+) -> dict:
+    """Return the details dict extracted from a mini details page.
+
+    ``parser`` selects the HTML backend, see :mod:`.parsing`. ``stats`` keeps
+    the display strings and ``stats_normalized`` their numbers, see
+    :func:`.stats.normalize_stats`.
+    """
+
+    backend = get_parser(parser)
+    soup = backend.parse(html, only="mini-section")
 
     def find_section(title: str):
-        h2 = soup.find("h2", string=lambda t: t and t.strip() == title)
-        return h2.find_parent(class_="mini-section") if h2 else None
+        return backend.find_section(soup, title)
 
     details: dict = {}
 
@@ -398,6 +852,7 @@ def fetch_unit_details(
                 stats[label] = value
     if stats:
         details["stats"] = stats
+        details["stats_normalized"] = normalize_stats(stats)
 
     # Traits section
     traits_section = find_section("Traits")
@@ -469,6 +924,509 @@ def fetch_unit_details(
     return details
 
 
+def _card_link(card) -> tuple[str | None, str]:
+    """Return the details URL and unit id for an overview card."""
+
+    link = card.select_one("a.mini-link")
+    url = f"{SITE_URL}{link['href']}" if link else None
+    unit_id = (
+        (link["href"].split("/")[-1] if link else card.get("data-name", "?"))
+        .lower()
+        .replace(" ", "-")
+    )
+    return url, unit_id
+
+
+def _build_unit(card, details: dict, cats: dict) -> dict:
+    """Return the unit dict for an overview card and its parsed details."""
+
+    name = card.get("data-name", "?")
+    faction_val = card.get("data-family", "?")
+    unit_type = card.get("data-type", "?")
+    cost_attr = card.get("data-cost")
+    cost = int(cost_attr) if cost_attr is not None else None
+
+    damage_attr = card.get("data-damage")
+    damage = int(float(damage_attr)) if damage_attr is not None else None
+    health_attr = card.get("data-health")
+    health = int(float(health_attr)) if health_attr is not None else None
+    dps_attr = card.get("data-dps")
+    dps = float(dps_attr) if dps_attr is not None else None
+    speed_attr = card.get("data-speed")
+    if (
+        speed_attr is None
+        or speed_attr.strip() == ""
+        or speed_attr == "Znull"
+        or speed_attr == STATIONARY
+    ):
+        speed = None
+        speed_val = None
+    else:
+        speed = speed_attr
+        speed_val = speed_attr
+    traits_attr = card.get("data-traits", "")
+    trait_names = [t.strip() for t in traits_attr.split(",") if t.strip()]
+
+    link = card.select_one("a.mini-link")
+    image_elem = card.select_one("img")
+    image_url = image_elem["src"] if image_elem else None
+
+    unit_id = (link["href"].split("/")[-1] if link else name).lower().replace(" ", "-")
+
+    faction_ids = [
+        cats["faction"].get(f, f.lower()) for f in faction_val.split(",") if f
+    ]
+    trait_ids = [cats["trait"].get(t, t.lower().replace(" ", "-")) for t in trait_names]
+    type_id = cats["type"].get(unit_type, unit_type.lower())
+    if speed_val and speed_val != STATIONARY:
+        speed_id = cats["speed"].get(speed_val, speed_val.lower())
+    else:
+        speed_id = None
+
+    unit_data = {
+        "id": unit_id,
+        "names": {"en": name},
+        "faction_ids": faction_ids,
+        "type_id": type_id,
+        "cost": cost,
+        "image": image_url,
+        "damage": damage,
+        "health": health,
+        "dps": dps,
+        "speed_id": speed_id,
+        "trait_ids": trait_ids,
+        "details": details,
+    }
+    if speed is None:
+        unit_data["speed"] = None
+    return unit_data
+
+
+def _plan_incremental(
+    cards: list, existing_units: dict, state: dict, refresh_ttl: int, now: float
+) -> tuple[list, dict[str, dict]]:
+    """Split ``cards`` into cards to fetch and details reused from last run.
+
+    A unit's details are reused when its card fingerprint matches the stored
+    one and its details were fetched less than ``refresh_ttl`` seconds ago.
+    """
+
+    to_fetch = []
+    reused: dict[str, dict] = {}
+    for card in cards:
+        _, unit_id = _card_link(card)
+        entry = state.get(unit_id)
+        old = existing_units.get(unit_id)
+        if (
+            entry is not None
+            and old is not None
+            and "details" in old
+            and entry.get("fingerprint") == card_fingerprint(card)
+            and now - entry.get("fetched_at", 0) < refresh_ttl
+        ):
+            reused[unit_id] = dict(old["details"])
+        else:
+            to_fetch.append(card)
+    logger.info("Fetching %s of %s detail pages", len(to_fetch), len(cards))
+    return to_fetch, reused
+
+
+def _update_fingerprints(
+    path: Path, cards: list, state: dict, fetched_ids: set[str], now: float
+) -> None:
+    """Store the current card fingerprints and detail fetch times."""
+
+    new_state = {}
+    for card in cards:
+        _, unit_id = _card_link(card)
+        fetched_at = (
+            now if unit_id in fetched_ids else state.get(unit_id, {}).get("fetched_at")
+        )
+        new_state[unit_id] = {
+            "fingerprint": card_fingerprint(card),
+            "fetched_at": now if fetched_at is None else fetched_at,
+        }
+    save_fingerprints(path, new_state)
+
+
+def _merge_unit(
+    card,
+    details: dict,
+    cats: dict,
+    existing_units: dict,
+    trait_descs: dict[str, str],
+    timings: Timings,
+) -> dict:
+    """Return the unit to store for ``card`` merged with its previous version.
+
+    Trait descriptions of ``details`` are moved to ``trait_descs``. Details
+    reused from an export without ``stats_normalized`` get it added.
+    """
+
+    start = time.perf_counter()
+    for tid, desc in details.pop("trait_descriptions", {}).items():
+        if desc is not None and tid not in trait_descs:
+            trait_descs[tid] = desc
+    if "stats" in details and "stats_normalized" not in details:
+        details["stats_normalized"] = normalize_stats(details["stats"])
+
+    unit = _build_unit(card, details, cats)
+    old = existing_units.get(unit["id"])
+    if old and not is_unit_changed(old, unit):
+        unit = old
+    else:
+        # Preserve translations from the previous file so they are not lost
+        old_names = old.get("names", {}) if old else {}
+        for lang, text in old_names.items():
+            if lang != "en" and lang not in unit["names"]:
+                unit["names"][lang] = text
+    timings.record("merge", time.perf_counter() - start, unit["id"])
+    return _strip_trait_descriptions(unit)
+
+
+def _detail_fetcher(
+    sess: requests.Session,
+    cats: dict,
+    *,
+    timeout: int,
+    parser: str,
+    limiter: AdaptiveLimiter | None,
+    timings: Timings,
+    parse: bool = True,
+) -> Callable[[object], dict | str | None]:
+    """Return a function fetching the details of an overview card.
+
+    Without ``parse`` the function returns the page HTML instead of the
+    parsed details, or ``None`` for cards without a details page, so the
+    page can be parsed in another process.
+    """
+
+    def fetch(card) -> dict | str | None:
+        url, unit_id = _card_link(card)
+        with timings.phase(UNIT_PHASE, unit_id):
+            if not url:
+                result: dict | str | None = {} if parse else None
+            else:
+
+                def download() -> dict | str:
+                    if not parse:
+                        return _fetch_unit_page(
+                            url, timeout=timeout, session=sess, timings=timings
+                        )
+                    return fetch_unit_details(
+                        url,
+                        cats,
+                        timeout=timeout,
+                        session=sess,
+                        parser=parser,
+                        timings=timings,
+                    )
+
+                result = (
+                    _fetch_adaptive(limiter, url, download)
+                    if limiter is not None
+                    else download()
+                )
+        logger.info("Fetched %s", unit_id)
+        return result
+
+    return fetch
+
+
+def _stream_units(
+    fetch: Callable[[object], dict | str | None],
+    cards: list,
+    reused: dict[str, dict],
+    cats: dict,
+    existing_units: dict,
+    *,
+    max_workers: int,
+    trait_descs: dict[str, str],
+    timings: Timings,
+    parse_pool: Executor | None = None,
+    parse_slots: int = 0,
+    parser: str = DEFAULT_PARSER,
+    journal: Journal | None = None,
+) -> Iterator[tuple[int, dict]]:
+    """Yield ``(position, unit)`` pairs as soon as each unit is complete.
+
+    Units with ``reused`` details come first, fetched units follow in
+    completion order and existing units no longer listed on the overview
+    come last. ``position`` is the index of the unit in the JSON output.
+
+    With a ``parse_pool`` ``fetch`` only downloads the pages and at most
+    ``parse_slots`` of them are parsed in the pool at a time. Downloaded
+    pages wait for a free slot and new downloads only start while fewer
+    than ``PREFETCH_FACTOR * max_workers`` pages are in flight or waiting.
+
+    The details of every fetched unit are recorded in ``journal`` if given.
+    """
+
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    pending = []
+    ready = []
+    for position, card in enumerate(cards):
+        unit_id = _card_link(card)[1]
+        if unit_id in reused:
+            ready.append((position, card, reused[unit_id]))
+        else:
+            pending.append((position, card))
+
+    # Fetch detail pages in parallel, but only a few ahead of the consumer
+    # so finished units are handed on instead of piling up in memory
+    queue = iter(pending)
+    window = max_workers * PREFETCH_FACTOR
+    backlog: deque[tuple[int, object, str]] = deque()
+    parses: dict = {}
+
+    def finish(position: int, card, details: dict) -> tuple[int, object, dict]:
+        # Journal right away so a failure later in the batch loses nothing
+        if journal is not None:
+            journal.record(_card_link(card)[1], details)
+        return position, card, details
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        downloads = {
+            executor.submit(fetch, card): (position, card)
+            for position, card in islice(queue, window)
+        }
+        for position, card, details in ready:
+            yield position, _merge_unit(
+                card, details, cats, existing_units, trait_descs, timings
+            )
+        while downloads or parses:
+            done, _ = wait([*downloads, *parses], return_when=FIRST_COMPLETED)
+            finished = []
+            for future in done:
+                if future in downloads:
+                    position, card = downloads.pop(future)
+                    result = future.result()
+                    if parse_pool is None or result is None:
+                        finished.append(finish(position, card, result or {}))
+                    else:
+                        backlog.append((position, card, result))
+                else:
+                    position, card, start = parses.pop(future)
+                    # Covers the wait for a parse process and the parse itself
+                    timings.record(
+                        "parse", time.perf_counter() - start, _card_link(card)[1]
+                    )
+                    finished.append(finish(position, card, future.result()))
+            while backlog and len(parses) < parse_slots:
+                position, card, html = backlog.popleft()
+                future = parse_pool.submit(
+                    parse_unit_details, html, cats, parser=parser
+                )
+                parses[future] = (position, card, time.perf_counter())
+            for queued in islice(queue, max(0, window - len(downloads) - len(backlog))):
+                downloads[executor.submit(fetch, queued[1])] = queued
+            for position, card, details in finished:
+                yield position, _merge_unit(
+                    card, details, cats, existing_units, trait_descs, timings
+                )
+
+    yield from _stale_units(cards, existing_units)
+
+
+@contextmanager
+def _parse_pool(processes: int) -> Iterator[Executor | None]:
+    """Yield a process pool with ``processes`` workers, or ``None`` for ``0``."""
+
+    if not processes:
+        yield None
+        return
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Fork is unsafe once fetch threads hold locks, so start fresh interpreters
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        yield pool
+
+
+def _stale_units(cards: list, existing_units: dict) -> Iterator[tuple[int, dict]]:
+    """Yield existing units that are no longer listed on the overview."""
+
+    seen = {_card_link(card)[1] for card in cards}
+    stale = (unit for uid, unit in existing_units.items() if uid not in seen)
+    for position, old_unit in enumerate(stale, start=len(cards)):
+        yield position, _strip_trait_descriptions(old_unit)
+
+
+@contextmanager
+def _unit_writer(
+    out_path: Path,
+    output_format: str,
+    timings: Timings,
+    *,
+    only_if_changed: bool = False,
+    previous: list[dict] | None = None,
+) -> Iterator[Callable[[int, dict], None]]:
+    """Yield a function adding ``(position, unit)`` to ``out_path``.
+
+    ``ndjson`` appends and flushes one line per unit as it arrives. ``json``
+    keeps the units until the block ends and writes them as one array
+    ordered by position. The file is replaced atomically on success and its
+    content hash is stored in the manifest, see :mod:`.manifest`. NDJSON is
+    hashed independent of the line order, which follows completion order.
+
+    With ``previous`` units a JSON Patch from them to the written array is
+    stored next to ``out_path``, see :mod:`.delta`.
+    """
+
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if previous is not None and output_format != "json":
+        raise ValueError("Delta output requires the json format")
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(".tmp")
+    collected: list[tuple[int, dict]] = []
+    line_digests: list[bytes] = []
+    count = 0
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+
+        def add(position: int, unit: dict) -> None:
+            nonlocal count
+            count += 1
+            if output_format == "json":
+                collected.append((position, unit))
+                return
+            with timings.phase("json_dump", unit["id"]):
+                line = json.dumps(unit, ensure_ascii=False) + "\n"
+                f.write(line)
+                f.flush()
+                line_digests.append(hashlib.sha256(line.encode("utf-8")).digest())
+
+        try:
+            yield add
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        if output_format == "json":
+            collected.sort(key=lambda item: item[0])
+            writer = HashingWriter(f)
+            with timings.phase("json_dump"):
+                json.dump(
+                    [unit for _, unit in collected],
+                    writer,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+                writer.write("\n")
+            digest = writer.hexdigest()
+        else:
+            digest = unordered_digest(line_digests)
+    if commit_export(tmp_path, out_path, digest, only_if_changed=only_if_changed):
+        logger.info("%s units saved to %s", count, out_path)
+    if previous is not None:
+        write_delta(delta_path(out_path), previous, [unit for _, unit in collected])
+
+
+def _open_journal(
+    out_path: Path, cards: list, to_fetch: list, reused: dict, *, resume: bool
+) -> Journal:
+    """Open the checkpoint journal of ``out_path`` for this overview.
+
+    Details of ``to_fetch`` units completed by an interrupted run are added
+    to ``reused`` when resuming.
+    """
+
+    journal = Journal(journal_path(out_path), overview_snapshot(cards), resume=resume)
+    for card in to_fetch:
+        unit_id = _card_link(card)[1]
+        if unit_id in journal.entries:
+            reused[unit_id] = journal.entries[unit_id]
+    return journal
+
+
+def iter_units(
+    *,
+    categories_path: Path | str | None = None,
+    timeout: int = 10,
+    max_workers: int = 1,
+    session: requests.Session | None = None,
+    existing_path: Path | str | None = None,
+    cache_dir: Path | str | None = None,
+    overview: Overview | None = None,
+    parser: str = DEFAULT_PARSER,
+    adaptive: bool = False,
+    timings: Timings | None = None,
+    trait_descs: dict[str, str] | None = None,
+    parse_processes: int = 0,
+) -> Iterator[dict]:
+    """Yield minis from method.gg as soon as their detail page is parsed.
+
+    Units are merged with the file at ``existing_path`` like in
+    :func:`fetch_units` and yielded in completion order; existing units no
+    longer listed on the overview follow at the end. At most
+    ``PREFETCH_FACTOR * max_workers`` detail pages are fetched ahead of the
+    consumer. Trait descriptions found on the detail pages are added to
+    ``trait_descs``. The other arguments behave like in :func:`fetch_units`.
+    Yielded units are plain, mutable copies, unlike the read-only snapshot
+    returned by :func:`load_existing_units`.
+    """
+
+    if not is_allowed_url(BASE_URL):
+        raise FetchError("BASE_URL must use HTTPS")
+
+    categories_path = Path(categories_path or CATEGORIES_PATH)
+    source_path = Path(existing_path or OUT_PATH)
+    trait_descs = trait_descs if trait_descs is not None else {}
+    timings = timings if timings is not None else Timings()
+
+    created_session = False
+    if session is None:
+        sess = create_session(cache_dir, pool_size=max_workers, adaptive=adaptive)
+        created_session = True
+    else:
+        sess = session
+
+    try:
+        if overview is None:
+            overview = fetch_overview(
+                sess, timeout=timeout, parser=parser, timings=timings
+            )
+        cats = load_categories(categories_path)
+        existing_units = load_existing_units(source_path)
+        limiter = AdaptiveLimiter(max_workers) if adaptive else None
+        fetch = _detail_fetcher(
+            sess,
+            cats,
+            timeout=timeout,
+            parser=parser,
+            limiter=limiter,
+            timings=timings,
+            parse=not parse_processes,
+        )
+        with _parse_pool(parse_processes) as pool:
+            for _, unit in _stream_units(
+                fetch,
+                overview.cards,
+                {},
+                cats,
+                existing_units,
+                max_workers=max_workers,
+                trait_descs=trait_descs,
+                timings=timings,
+                parse_pool=pool,
+                parse_slots=parse_processes * PREFETCH_FACTOR,
+                parser=parser,
+            ):
+                # Merged units share read-only parts of the loaded snapshot
+                yield copy.deepcopy(unit)
+        if limiter is not None:
+            limiter.log_summary()
+    finally:
+        if created_session:
+            log_cache_summary(sess)
+            log_pool_summary(sess)
+            sess.close()
+
+
 def fetch_units(
     *,
     out_path: Path | str | None = None,
@@ -477,173 +1435,428 @@ def fetch_units(
     max_workers: int = 1,
     session: requests.Session | None = None,
     existing_path: Path | str | None = None,
+    cache_dir: Path | str | None = None,
+    overview: Overview | None = None,
+    parser: str = DEFAULT_PARSER,
+    incremental: bool = False,
+    refresh_ttl: int = DEFAULT_REFRESH_TTL,
+    adaptive: bool = False,
+    timings: Timings | None = None,
+    output_format: str = "json",
+    parse_processes: int = 0,
+    resume: bool = False,
+    only_if_changed: bool = False,
+    delta: bool = False,
 ) -> dict[str, str]:
-    """Download minis from method.gg and store them as JSON."""
+    """Download minis from method.gg and store them as JSON.
+
+    ``cache_dir`` enables the HTTP cache for a newly created session. A
+    pre-fetched ``overview`` avoids downloading the page again. ``parser``
+    selects the HTML backend used for all pages.
+
+    With ``incremental`` only detail pages of new or changed overview cards,
+    or of units fetched more than ``refresh_ttl`` seconds ago, are
+    downloaded. Other units keep the details from the existing file. The
+    fingerprints are read from and written next to ``out_path``.
+
+    With ``adaptive`` the number of requests in flight follows an
+    :class:`~.concurrency.AdaptiveLimiter` capped at ``max_workers``, and
+    429/5xx answers are retried with backoff instead of aborting the run. A
+    session created here then leaves these retries to the limiter, see
+    :func:`create_session`; pass one created with ``adaptive`` as well.
+
+    Phase and per-unit durations are added to ``timings``; without it a
+    ``Timing summary`` is logged at the end of the run.
+
+    ``output_format`` ``ndjson`` writes one unit per line as soon as it is
+    finished instead of one JSON array at the end, see :func:`iter_units`.
+
+    With ``parse_processes`` the worker threads only download detail pages
+    and that many processes parse them, so parsing is not serialised by the
+    GIL. At most ``PREFETCH_FACTOR`` pages per process wait to be parsed.
+
+    The details of every fetched unit are appended to a journal next to
+    ``out_path`` that is deleted once the file is written. With ``resume``
+    units found in the journal of an interrupted run for the same overview
+    are not fetched again.
+
+    The content hash of the written file is stored in ``manifest.json`` next
+    to it. With ``only_if_changed`` an existing file with the same content
+    hash is left untouched.
 
-    if not BASE_URL.startswith("https://"):
+    With ``delta`` an RFC 6902 JSON Patch from the existing units to the
+    written ones is stored as ``<name>.patch.json`` next to ``out_path``.
+    """
+
+    if not is_allowed_url(BASE_URL):
         raise FetchError("BASE_URL must use HTTPS")
 
     out_path = Path(out_path or OUT_PATH)
     categories_path = Path(categories_path or CATEGORIES_PATH)
     source_path = Path(existing_path or out_path)
+    created_timings = timings is None
+    timings = timings if timings is not None else Timings()
 
     created_session = False
     if session is None:
-        sess = create_session()
+        sess = create_session(cache_dir, pool_size=max_workers, adaptive=adaptive)
         created_session = True
     else:
         sess = session
 
     try:
-        logger.info("Fetching overview from %s", BASE_URL)
-        try:
-            response = sess.get(
-                BASE_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
+        if overview is None:
+            overview = fetch_overview(
+                sess, timeout=timeout, parser=parser, timings=timings
             )
-        except requests.RequestException as exc:
-            raise FetchError(f"Error fetching {BASE_URL}: {exc}") from exc
-        if response.status_code != 200:
-            raise FetchError(
-                f"Error fetching {BASE_URL}: Status {response.status_code}"
-            )
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        cards = soup.select("div.mini-wrapper")
+        cards = overview.cards
 
         cats = load_categories(categories_path)
-        scraped_units = []
         existing_units = load_existing_units(source_path)
+        now = time.time()
+        # The state describes the written file, so it is read from there too
+        state_path = fingerprint_path(out_path)
+        state = load_fingerprints(state_path) if incremental else {}
+        to_fetch, reused = (
+            _plan_incremental(cards, existing_units, state, refresh_ttl, now)
+            if incremental
+            else (cards, {})
+        )
 
-        from concurrent.futures import ThreadPoolExecutor
+        limiter = AdaptiveLimiter(max_workers) if adaptive else None
+        fetch = _detail_fetcher(
+            sess,
+            cats,
+            timeout=timeout,
+            parser=parser,
+            limiter=limiter,
+            timings=timings,
+            parse=not parse_processes,
+        )
+        trait_descs: dict[str, str] = {}
+        journal = _open_journal(out_path, cards, to_fetch, reused, resume=resume)
+        try:
+            with _parse_pool(parse_processes) as pool, _unit_writer(
+                out_path,
+                output_format,
+                timings,
+                only_if_changed=only_if_changed,
+                previous=list(existing_units.values()) if delta else None,
+            ) as add:
+                for position, unit in _stream_units(
+                    fetch,
+                    cards,
+                    reused,
+                    cats,
+                    existing_units,
+                    max_workers=max_workers,
+                    trait_descs=trait_descs,
+                    timings=timings,
+                    parse_pool=pool,
+                    parse_slots=parse_processes * PREFETCH_FACTOR,
+                    parser=parser,
+                    journal=journal,
+                ):
+                    add(position, unit)
+        except BaseException:
+            journal.close()
+            raise
+        journal.discard()
+        if limiter is not None:
+            limiter.log_summary()
+
+        if incremental:
+            fetched_ids = {_card_link(card)[1] for card in to_fetch}
+            _update_fingerprints(state_path, cards, state, fetched_ids, now)
+        if created_timings:
+            timings.log_summary()
+        return trait_descs
+    finally:
+        if created_session:
+            log_cache_summary(sess)
+            log_pool_summary(sess)
+            sess.close()
 
-        # Fetch detail pages in parallel to speed up scraping
-        def fetch(card) -> tuple[str, dict]:
-            link = card.select_one("a.mini-link")
-            url = f"https://www.method.gg{link['href']}" if link else None
-            unit_id = (
-                (link["href"].split("/")[-1] if link else card.get("data-name", "?"))
-                .lower()
-                .replace(" ", "-")
-            )
-            details = (
-                fetch_unit_details(url, cats, timeout=timeout, session=sess)
-                if url
-                else {}
-            )
-            logger.info("Fetched %s", unit_id)
-            return unit_id, details
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            detail_results = list(executor.map(fetch, cards))
+async def fetch_units_async(
+    *,
+    out_path: Path | str | None = None,
+    categories_path: Path | str | None = None,
+    timeout: int = 10,
+    max_concurrency: int = 10,
+    client=None,
+    existing_path: Path | str | None = None,
+    cache_dir: Path | str | None = None,
+    overview: Overview | None = None,
+    parser: str = DEFAULT_PARSER,
+    incremental: bool = False,
+    refresh_ttl: int = DEFAULT_REFRESH_TTL,
+    adaptive: bool = False,
+    timings: Timings | None = None,
+    output_format: str = "json",
+    parse_processes: int = 0,
+    resume: bool = False,
+    only_if_changed: bool = False,
+    delta: bool = False,
+    http2: bool = False,
+) -> dict[str, str]:
+    """Asynchronous variant of :func:`fetch_units` built on ``httpx``.
+
+    Detail pages are fetched on a single event loop with at most
+    ``max_concurrency`` requests in flight over one pooled
+    ``httpx.AsyncClient``. The written file is identical to the one produced
+    by :func:`fetch_units`. A pre-fetched ``overview`` is reused as is and
+    ``incremental``/``refresh_ttl``, ``adaptive`` (capped at
+    ``max_concurrency``), ``timings``, ``output_format``, ``parse_processes``,
+    ``resume``, ``only_if_changed`` and ``delta`` behave like in
+    :func:`fetch_units`; the ``request`` phase covers the complete response.
+    ``500``/``502``/``503``/``504`` answers are retried with backoff like by
+    the adapter of :func:`create_session`. With ``http2`` the created client
+    multiplexes requests over HTTP/2.
+    """
 
-        details_map = {uid: det for uid, det in detail_results}
-        trait_descs: dict[str, str] = {}
-        for det in details_map.values():
-            for tid, desc in det.get("trait_descriptions", {}).items():
-                if desc is not None and tid not in trait_descs:
-                    trait_descs[tid] = desc
-            det.pop("trait_descriptions", None)
-
-        for card in cards:
-            name = card.get("data-name", "?")
-            faction_val = card.get("data-family", "?")
-            unit_type = card.get("data-type", "?")
-            cost_attr = card.get("data-cost")
-            cost = int(cost_attr) if cost_attr is not None else None
-
-            damage_attr = card.get("data-damage")
-            damage = int(float(damage_attr)) if damage_attr is not None else None
-            health_attr = card.get("data-health")
-            health = int(float(health_attr)) if health_attr is not None else None
-            dps_attr = card.get("data-dps")
-            dps = float(dps_attr) if dps_attr is not None else None
-            speed_attr = card.get("data-speed")
-            if (
-                speed_attr is None
-                or speed_attr.strip() == ""
-                or speed_attr == "Znull"
-                or speed_attr == STATIONARY
-            ):
-                speed = None
-                speed_val = None
-            else:
-                speed = speed_attr
-                speed_val = speed_attr
-            traits_attr = card.get("data-traits", "")
-            trait_names = [t.strip() for t in traits_attr.split(",") if t.strip()]
-
-            link = card.select_one("a.mini-link")
-            image_elem = card.select_one("img")
-            image_url = image_elem["src"] if image_elem else None
-
-            unit_id = (
-                (link["href"].split("/")[-1] if link else name)
-                .lower()
-                .replace(" ", "-")
+    import asyncio
+
+    import httpx
+
+    from .cache import HTTPCache, conditional_headers, is_cacheable, is_fresh
+    from .transport import RETRIES, RETRY_BACKOFF, RETRY_STATUSES, PoolCounter
+
+    if not is_allowed_url(BASE_URL):
+        raise FetchError("BASE_URL must use HTTPS")
+
+    out_path = Path(out_path or OUT_PATH)
+    categories_path = Path(categories_path or CATEGORIES_PATH)
+    source_path = Path(existing_path or out_path)
+    cache = HTTPCache(cache_dir) if cache_dir is not None else None
+    created_timings = timings is None
+    timings = timings if timings is not None else Timings()
+
+    created_client = False
+    if client is None:
+        limits = httpx.Limits(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+        )
+        transport = httpx.AsyncHTTPTransport(retries=3, limits=limits, http2=http2)
+        counter = PoolCounter()
+
+        async def trace_request(request) -> None:
+            counter.count_request()
+            request.extensions["trace"] = counter.atrace
+
+        client = httpx.AsyncClient(
+            transport=transport, event_hooks={"request": [trace_request]}
+        )
+        created_client = True
+
+    encodings = accept_encoding()
+
+    async def get_text(
+        url: str, phase: str = "request", *, status_retries: bool = True
+    ) -> str:
+        headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": encodings}
+        entry = cache.get(url) if cache is not None else None
+        unit = _unit_label(url) if phase == "request" else None
+        if entry is not None and is_fresh(entry[0]):
+            # Served without a request, like by the ``CachingAdapter``
+            timings.transfer(
+                url, wire_bytes=0, body_bytes=len(entry[1]), encoding=CACHED, unit=unit
+            )
+            cache.record("hits")
+            return decode_body(entry[1], entry[0]["headers"])
+        if entry is not None:
+            headers.update(conditional_headers(entry[0]))
+        try:
+            with timings.phase(phase, unit):
+                # Retry transport errors and, unless the adaptive limiter
+                # handles them, 5xx answers like the ``Retry`` of the sync
+                # adapter
+                retry_statuses = RETRY_STATUSES if status_retries else ()
+                for attempt in range(RETRIES + 1):
+                    if attempt:
+                        await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+                    request = client.build_request(
+                        "GET", url, headers=headers, timeout=timeout
+                    )
+                    start = time.perf_counter()
+                    try:
+                        response = await client.send(request, stream=True)
+                        ttfb = time.perf_counter() - start
+                        try:
+                            await response.aread()
+                        finally:
+                            await response.aclose()
+                    except httpx.TransportError:
+                        if attempt == RETRIES:
+                            raise
+                        logger.debug("Transport error, retrying %s", url)
+                        continue
+                    if response.status_code not in retry_statuses:
+                        break
+        except httpx.HTTPError as exc:
+            # ``str()`` of e.g. ``ReadError`` is often empty
+            raise FetchError(f"Error fetching {url}: {exc!r}") from exc
+        if response.status_code == 304 and entry is not None:
+            timings.transfer(
+                url,
+                wire_bytes=0,
+                body_bytes=len(entry[1]),
+                encoding=CACHED,
+                ttfb=ttfb,
+                unit=unit,
             )
+            cache.refresh(url, response.headers)
+            cache.record("revalidated")
+            return decode_body(entry[1], entry[0]["headers"])
+        _record_transfer(timings, url, response, ttfb, unit)
+        if response.status_code != 200:
+            raise FetchError(
+                f"Error fetching {url}: Status {response.status_code}",
+                response.status_code,
+            )
+        if cache is not None:
+            cache.record("misses")
+            if is_cacheable(response.headers):
+                cache.store(url, response.headers, response.content)
+        return decode_body(response.content, response.headers)
 
-            details = details_map.get(unit_id, {})
-
-            faction_ids = [
-                cats["faction"].get(f, f.lower()) for f in faction_val.split(",") if f
-            ]
-            trait_ids = [
-                cats["trait"].get(t, t.lower().replace(" ", "-")) for t in trait_names
-            ]
-            type_id = cats["type"].get(unit_type, unit_type.lower())
-            if speed_val and speed_val != STATIONARY:
-                speed_id = cats["speed"].get(speed_val, speed_val.lower())
-            else:
-                speed_id = None
-
-            unit_data = {
-                "id": unit_id,
-                "names": {"en": name},
-                "faction_ids": faction_ids,
-                "type_id": type_id,
-                "cost": cost,
-                "image": image_url,
-                "damage": damage,
-                "health": health,
-                "dps": dps,
-                "speed_id": speed_id,
-                "trait_ids": trait_ids,
-                "details": details,
-            }
-            if speed is None:
-                unit_data["speed"] = None
-
-            scraped_units.append(unit_data)
-
-        result_units = []
-        seen = set()
-        for unit in scraped_units:
-            old = existing_units.get(unit["id"])
-            seen.add(unit["id"])
-            if old and not is_unit_changed(old, unit):
-                result_units.append(_strip_trait_descriptions(old))
-                continue
-
-            # Preserve translations from the previous file so they are not lost
-            old_names = old.get("names", {}) if old else {}
-            for lang, text in old_names.items():
-                if lang != "en" and lang not in unit["names"]:
-                    unit["names"][lang] = text
-            result_units.append(_strip_trait_descriptions(unit))
-
-        for uid, old_unit in existing_units.items():
-            if uid not in seen:
-                result_units.append(_strip_trait_descriptions(old_unit))
+    try:
+        if overview is None:
+            logger.info("Fetching overview from %s", BASE_URL)
+            html = await get_text(BASE_URL, "overview_request")
+            with timings.phase("overview_parse"):
+                overview = _parse_overview(html, parser)
+        cards = overview.cards
 
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = out_path.with_suffix(".tmp")
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(result_units, f, indent=2, ensure_ascii=False)
-            f.write("\n")
-        tmp_path.replace(out_path)
+        cats = load_categories(categories_path)
+        existing_units = load_existing_units(source_path)
+        now = time.time()
+        # The state describes the written file, so it is read from there too
+        state_path = fingerprint_path(out_path)
+        state = load_fingerprints(state_path) if incremental else {}
+        to_fetch, reused = (
+            _plan_incremental(cards, existing_units, state, refresh_ttl, now)
+            if incremental
+            else (cards, {})
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+        limiter = AsyncAdaptiveLimiter(max_concurrency) if adaptive else None
+
+        async def get_text_adaptive(url: str) -> str:
+            for attempt in range(OVERLOAD_RETRIES + 1):
+                token = await limiter.acquire()
+                start = time.perf_counter()
+                try:
+                    # The limiter retries overload answers itself
+                    html = await get_text(url, status_retries=False)
+                except FetchError as exc:
+                    overloaded = _is_overload(exc)
+                    await limiter.release(
+                        token, time.perf_counter() - start, overloaded=overloaded
+                    )
+                    if not overloaded or attempt == OVERLOAD_RETRIES:
+                        raise
+                    logger.warning("Server overloaded, retrying %s", url)
+                    await asyncio.sleep(OVERLOAD_BACKOFF * 2**attempt)
+                else:
+                    await limiter.release(token, time.perf_counter() - start)
+                    return html
+            raise AssertionError("unreachable")  # pragma: no cover
+
+        async def fetch(position: int, card) -> tuple[int, object, dict]:
+            url, unit_id = _card_link(card)
+            details: dict = {}
+            start = time.perf_counter()
+            if url:
+                if not is_allowed_url(url):
+                    raise FetchError(f"Insecure URL not allowed: {url}")
+                if limiter is not None:
+                    html = await get_text_adaptive(url)
+                else:
+                    async with semaphore:
+                        html = await get_text(url)
+                if parse_pool is None:
+                    with timings.phase("parse", unit_id):
+                        details = parse_unit_details(html, cats, parser=parser)
+                else:
+                    async with parse_slots:
+                        with timings.phase("parse", unit_id):
+                            details = await loop.run_in_executor(
+                                parse_pool,
+                                partial(parse_unit_details, html, cats, parser=parser),
+                            )
+            timings.record(UNIT_PHASE, time.perf_counter() - start, unit_id)
+            logger.info("Fetched %s", unit_id)
+            return position, card, details
 
-        logger.info("%s units saved to %s", len(result_units), out_path)
+        loop = asyncio.get_running_loop()
+        parse_slots = asyncio.Semaphore(max(1, parse_processes * PREFETCH_FACTOR))
+        trait_descs: dict[str, str] = {}
+        tasks = []
+        journal = _open_journal(out_path, cards, to_fetch, reused, resume=resume)
+        try:
+            with _parse_pool(parse_processes) as parse_pool, _unit_writer(
+                out_path,
+                output_format,
+                timings,
+                only_if_changed=only_if_changed,
+                previous=list(existing_units.values()) if delta else None,
+            ) as add:
+                for position, card in enumerate(cards):
+                    unit_id = _card_link(card)[1]
+                    if unit_id in reused:
+                        add(
+                            position,
+                            _merge_unit(
+                                card,
+                                reused[unit_id],
+                                cats,
+                                existing_units,
+                                trait_descs,
+                                timings,
+                            ),
+                        )
+                    else:
+                        tasks.append(asyncio.ensure_future(fetch(position, card)))
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        position, card, details = await next_done
+                        journal.record(_card_link(card)[1], details)
+                        add(
+                            position,
+                            _merge_unit(
+                                card,
+                                details,
+                                cats,
+                                existing_units,
+                                trait_descs,
+                                timings,
+                            ),
+                        )
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
+                for position, unit in _stale_units(cards, existing_units):
+                    add(position, unit)
+        except BaseException:
+            journal.close()
+            raise
+        journal.discard()
+        if limiter is not None:
+            limiter.log_summary()
+
+        if incremental:
+            fetched_ids = {_card_link(card)[1] for card in to_fetch}
+            _update_fingerprints(state_path, cards, state, fetched_ids, now)
+        if cache is not None:
+            logger.info("HTTP cache summary", **cache.stats)
+        if created_client:
+            logger.info("HTTP pool summary", **counter.stats(transport))
+        if created_timings:
+            timings.log_summary()
         return trait_descs
     finally:
-        if created_session:
-            sess.close()
+        if created_client:
+            await client.aclose()
@@ -0,0 +1,195 @@
+"""Content-addressed mirror of the mini images."""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Iterable
+from urllib.parse import urljoin, urlsplit
+
+from . import fetcher
+from .instrumentation import Timings
+from .log import get_logger
+from .manifest import load_manifest, save_manifest
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    import requests
+
+logger = get_logger(__name__)
+
+IMAGE_MANIFEST = "images.json"
+# Parallel image downloads, independent of the detail page workers
+IMAGE_WORKERS = 8
+
+
+def image_path(digest: str, suffix: str) -> str:
+    """Return where an image with SHA-256 ``digest`` is stored in the mirror."""
+
+    return f"{digest[:2]}/{digest}{suffix}"
+
+
+def _suffix(url: str, content_type: str | None) -> str:
+    suffix = PurePosixPath(urlsplit(url).path).suffix.lower()
+    if suffix:
+        return suffix
+    media_type = (content_type or "").split(";", 1)[0].strip()
+    return mimetypes.guess_extension(media_type) or ""
+
+
+def load_image_manifest(mirror_dir: Path | str) -> dict[str, dict]:
+    """Return the manifest of ``mirror_dir`` with ``units`` and ``images``."""
+
+    manifest = load_manifest(Path(mirror_dir) / IMAGE_MANIFEST)
+    return {
+        "units": manifest.get("units", {}),
+        "images": manifest.get("images", {}),
+    }
+
+
+class _Mirror:
+    """Download images into ``mirror_dir``, revalidating known ones."""
+
+    def __init__(
+        self,
+        mirror_dir: Path,
+        known: dict[str, dict],
+        *,
+        session: requests.Session,
+        timeout: int,
+        timings: Timings,
+    ) -> None:
+        self.mirror_dir = mirror_dir
+        self.known = known
+        self.session = session
+        self.timeout = timeout
+        self.timings = timings
+        self._write_lock = threading.Lock()
+
+    def fetch(self, url: str) -> tuple[str, dict | None]:
+        """Return the outcome for ``url`` and its manifest entry.
+
+        The outcome is ``downloaded``, ``unchanged`` or ``failed``; a failed
+        download keeps the previous entry if its file is still there.
+        """
+
+        import requests
+
+        entry = self.known.get(url)
+        if entry is not None and not (self.mirror_dir / entry["path"]).exists():
+            entry = None
+        headers = {"User-Agent": "Mozilla/5.0"}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            with self.timings.phase("image_request"):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as exc:
+            logger.warning("Error fetching image %s: %s", url, exc)
+            return "failed", entry
+        fetcher._record_transfer(
+            self.timings, url, response, fetcher._elapsed(response)
+        )
+        if response.status_code == 304 and entry is not None:
+            return "unchanged", entry
+        if response.status_code != 200:
+            logger.warning(
+                "Error fetching image %s: Status %s", url, response.status_code
+            )
+            return "failed", entry
+
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        relative = image_path(
+            digest, _suffix(url, response.headers.get("Content-Type"))
+        )
+        self._store(relative, body)
+        return "downloaded", {
+            "sha256": digest,
+            "path": relative,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    def _store(self, relative: str, body: bytes) -> None:
+        path = self.mirror_dir / relative
+        # Equal content shares one file, written once
+        with self._write_lock:
+            if path.exists():
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_bytes(body)
+            tmp_path.replace(path)
+
+
+def mirror_images(
+    units: Iterable[dict],
+    mirror_dir: Path | str,
+    *,
+    session: requests.Session | None = None,
+    max_workers: int = IMAGE_WORKERS,
+    timeout: int = 10,
+    timings: Timings | None = None,
+) -> dict[str, dict]:
+    """Download the ``image`` of every unit into ``mirror_dir``.
+
+    Images are stored under their SHA-256 hash (see :func:`image_path`), so
+    equal images are kept once and a file never changes its content.
+    Images from earlier runs are revalidated with ``If-None-Match`` and
+    ``If-Modified-Since``. The manifest ``images.json`` maps each unit id to
+    the ``sha256`` and ``path`` of its image and keeps the validators per
+    image URL; it is returned as well. Failed downloads are logged and keep
+    the previous image. Files no longer referenced are not deleted. Images
+    bypass the HTTP cache of ``session``, see :func:`.cache.uncached_session`.
+    """
+
+    from .cache import uncached_session
+
+    mirror_dir = Path(mirror_dir)
+    previous = load_image_manifest(mirror_dir)
+    timings = timings if timings is not None else Timings()
+    urls: dict[str, str] = {}
+    for unit in units:
+        if unit.get("image"):
+            url = urljoin(fetcher.SITE_URL + "/", unit["image"])
+            if fetcher.is_allowed_url(url):
+                urls[unit["id"]] = url
+            else:
+                logger.warning("Insecure image URL not allowed: %s", url)
+
+    mirror = _Mirror(
+        mirror_dir,
+        previous["images"],
+        # The mirror revalidates and stores images itself
+        session=uncached_session(session or fetcher._get_session()),
+        timeout=timeout,
+        timings=timings,
+    )
+    unique = list(dict.fromkeys(urls.values()))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(unique, executor.map(mirror.fetch, unique)))
+
+    outcomes = {"downloaded": 0, "unchanged": 0, "failed": 0}
+    images = {}
+    for url, (outcome, entry) in results.items():
+        outcomes[outcome] += 1
+        if entry is not None:
+            images[url] = entry
+    manifest = {
+        "units": {
+            unit_id: {"sha256": images[url]["sha256"], "path": images[url]["path"]}
+            for unit_id, url in urls.items()
+            if url in images
+        },
+        "images": images,
+    }
+    save_manifest(mirror_dir / IMAGE_MANIFEST, manifest)
+    files = {entry["path"] for entry in images.values()}
+    logger.info("Image mirror summary", files=len(files), **outcomes)
+    return manifest
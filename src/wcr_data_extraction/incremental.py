@@ -0,0 +1,70 @@
+"""Fingerprints of overview cards used to skip unchanged detail pages."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from .log import get_logger
+
+
+logger = get_logger(__name__)
+
+# Refetch detail pages at least once a day even if their card is unchanged
+DEFAULT_REFRESH_TTL = 24 * 60 * 60
+
+FINGERPRINT_ATTRS = (
+    "data-name",
+    "data-family",
+    "data-type",
+    "data-cost",
+    "data-damage",
+    "data-health",
+    "data-dps",
+    "data-speed",
+    "data-traits",
+)
+
+
+def card_fingerprint(card) -> str:
+    """Return a stable hash of the data attributes, link and image of ``card``."""
+
+    link = card.select_one("a.mini-link")
+    image = card.select_one("img")
+    parts = [f"{attr}={card.get(attr)}" for attr in FINGERPRINT_ATTRS]
+    parts.append(f"href={link.get('href') if link else None}")
+    parts.append(f"src={image.get('src') if image else None}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def fingerprint_path(units_path: Path | str) -> Path:
+    """Return the fingerprint state file stored next to ``units_path``."""
+
+    return Path(units_path).with_suffix(".fingerprints.json")
+
+
+def load_fingerprints(path: Path | str) -> dict[str, dict]:
+    """Return the fingerprint state keyed by unit id or ``{}``."""
+
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.warning("Could not read fingerprints from %s: %s", path, exc)
+        return {}
+
+
+def save_fingerprints(path: Path | str, state: dict[str, dict]) -> None:
+    """Atomically write the fingerprint state to ``path``."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write("\n")
+    tmp_path.replace(path)
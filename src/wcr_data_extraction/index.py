@@ -0,0 +1,169 @@
+"""In-memory indexes and composable queries over exported units."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .fetcher import load_existing_units
+
+# Fields with a hash index; list fields index every item
+HASH_FIELDS = ("faction_ids", "type_id", "trait_ids", "speed_id")
+# Numeric fields with a sorted index for range queries
+RANGE_FIELDS = ("cost", "health", "damage", "dps")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class UnitIndex:
+    """Hash and sorted indexes over ``units``, built once.
+
+    ``get`` looks a unit up by id. :meth:`where` and :meth:`between` start a
+    :class:`UnitQuery`, e.g.
+    ``index.where(faction_ids="undead").between("cost", high=3)``.
+    """
+
+    def __init__(self, units: Iterable[dict]) -> None:
+        self.units = list(units)
+        self._by_id = {unit["id"]: unit for unit in self.units}
+        self._hash: dict[str, dict] = {field: {} for field in HASH_FIELDS}
+        for position, unit in enumerate(self.units):
+            for field in HASH_FIELDS:
+                value = unit.get(field)
+                values = value if isinstance(value, list) else [value]
+                for item in dict.fromkeys(values):
+                    if item is not None:
+                        self._hash[field].setdefault(item, []).append(position)
+        self._sorted: dict[str, tuple[list, list[int]]] = {}
+        for field in RANGE_FIELDS:
+            pairs = sorted(
+                (unit[field], position)
+                for position, unit in enumerate(self.units)
+                if _is_number(unit.get(field))
+            )
+            self._sorted[field] = (
+                [value for value, _ in pairs],
+                [position for _, position in pairs],
+            )
+
+    @classmethod
+    def from_file(cls, units_path: Path | str | None = None) -> UnitIndex:
+        """Return an index of the units exported to ``units_path``."""
+
+        return cls(load_existing_units(units_path).values())
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def get(self, unit_id: str) -> dict | None:
+        """Return the unit with ``unit_id`` or ``None``."""
+
+        return self._by_id.get(unit_id)
+
+    def query(self) -> UnitQuery:
+        """Return a query matching every unit."""
+
+        return UnitQuery(self)
+
+    def where(self, **equals) -> UnitQuery:
+        """Shortcut for ``query().where(**equals)``."""
+
+        return self.query().where(**equals)
+
+    def between(self, field: str, low=None, high=None) -> UnitQuery:
+        """Shortcut for ``query().between(field, low, high)``."""
+
+        return self.query().between(field, low, high)
+
+    def _candidates(self, condition: tuple) -> tuple[int, Iterable[int]]:
+        """Return the number and positions of units matching ``condition``."""
+
+        kind, field, *args = condition
+        if kind == "eq":
+            positions = self._hash[field].get(args[0], [])
+            return len(positions), positions
+        values, positions = self._sorted[field]
+        low, high = args
+        start = 0 if low is None else bisect_left(values, low)
+        stop = len(values) if high is None else bisect_right(values, high)
+        stop = max(start, stop)
+        return stop - start, (positions[i] for i in range(start, stop))
+
+
+def _matches(unit: dict, condition: tuple) -> bool:
+    kind, field, *args = condition
+    value = unit.get(field)
+    if kind == "eq":
+        return args[0] in value if isinstance(value, list) else value == args[0]
+    low, high = args
+    return (
+        _is_number(value)
+        and (low is None or value >= low)
+        and (high is None or value <= high)
+    )
+
+
+class UnitQuery:
+    """Immutable conjunction of conditions on a :class:`UnitIndex`.
+
+    Iterating yields the matching units lazily. The most selective condition
+    drives the iteration through its index, the others are checked per unit,
+    so results follow that index: export order for :meth:`where`, ascending
+    values for :meth:`between`.
+    """
+
+    def __init__(self, index: UnitIndex, conditions: tuple = ()) -> None:
+        self._index = index
+        self._conditions = conditions
+
+    def where(self, **equals) -> UnitQuery:
+        """Return a query also requiring each field to equal or contain a value.
+
+        Fields must be in :data:`HASH_FIELDS`; list fields such as
+        ``trait_ids`` match if they contain the value.
+        """
+
+        conditions = []
+        for field, value in equals.items():
+            if field not in HASH_FIELDS:
+                raise ValueError(f"No hash index on {field!r}")
+            conditions.append(("eq", field, value))
+        return UnitQuery(self._index, self._conditions + tuple(conditions))
+
+    def between(self, field: str, low=None, high=None) -> UnitQuery:
+        """Return a query also requiring ``low <= field <= high``.
+
+        Either bound may be ``None``. ``field`` must be in
+        :data:`RANGE_FIELDS`; units without a number in it never match.
+        """
+
+        if field not in RANGE_FIELDS:
+            raise ValueError(f"No sorted index on {field!r}")
+        return UnitQuery(
+            self._index, self._conditions + (("between", field, low, high),)
+        )
+
+    def __iter__(self) -> Iterator[dict]:
+        if not self._conditions:
+            yield from self._index.units
+            return
+        candidates = [self._index._candidates(cond) for cond in self._conditions]
+        best = min(range(len(candidates)), key=lambda i: candidates[i][0])
+        rest = self._conditions[:best] + self._conditions[best + 1 :]
+        for position in candidates[best][1]:
+            unit = self._index.units[position]
+            if all(_matches(unit, condition) for condition in rest):
+                yield unit
+
+    def ids(self) -> Iterator[str]:
+        """Yield the ids of the matching units."""
+
+        return (unit["id"] for unit in self)
+
+    def count(self) -> int:
+        """Return the number of matching units."""
+
+        return sum(1 for _ in self)
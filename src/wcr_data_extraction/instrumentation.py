@@ -0,0 +1,201 @@
+"""Phase timings and profiling for extractor runs."""
+
+from __future__ import annotations
+
+import cProfile
+import math
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from .log import get_logger
+
+
+logger = get_logger(__name__)
+
+# Phase covering the whole fetch of one unit, used to rank the slowest units
+UNIT_PHASE = "unit"
+# Content coding recorded for pages served by the HTTP cache
+CACHED = "cached"
+# From 3.12 on cProfile builds on ``sys.monitoring``: one profiler sees every
+# thread, and enabling a second one raises ``ValueError``
+_PROFILE_PER_THREAD = sys.version_info < (3, 12)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank ``pct`` percentile of ``values``."""
+
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class Timings:
+    """Collect durations by phase and by unit for one run.
+
+    Every measurement is logged as a debug ``Phase timing`` event.
+    :meth:`log_summary` ends the run with p50/p95/max per phase and the
+    slowest units, and with the bytes recorded by :meth:`transfer`.
+    Instances are shared by the worker threads of a run.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.phases: dict[str, list[float]] = {}
+        self.units: dict[str, dict[str, float]] = {}
+        self.transfers: list[dict] = []
+
+    @contextmanager
+    def phase(self, name: str, unit: str | None = None) -> Iterator[None]:
+        """Time the ``with`` block as phase ``name`` of ``unit``."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, unit)
+
+    def record(self, name: str, seconds: float, unit: str | None = None) -> None:
+        """Add a measurement of ``seconds`` for phase ``name``."""
+
+        with self._lock:
+            self.phases.setdefault(name, []).append(seconds)
+            if unit is not None:
+                breakdown = self.units.setdefault(unit, {})
+                breakdown[name] = breakdown.get(name, 0.0) + seconds
+        logger.debug("Phase timing", phase=name, unit=unit, ms=_ms(seconds))
+
+    def transfer(
+        self,
+        url: str,
+        *,
+        wire_bytes: int,
+        body_bytes: int,
+        encoding: str,
+        ttfb: float | None = None,
+        unit: str | None = None,
+    ) -> None:
+        """Record one response from ``url``.
+
+        ``wire_bytes`` is the body as received and ``body_bytes`` after
+        decoding ``encoding``. ``ttfb`` is also added as phase ``ttfb`` of
+        ``unit``.
+        """
+
+        entry = {
+            "url": url,
+            "wire_bytes": wire_bytes,
+            "body_bytes": body_bytes,
+            "encoding": encoding,
+        }
+        with self._lock:
+            self.transfers.append(entry)
+        logger.debug("Transfer", **entry, ttfb_ms=None if ttfb is None else _ms(ttfb))
+        if ttfb is not None:
+            self.record("ttfb", ttfb, unit)
+
+    def bandwidth(self, largest: int = 5) -> dict:
+        """Return byte totals, requests per encoding and the ``largest`` pages."""
+
+        with self._lock:
+            transfers = list(self.transfers)
+        wire = sum(entry["wire_bytes"] for entry in transfers)
+        body = sum(entry["body_bytes"] for entry in transfers)
+        encodings: dict[str, int] = {}
+        for entry in transfers:
+            encodings[entry["encoding"]] = encodings.get(entry["encoding"], 0) + 1
+        ranked = sorted(transfers, key=lambda entry: entry["body_bytes"], reverse=True)
+        return {
+            "requests": len(transfers),
+            "wire_bytes": wire,
+            "body_bytes": body,
+            "compression_ratio": round(body / wire, 2) if wire else None,
+            "encodings": encodings,
+            "largest_pages": ranked[:largest],
+        }
+
+    def summary(self, slowest: int = 5) -> dict:
+        """Return percentiles per phase and the ``slowest`` units."""
+
+        with self._lock:
+            phases = {
+                name: {
+                    "count": len(values),
+                    "total_ms": _ms(sum(values)),
+                    "p50_ms": _ms(_percentile(values, 50)),
+                    "p95_ms": _ms(_percentile(values, 95)),
+                    "max_ms": _ms(max(values)),
+                }
+                for name, values in self.phases.items()
+            }
+            ranked = sorted(
+                self.units.items(),
+                key=lambda item: item[1].get(UNIT_PHASE, sum(item[1].values())),
+                reverse=True,
+            )[:slowest]
+        slowest_units = [
+            {"unit": unit, **{f"{name}_ms": _ms(s) for name, s in breakdown.items()}}
+            for unit, breakdown in ranked
+        ]
+        return {"phases": phases, "slowest_units": slowest_units}
+
+    def log_summary(self) -> None:
+        """Log the :meth:`summary` and :meth:`bandwidth` of the run.
+
+        They become ``Timing summary`` and ``Bandwidth summary`` events.
+        """
+
+        if self.phases:
+            logger.info("Timing summary", **self.summary())
+        if self.transfers:
+            logger.info("Bandwidth summary", **self.bandwidth())
+
+
+@contextmanager
+def profiled(path: Path | str | None) -> Iterator[None]:
+    """Profile the ``with`` block with ``cProfile`` and write stats to ``path``.
+
+    Threads started inside the block are profiled as well and merged into
+    the same ``pstats`` file: before Python 3.12 each thread gets its own
+    profiler, later versions use one profiler for all threads. Nothing
+    happens if ``path`` is ``None``.
+    """
+
+    if path is None:
+        yield
+        return
+
+    thread_profiles: list[cProfile.Profile] = []
+
+    def start_thread_profile(*_) -> None:
+        # Runs once as the first profile event of a new thread
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        thread_profiles.append(profile)
+        profile.enable()
+
+    profile = cProfile.Profile()
+    if _PROFILE_PER_THREAD:
+        threading.setprofile(start_thread_profile)
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        if _PROFILE_PER_THREAD:
+            threading.setprofile(None)  # type: ignore[arg-type]
+        stats = pstats.Stats(profile)
+        for thread_profile in thread_profiles:
+            thread_profile.create_stats()
+            stats.add(thread_profile)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(str(path))
+        logger.info("Profile written to %s", path)
@@ -0,0 +1,99 @@
+"""Checkpoint journal that lets an interrupted unit fetch resume."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from .incremental import card_fingerprint
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+
+def journal_path(units_path: Path | str) -> Path:
+    """Return the journal file stored next to ``units_path``."""
+
+    return Path(units_path).with_suffix(".journal")
+
+
+def overview_snapshot(cards: list) -> str:
+    """Return an id of the overview state built from all card fingerprints."""
+
+    digest = hashlib.sha256()
+    for card in cards:
+        digest.update(card_fingerprint(card).encode("ascii"))
+    return digest.hexdigest()
+
+
+class Journal:
+    """Append-only NDJSON record of the detail pages fetched in a run.
+
+    The first line names the overview ``snapshot``, every further line holds
+    the parsed details of one unit and is flushed as soon as it is written.
+    With ``resume`` the entries of an existing journal for the same snapshot
+    are loaded into :attr:`entries` and new lines are appended to it;
+    otherwise the journal starts empty.
+    """
+
+    def __init__(self, path: Path | str, snapshot: str, *, resume: bool = False):
+        self.path = Path(path)
+        self.snapshot = snapshot
+        self.entries: dict[str, dict] = self._read() if resume else {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.entries:
+            self._file = open(self.path, "a", encoding="utf-8")
+            # Terminate a last line cut off by the crash
+            self._file.write("\n")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._file.write(json.dumps({"snapshot": snapshot}) + "\n")
+        self._file.flush()
+
+    def _read(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError as exc:
+            logger.warning("Could not read journal %s: %s", self.path, exc)
+            return {}
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except json.JSONDecodeError:
+            header = {}
+        if header.get("snapshot") != self.snapshot:
+            logger.info("Journal %s is from another overview, starting over", self.path)
+            return {}
+        entries = {}
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["id"]] = entry["details"]
+        logger.info("Resuming with %s units from %s", len(entries), self.path)
+        return entries
+
+    def record(self, unit_id: str, details: dict) -> None:
+        """Append the ``details`` of ``unit_id`` to the journal."""
+
+        line = json.dumps({"id": unit_id, "details": details}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal and keep it for a later resume."""
+
+        self._file.close()
+
+    def discard(self) -> None:
+        """Close and delete the journal after a completed run."""
+
+        self._file.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,29 @@
+"""Module loggers that defer importing ``structlog`` until first use."""
+
+from __future__ import annotations
+
+
+class LazyLogger:
+    """Stand-in for ``structlog.get_logger(name)`` resolved on first use.
+
+    Importing ``structlog`` is a noticeable part of the package import time,
+    so modules create their logger with :func:`get_logger` and only pay for
+    it once something is logged.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._logger = None
+
+    def __getattr__(self, attr: str):
+        if self._logger is None:
+            import structlog
+
+            self._logger = structlog.get_logger(self._name)
+        return getattr(self._logger, attr)
+
+
+def get_logger(name: str) -> LazyLogger:
+    """Return a logger for ``name`` that imports ``structlog`` lazily."""
+
+    return LazyLogger(name)
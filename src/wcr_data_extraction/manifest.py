@@ -0,0 +1,115 @@
+"""Content hashes of the exported files used to skip unchanged writes."""
+
+from __future__ import annotations
+
+import filecmp
+import hashlib
+import json
+from pathlib import Path
+from typing import TextIO
+
+from .log import get_logger
+from .snapshot import invalidate
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+def manifest_path(export_path: Path | str) -> Path:
+    """Return the manifest stored in the directory of ``export_path``."""
+
+    return Path(export_path).parent / MANIFEST_NAME
+
+
+class HashingWriter:
+    """Text file wrapper hashing everything written through it."""
+
+    def __init__(self, file: TextIO) -> None:
+        self._file = file
+        self._hash = hashlib.sha256()
+
+    def write(self, text: str) -> int:
+        self._hash.update(text.encode("utf-8"))
+        return self._file.write(text)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def unordered_digest(digests: list[bytes]) -> str:
+    """Return one hash for ``digests`` that does not depend on their order."""
+
+    return hashlib.sha256(b"".join(sorted(digests))).hexdigest()
+
+
+def load_manifest(path: Path | str) -> dict[str, dict]:
+    """Return the manifest entries keyed by file name or ``{}``."""
+
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.warning("Could not read manifest from %s: %s", path, exc)
+        return {}
+
+
+def save_manifest(path: Path | str, manifest: dict[str, dict]) -> None:
+    """Atomically write ``manifest`` to ``path``."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    tmp_path.replace(path)
+
+
+def is_unchanged(path: Path, digest: str, tmp_path: Path | None = None) -> bool:
+    """Return ``True`` if ``path`` still holds content hashing to ``digest``.
+
+    The size must match the manifest entry too, so files edited by hand
+    after the last export are rewritten. Without an entry, e.g. in a fresh
+    checkout where the manifest is not committed, the content of ``path`` is
+    compared with ``tmp_path`` instead.
+    """
+
+    if not path.exists():
+        return False
+    entry = load_manifest(manifest_path(path)).get(path.name)
+    if entry is None:
+        return tmp_path is not None and filecmp.cmp(tmp_path, path, shallow=False)
+    return entry.get("sha256") == digest and entry.get("size") == path.stat().st_size
+
+
+def _record(path: Path, digest: str) -> None:
+    manifest_file = manifest_path(path)
+    manifest = load_manifest(manifest_file)
+    manifest[path.name] = {"sha256": digest, "size": path.stat().st_size}
+    save_manifest(manifest_file, manifest)
+
+
+def commit_export(
+    tmp_path: Path, path: Path, digest: str, *, only_if_changed: bool = False
+) -> bool:
+    """Move ``tmp_path`` to ``path`` and record ``digest`` in the manifest.
+
+    With ``only_if_changed`` an unchanged ``path`` is kept as is and the
+    temporary file is removed. Returns ``True`` if ``path`` was written.
+    """
+
+    if only_if_changed and is_unchanged(path, digest, tmp_path):
+        tmp_path.unlink(missing_ok=True)
+        logger.info("No changes detected for %s", path)
+        # Keep the hash found by comparing contents for the next run
+        if path.name not in load_manifest(manifest_path(path)):
+            _record(path, digest)
+        return False
+    tmp_path.replace(path)
+    invalidate(path)
+    _record(path, digest)
+    return True
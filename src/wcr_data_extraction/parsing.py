@@ -0,0 +1,155 @@
+"""Pluggable HTML parser backends used to extract data from method.gg pages.
+
+Every backend returns document nodes exposing the small subset of the
+BeautifulSoup API used by the extractors: ``select``, ``select_one``,
+``get``, ``[]`` and ``get_text``.
+
+``parse`` accepts an ``only`` class name. BeautifulSoup backends then build
+nodes only for elements carrying that class and their descendants, skipping
+navigation, ads and footers entirely.
+"""
+
+from __future__ import annotations
+
+DEFAULT_PARSER = "html.parser"
+PARSERS = ("html.parser", "lxml", "selectolax")
+
+
+class SoupBackend:
+    """Parse pages with BeautifulSoup using the given tree builder."""
+
+    def __init__(self, features: str) -> None:
+        self.name = features
+        self.features = features
+
+    def parse(self, html: str, only: str | None = None):
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        strainer = SoupStrainer(attrs={"class": _has_class(only)}) if only else None
+        return BeautifulSoup(html, self.features, parse_only=strainer)
+
+    def find_section(self, doc, title: str):
+        for h2 in doc.find_all("h2", string=lambda t: t and t.strip() == title):
+            section = h2.find_parent(class_="mini-section")
+            if section is not None:
+                return section
+        return None
+
+
+def _has_class(name: str):
+    """Return a strainer predicate matching elements with class ``name``."""
+
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return name in classes
+
+    return match
+
+
+class _LexborNode:
+    """Wrap a ``selectolax`` node with the BeautifulSoup methods we use."""
+
+    __slots__ = ("node",)
+
+    def __init__(self, node) -> None:
+        self.node = node
+
+    def select(self, selector: str) -> list[_LexborNode]:
+        # selectolax also matches the node itself, BeautifulSoup does not
+        own_id = self.node.mem_id
+        return [
+            _LexborNode(match)
+            for match in self.node.css(selector)
+            if match.mem_id != own_id
+        ]
+
+    def select_one(self, selector: str) -> _LexborNode | None:
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    def get(self, key: str, default=None):
+        attrs = self.node.attributes
+        if key not in attrs:
+            return default
+        value = attrs[key]
+        return "" if value is None else value
+
+    def __getitem__(self, key: str) -> str:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        texts = []
+        for node in self.node.traverse(include_text=True):
+            if not node.is_text_node or node.parent.tag in ("script", "style"):
+                continue
+            text = node.text_content or ""
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            texts.append(text)
+        return separator.join(texts)
+
+    @property
+    def string(self) -> str | None:
+        """Return the only text below this node like ``Tag.string``."""
+
+        node = self.node
+        while True:
+            children = list(node.iter(include_text=True))
+            if len(children) != 1:
+                return None
+            node = children[0]
+            if node.is_text_node:
+                return node.text_content
+
+
+class SelectolaxBackend:
+    """Parse pages with the lexbor engine of ``selectolax``."""
+
+    name = "selectolax"
+
+    def __init__(self) -> None:
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError(
+                "selectolax is required for the 'selectolax' parser"
+            ) from exc
+        self._parser_cls = LexborHTMLParser
+
+    def parse(self, html: str, only: str | None = None) -> _LexborNode:
+        # lexbor builds the full tree in C, which is cheaper than filtering
+        return _LexborNode(self._parser_cls(html).root)
+
+    def find_section(self, doc: _LexborNode, title: str):
+        for h2 in doc.select("h2"):
+            text = h2.string
+            if text and text.strip() == title:
+                parent = h2.node.parent
+                while parent is not None and parent.is_element_node:
+                    classes = (parent.attributes.get("class") or "").split()
+                    if "mini-section" in classes:
+                        return _LexborNode(parent)
+                    parent = parent.parent
+        return None
+
+
+_backends: dict = {}
+
+
+def get_parser(name: str = DEFAULT_PARSER):
+    """Return the backend registered under ``name``."""
+
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser {name!r}, expected one of {PARSERS}")
+    backend = _backends.get(name)
+    if backend is None:
+        backend = SelectolaxBackend() if name == "selectolax" else SoupBackend(name)
+        _backends[name] = backend
+    return backend
@@ -0,0 +1,117 @@
+"""Process-wide cache of parsed export files.
+
+Loaders pass a file and a function building their result from its text to
+:func:`load_snapshot`. The result is kept as a frozen snapshot until the
+file's modification time, size or inode change, so every file is parsed
+once per content no matter how many loaders read it.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+
+class FrozenDict(dict):
+    """``dict`` that refuses changes; copies are plain ``dict`` objects."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Snapshot data is read-only, copy it first")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> dict:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """``list`` that refuses changes; copies are plain ``list`` objects."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Snapshot data is read-only, copy it first")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def copy(self) -> list:
+        return list(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> list:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Return ``value`` with all nested dicts and lists made read-only.
+
+    Frozen containers are still ``dict`` and ``list`` instances, so they can
+    be serialised and compared like the originals.
+    """
+
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+_lock = threading.Lock()
+_snapshots: dict[tuple, tuple[tuple, Any]] = {}
+
+
+def _stat_key(path: Path) -> tuple:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def load_snapshot(path: Path | str, build: Callable[[str], Any]) -> Any:
+    """Return the frozen result of ``build`` applied to the text of ``path``.
+
+    The result is cached per resolved path and ``build`` function. Errors
+    reading the file or raised by ``build`` propagate and are not cached.
+    """
+
+    path = Path(path).resolve()
+    key = (path, build)
+    stat_key = _stat_key(path)
+    with _lock:
+        cached = _snapshots.get(key)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    with open(path, encoding="utf-8") as f:
+        value = freeze(build(f.read()))
+    with _lock:
+        _snapshots[key] = (stat_key, value)
+    return value
+
+
+def invalidate(path: Path | str) -> None:
+    """Drop all snapshots of ``path``, e.g. after replacing the file."""
+
+    path = Path(path).resolve()
+    with _lock:
+        for key in [key for key in _snapshots if key[0] == path]:
+            del _snapshots[key]
+
+
+def clear() -> None:
+    """Drop all cached snapshots."""
+
+    with _lock:
+        _snapshots.clear()
@@ -0,0 +1,80 @@
+"""Numeric stats normalised from the display strings of the details pages."""
+
+from __future__ import annotations
+
+import re
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# Abbreviations used in stat labels, spelled out in the canonical keys
+_WORDS = {"dmg": "damage", "lvl": "level"}
+# Units written after the number, e.g. ``0.5 sec`` or ``5%``
+_SUFFIX_UNITS = {"sec": "s", "s": "s", "%": "%"}
+# Units implied by the key when the value carries none
+_KEY_UNITS = {"attack_speed": "s", "duration": "s"}
+
+_NUMBER = re.compile(r"(?P<number>\d[\d,]*(?:\.\d+)?|\.\d+)\s*(?P<suffix>sec|s|%)?")
+
+
+def stat_key(label: str) -> str:
+    """Return the canonical snake_case key for a stat ``label``.
+
+    ``"Attack Speed"`` becomes ``attack_speed`` and ``"Rend Dmg"``
+    ``rend_damage``.
+    """
+
+    words = re.findall(r"[a-z0-9]+", label.lower().replace(".", "_"))
+    return "_".join(_WORDS.get(word, word) for word in words)
+
+
+def parse_stat(value: str) -> tuple[int | float, str | None] | None:
+    """Return the number and unit written in ``value`` or ``None``.
+
+    Thousands separators are dropped; whole numbers become ``int``.
+    """
+
+    match = _NUMBER.fullmatch(value.strip())
+    if match is None:
+        return None
+    text = match["number"].replace(",", "")
+    number = float(text) if "." in text else int(text)
+    return number, _SUFFIX_UNITS.get(match["suffix"] or "")
+
+
+def normalize_stats(stats: dict[str, str]) -> dict[str, dict]:
+    """Return the numeric entries of ``stats`` keyed by :func:`stat_key`.
+
+    Each entry holds the ``value``, the original ``label`` and, where one
+    applies, the ``unit`` (``s`` or ``%``). Values that are not numbers, such
+    as ``Speed`` or a ``Melee`` range, are only kept in ``stats``. If two
+    labels map to the same key, such as ``Dmg`` and ``Damage``, the first
+    one is kept and the collision is logged.
+    """
+
+    normalized: dict[str, dict] = {}
+    for label, value in stats.items():
+        parsed = parse_stat(value)
+        if parsed is None:
+            continue
+        number, unit = parsed
+        key = stat_key(label)
+        if key in normalized:
+            logger.warning(
+                "Stat labels %r and %r share the key %s, keeping the first",
+                normalized[key]["label"],
+                label,
+                key,
+            )
+            continue
+        if unit is None:
+            unit = next(
+                (u for suffix, u in _KEY_UNITS.items() if key.endswith(suffix)),
+                "%" if key.startswith("percent_") else None,
+            )
+        entry: dict = {"value": number, "label": label}
+        if unit is not None:
+            entry["unit"] = unit
+        normalized[key] = entry
+    return normalized
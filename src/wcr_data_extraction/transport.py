@@ -0,0 +1,287 @@
+"""HTTP/2 transport adapter and connection pool statistics."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError, RetryError, Timeout
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import (
+    DEFAULT_CA_BUNDLE_PATH,
+    get_encoding_from_headers,
+    select_proxy,
+)
+
+from .cache import CachingAdapter
+
+# Retry policy of the HTTP/1.1 adapter, applied to HTTP/2 answers as well
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class PoolCounter:
+    """Count requests and new connections reported by ``httpcore``.
+
+    Pass :meth:`trace` (or :meth:`atrace` for async clients) as the
+    ``trace`` request extension and call :meth:`count_request` per request.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.opened = 0
+        self._lock = threading.Lock()
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def trace(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.opened += 1
+
+    async def atrace(self, event: str, info: dict) -> None:
+        self.trace(event, info)
+
+    def stats(self, *transports) -> dict[str, int]:
+        """Return the counters for requests sent through ``transports``.
+
+        ``transports`` are the ``httpx`` transports the requests went
+        through; connections opened but no longer in their pools were
+        discarded. The pools are read from the private ``_pool`` attribute,
+        the ``httpcore`` connection pool of ``httpx`` 0.18 to 0.28; without
+        it no connection counts as discarded.
+        """
+
+        alive = 0
+        for transport in transports:
+            try:
+                connections = transport._pool.connections
+            except AttributeError:  # pragma: no cover - other httpx versions
+                return {
+                    "opened": self.opened,
+                    "reused": max(0, self.requests - self.opened),
+                    "discarded": 0,
+                }
+            alive += sum(1 for conn in connections if not conn.is_closed())
+        return {
+            "opened": self.opened,
+            "reused": max(0, self.requests - self.opened),
+            "discarded": max(0, self.opened - alive),
+        }
+
+
+class HTTP2Adapter(BaseAdapter):
+    """Transport adapter multiplexing requests over HTTP/2 with ``httpx``.
+
+    All requests share one ``httpx.Client`` holding at most
+    ``max_connections`` connections. Concurrent requests to a host become
+    streams on the same connection, so a single one is usually opened.
+    Connection errors are retried by the transport, and read errors, such
+    as a reset connection, and ``5xx`` answers like by the HTTP/1.1 adapter,
+    raising ``RetryError`` once the ``5xx`` retries are exhausted; without
+    ``status_retries`` these answers are returned at once. ``verify``,
+    ``cert`` and the proxy selected from ``proxies`` are honoured with one
+    client per combination. Bodies are always read completely, even with
+    ``stream=True``.
+    """
+
+    def __init__(
+        self, *, max_connections: int = 10, status_retries: bool = True
+    ) -> None:
+        super().__init__()
+        self.status_retries = status_retries
+        try:
+            import h2  # noqa: F401
+            import httpx
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError("httpx and h2 are required for HTTP/2") from exc
+
+        self._httpx = httpx
+        self.counter = PoolCounter()
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        # Read errors and dropped streams, retried like a 5xx answer
+        self._retry_errors = (
+            httpx.ReadError,
+            httpx.WriteError,
+            httpx.RemoteProtocolError,
+        )
+        self._clients: dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._client(True, None, None)
+
+    def _client(self, verify, cert, proxy):
+        """Return the ``httpx`` client for these connection settings."""
+
+        key = (verify, cert, proxy)
+        with self._lock:
+            if key not in self._clients:
+                transport = self._httpx.HTTPTransport(
+                    http2=True,
+                    retries=RETRIES,
+                    limits=self._limits,
+                    verify=_ssl_context(verify, cert),
+                    proxy=proxy,
+                )
+                client = self._httpx.Client(transport=transport)
+                self._clients[key] = (client, transport)
+            return self._clients[key][0]
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ) -> Response:
+        httpx = self._httpx
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        client = self._client(verify, cert, select_proxy(request.url, proxies))
+        for attempt in range(RETRIES + 1):
+            if attempt:
+                time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            self.counter.count_request()
+            try:
+                answer = client.request(
+                    request.method,
+                    request.url,
+                    headers=dict(request.headers),
+                    content=request.body,
+                    timeout=timeout,
+                    extensions={"trace": self.counter.trace},
+                )
+            except httpx.TimeoutException as exc:
+                raise Timeout(exc, request=request) from exc
+            except self._retry_errors as exc:
+                if attempt == RETRIES:
+                    raise ConnectionError(exc, request=request) from exc
+                continue
+            except httpx.TransportError as exc:
+                raise ConnectionError(exc, request=request) from exc
+            if not self.status_retries or answer.status_code not in RETRY_STATUSES:
+                return self._build_response(request, answer)
+        raise RetryError(
+            f"Max retries exceeded with url: {request.url} "
+            f"(too many {answer.status_code} error responses)",
+            request=request,
+        )
+
+    def _build_response(self, request: PreparedRequest, answer) -> Response:
+        response = Response()
+        response.status_code = answer.status_code
+        response.reason = answer.reason_phrase
+        response.headers = CaseInsensitiveDict(answer.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = answer.content
+        # Read back by the transfer accounting for the bytes received
+        response.raw = answer
+        response.url = str(answer.url)
+        response.request = request
+        response.connection = self
+        return response
+
+    def stats(self) -> dict[str, int]:
+        """Return opened, reused and discarded connection counts."""
+
+        with self._lock:
+            transports = [transport for _, transport in self._clients.values()]
+        return self.counter.stats(*transports)
+
+    def close(self) -> None:
+        with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+        for client in clients:
+            client.close()
+
+
+def _ssl_context(verify, cert):
+    """Return the ``httpx`` ``verify`` value for requests' ``verify``/``cert``.
+
+    ``verify`` is a flag or the path of a CA bundle or directory and
+    ``cert`` a client certificate file or a ``(cert, key)`` pair.
+    """
+
+    if cert is None and isinstance(verify, bool):
+        return verify
+    import ssl
+
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        if verify is True:
+            verify = DEFAULT_CA_BUNDLE_PATH
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    if cert is not None:
+        if isinstance(cert, str):
+            cert = (cert,)
+        context.load_cert_chain(*cert)
+    return context
+
+
+def _urllib3_stats(adapter: HTTPAdapter) -> dict[str, int]:
+    opened = requests = idle = 0
+    pools = adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        try:
+            pool = pools[key]
+        except KeyError:  # pragma: no cover - evicted concurrently
+            continue
+        opened += pool.num_connections
+        requests += pool.num_requests
+        if pool.pool is not None:
+            idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return {
+        "opened": opened,
+        "reused": max(0, requests - opened),
+        "discarded": max(0, opened - idle),
+    }
+
+
+def pool_stats(session) -> dict[str, int] | None:
+    """Return the connection counters of ``session``.
+
+    Counts are summed over the mounted ``HTTPAdapter`` and
+    :class:`HTTP2Adapter` instances, looking through a
+    :class:`.cache.CachingAdapter`. Returns ``None`` if there are none.
+    """
+
+    adapters = getattr(session, "adapters", None)
+    if not isinstance(adapters, dict):
+        return None
+    totals: dict[str, int] | None = None
+    seen: set[int] = set()
+    for mounted in adapters.values():
+        if isinstance(mounted, CachingAdapter):
+            mounted = mounted.adapter
+        if id(mounted) in seen:
+            continue
+        seen.add(id(mounted))
+        if isinstance(mounted, HTTP2Adapter):
+            stats = mounted.stats()
+        elif isinstance(mounted, HTTPAdapter):
+            stats = _urllib3_stats(mounted)
+        else:
+            continue
+        totals = {
+            name: (totals or {}).get(name, 0) + count for name, count in stats.items()
+        }
+    return totals
@@ -0,0 +1,171 @@
+"""Daemon mode that scrapes only when the overview page changes."""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from . import fetcher
+from .journal import overview_snapshot
+from .log import get_logger
+from .parsing import DEFAULT_PARSER
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    import requests
+
+logger = get_logger(__name__)
+
+# Each wait deviates by up to this fraction of the interval
+WATCH_JITTER = 0.1
+
+
+class Watcher:
+    """Probe the overview every ``interval`` seconds and ``scrape`` on change.
+
+    A probe sends ``If-None-Match``/``If-Modified-Since`` from the last
+    accepted answer; a ``304`` ends it without parsing, as does an answer
+    the HTTP cache served or revalidated with these validators. Otherwise
+    the cards are fingerprinted with :func:`.journal.overview_snapshot` and
+    ``scrape(overview)`` runs only if the fingerprint differs from the last
+    successful scrape. Validators and fingerprint are kept only after
+    ``scrape`` returns, so a failed scrape is retried on the next tick. Any
+    exception of a tick is logged and the next tick runs as planned.
+
+    :attr:`status` holds the timestamps of the last probe, success and
+    change; with ``status_path`` it is also written there as JSON after
+    every tick for health checks.
+    """
+
+    def __init__(
+        self,
+        scrape: Callable[[fetcher.Overview], None],
+        *,
+        session: requests.Session,
+        interval: float,
+        timeout: int = 10,
+        parser: str = DEFAULT_PARSER,
+        status_path: Path | str | None = None,
+        jitter: float = WATCH_JITTER,
+    ) -> None:
+        self.scrape = scrape
+        self.session = session
+        self.interval = interval
+        self.timeout = timeout
+        self.parser = parser
+        self.status_path = Path(status_path) if status_path else None
+        self.jitter = jitter
+        self.validators: dict[str, str] = {}
+        self.snapshot: str | None = None
+        self.status: dict = {
+            "started_at": time.time(),
+            "last_probe": None,
+            "last_success": None,
+            "last_change": None,
+            "scrapes": 0,
+            "last_error": None,
+        }
+        self._stop = threading.Event()
+
+    def probe(self) -> tuple[fetcher.Overview | None, dict[str, str]]:
+        """Return the overview if it may have changed and its validators.
+
+        The overview is ``None`` after a ``304 Not Modified``. A cached
+        session turns the ``304`` into the stored page, so a page from the
+        cache with the validators sent counts as not modified as well.
+        """
+
+        headers = {"User-Agent": "Mozilla/5.0"}
+        if "ETag" in self.validators:
+            headers["If-None-Match"] = self.validators["ETag"]
+        if "Last-Modified" in self.validators:
+            headers["If-Modified-Since"] = self.validators["Last-Modified"]
+        import requests
+
+        from .cache import is_cached
+
+        url = fetcher.BASE_URL
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as exc:
+            raise fetcher.FetchError(f"Error fetching {url}: {exc}") from exc
+        if response.status_code == 304:
+            return None, self.validators
+        if response.status_code != 200:
+            raise fetcher.FetchError(
+                f"Error fetching {url}: Status {response.status_code}",
+                response.status_code,
+            )
+        validators = {
+            name: response.headers[name]
+            for name in ("ETag", "Last-Modified")
+            if name in response.headers
+        }
+        if self.validators and validators == self.validators and is_cached(response):
+            return None, self.validators
+        return fetcher._parse_overview(response.text, self.parser), validators
+
+    def tick(self) -> bool:
+        """Probe once and scrape if needed. Returns ``True`` after a scrape."""
+
+        self.status["last_probe"] = time.time()
+        scraped = False
+        try:
+            overview, validators = self.probe()
+            snapshot = overview_snapshot(overview.cards) if overview else None
+            if snapshot is not None and snapshot != self.snapshot:
+                logger.info("Overview changed, scraping")
+                self.scrape(overview)
+                self.snapshot = snapshot
+                self.status["last_change"] = time.time()
+                self.status["scrapes"] += 1
+                scraped = True
+            else:
+                logger.info("Overview unchanged")
+            self.validators = validators
+            self.status["last_success"] = time.time()
+            self.status["last_error"] = None
+        except fetcher.FetchError as exc:
+            logger.error("Watch tick failed: %s", exc)
+            self.status["last_error"] = str(exc)
+        except Exception as exc:
+            # E.g. a failed write; the daemon keeps running and retries
+            logger.exception("Watch tick failed: %s", exc)
+            self.status["last_error"] = f"{type(exc).__name__}: {exc}"
+        try:
+            self._write_status()
+        except OSError as exc:
+            logger.error("Could not write status to %s: %s", self.status_path, exc)
+        return scraped
+
+    def _write_status(self) -> None:
+        if self.status_path is None:
+            return
+        self.status_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.status_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.status, f, indent=2)
+            f.write("\n")
+        tmp_path.replace(self.status_path)
+
+    def delay(self) -> float:
+        """Return the seconds until the next tick, with jitter applied."""
+
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def stop(self, *_args) -> None:
+        """Stop :meth:`run` after the current tick; usable as signal handler."""
+
+        self._stop.set()
+
+    def run(self) -> None:
+        """Tick until :meth:`stop` is called."""
+
+        logger.info("Watching %s every %ss", fetcher.BASE_URL, self.interval)
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self.delay())
+        logger.info("Watch stopped")
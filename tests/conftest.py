@@ -1,4 +1,161 @@
 import sys
+import time
 from pathlib import Path
 
+import httpx
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from wcr_data_extraction import fetcher  # noqa: E402
+from wcr_data_extraction.cache import CachingAdapter, HTTPCache  # noqa: E402
+
+CARD = (
+    "<div class='mini-wrapper' data-name='{name}' data-family='Alliance' "
+    "data-type='Troop' data-cost='{cost}' data-damage='10' data-health='20' "
+    "data-dps='5' data-speed='Slow' data-traits='Melee'>"
+    "<a class='mini-link' href='/warcraft-rumble/minis/{id}'>"
+    "<img src='{id}.png' /></a></div>"
+)
+
+DETAIL = """
+    <div class="mini-section">
+        <h2>Traits</h2>
+        <div class="mini-trait-tile">
+            <div class="detail-info">Melee</div>
+            <div class="mini-talent__description">Fights up close</div>
+        </div>
+    </div>
+    <div class="mini-section">
+        <h2>Stats</h2>
+        <div class="mini-details-tile">
+            <div class="detail-label">Health</div>
+            <div class="detail-info">1,200</div>
+        </div>
+    </div>
+"""
+
+
+class FakeSite:
+    """Serve an overview of ``minis`` and the same detail page for each.
+
+    ``minis`` maps unit ids to their cost. Every request, sync or async, is
+    recorded in ``requests``. ``headers`` are added to each answer and an
+    ``ETag`` among them is honoured with ``304 Not Modified``. The detail
+    page of the unit ``failing`` is answered with ``500``.
+    """
+
+    def __init__(self) -> None:
+        self.minis = {"footman": 2, "ghoul": 1}
+        self.headers: dict[str, str] = {}
+        self.failing: str | None = None
+        self.requests: list = []
+
+    def overview(self) -> str:
+        return "".join(
+            CARD.format(name=uid.title(), id=uid, cost=cost)
+            for uid, cost in self.minis.items()
+        )
+
+    def parse_overview(self) -> fetcher.Overview:
+        return fetcher._parse_overview(self.overview())
+
+    def page(self, url: str) -> str:
+        return self.overview() if url == fetcher.BASE_URL else DETAIL
+
+    def answer(self, url: str, etag: str | None) -> tuple[int, dict, bytes]:
+        headers = {"Content-Type": "text/html; charset=utf-8", **self.headers}
+        if self.failing and url.endswith(f"/{self.failing}"):
+            # Let the other units finish first
+            time.sleep(0.1)
+            return 500, headers, b""
+        if etag is not None and etag == self.headers.get("ETag"):
+            return 304, headers, b""
+        return 200, headers, self.page(url).encode()
+
+    def urls(self) -> list[str]:
+        return [str(request.url) for request in self.requests]
+
+    def detail_urls(self) -> list[str]:
+        return sorted(url for url in self.urls() if url != fetcher.BASE_URL)
+
+    def session(self, cache_dir: Path | None = None) -> requests.Session:
+        adapter = SiteAdapter(self)
+        session = requests.Session()
+        session.mount(
+            "https://",
+            CachingAdapter(HTTPCache(cache_dir), adapter) if cache_dir else adapter,
+        )
+        return session
+
+    def transport(self) -> httpx.MockTransport:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            status, headers, body = self.answer(
+                str(request.url), request.headers.get("If-None-Match")
+            )
+            return httpx.Response(status, headers=headers, content=body)
+
+        return httpx.MockTransport(handler)
+
+
+class SiteAdapter(BaseAdapter):
+    """Answer ``requests`` from a :class:`FakeSite`."""
+
+    def __init__(self, site: FakeSite) -> None:
+        super().__init__()
+        self.site = site
+
+    def send(self, request, **kwargs) -> Response:
+        self.site.requests.append(request)
+        status, headers, body = self.site.answer(
+            request.url, request.headers.get("If-None-Match")
+        )
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = "utf-8"
+        response._content = body
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def site() -> FakeSite:
+    return FakeSite()
+
+
+@pytest.fixture
+def run_units(tmp_path, site):
+    """Return a function running ``fetch_units`` against ``site``."""
+
+    def run(**kwargs):
+        kwargs.setdefault("out_path", tmp_path / "units.json")
+        kwargs.setdefault("categories_path", tmp_path / "cats.json")
+        kwargs.setdefault("session", site.session())
+        site.requests.clear()
+        return fetcher.fetch_units(**kwargs)
+
+    return run
+
+
+@pytest.fixture
+def run_units_async(tmp_path, site):
+    """Return a coroutine function running ``fetch_units_async`` on ``site``."""
+
+    async def run(**kwargs):
+        kwargs.setdefault("out_path", tmp_path / "units.json")
+        kwargs.setdefault("categories_path", tmp_path / "cats.json")
+        site.requests.clear()
+        async with httpx.AsyncClient(transport=site.transport()) as client:
+            return await fetcher.fetch_units_async(client=client, **kwargs)
+
+    return run
@@ -0,0 +1,112 @@
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from wcr_data_extraction import fetcher, transport
+from wcr_data_extraction.instrumentation import Timings
+
+
+def fail_once(site, error) -> None:
+    """Make the first request for every detail page ``error`` out."""
+
+    answer = site.answer
+    failed = set()
+
+    def flaky_answer(url, etag):
+        if url != fetcher.BASE_URL and url not in failed:
+            failed.add(url)
+            if isinstance(error, int):
+                return error, {}, b""
+            raise error
+        return answer(url, etag)
+
+    site.answer = flaky_answer
+
+
+async def test_fetch_units_async_matches_threaded_output(
+    tmp_path, run_units, run_units_async
+):
+    threaded = tmp_path / "threaded.json"
+    descs = run_units(out_path=threaded, max_workers=2)
+    asynced = tmp_path / "async.json"
+    async_descs = await run_units_async(out_path=asynced, max_concurrency=50)
+
+    assert asynced.read_bytes() == threaded.read_bytes()
+    assert async_descs == descs == {"melee": "Fights up close"}
+    units = json.loads(asynced.read_text(encoding="utf-8"))
+    assert [u["id"] for u in units] == ["footman", "ghoul"]
+
+
+async def test_fetch_units_async_http_error(tmp_path):
+    hits = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits.append(request)
+        return httpx.Response(503)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with patch.object(fetcher, "OUT_PATH", tmp_path / "units.json"), patch.object(
+            transport, "RETRY_BACKOFF", 0
+        ):
+            with pytest.raises(fetcher.FetchError) as excinfo:
+                await fetcher.fetch_units_async(client=client)
+    assert "Status 503" in str(excinfo.value)
+    assert excinfo.value.status == 503
+    assert len(hits) == transport.RETRIES + 1
+
+
+async def test_fetch_units_async_retries_transient_errors(site, run_units_async):
+    fail_once(site, 503)
+    with patch.object(transport, "RETRY_BACKOFF", 0):
+        await run_units_async()
+    assert len(site.requests) == 5
+
+
+async def test_fetch_units_async_request_error(tmp_path):
+    hits = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits.append(str(request.url))
+        raise httpx.ConnectError("boom", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with patch.object(fetcher, "OUT_PATH", tmp_path / "units.json"):
+            with patch.object(transport, "RETRY_BACKOFF", 0):
+                with pytest.raises(fetcher.FetchError) as excinfo:
+                    await fetcher.fetch_units_async(client=client)
+    assert "Error fetching" in str(excinfo.value)
+    assert "ConnectError" in str(excinfo.value)
+    assert len(hits) == transport.RETRIES + 1
+
+
+async def test_fetch_units_async_retries_read_errors(site, run_units_async):
+    fail_once(site, httpx.ReadError(""))
+    with patch.object(transport, "RETRY_BACKOFF", 0):
+        await run_units_async(adaptive=True)
+    assert len(site.requests) == 5
+
+
+async def test_fetch_units_async_revalidates_cache(tmp_path, site, run_units_async):
+    site.headers = {"ETag": '"v1"'}
+    for _ in range(2):
+        await run_units_async(cache_dir=tmp_path / "http")
+
+    assert [r.headers.get("If-None-Match") for r in site.requests] == ['"v1"'] * 3
+    assert [u["id"] for u in json.loads((tmp_path / "units.json").read_text())] == [
+        "footman",
+        "ghoul",
+    ]
+
+
+async def test_fetch_units_async_serves_fresh_cache_entries(
+    tmp_path, site, run_units_async
+):
+    site.headers = {"Cache-Control": "max-age=600"}
+    await run_units_async(cache_dir=tmp_path / "http")
+    timings = Timings()
+    await run_units_async(cache_dir=tmp_path / "http", timings=timings)
+
+    assert site.requests == []
+    assert timings.bandwidth()["encodings"] == {"cached": 3}
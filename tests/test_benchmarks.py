@@ -0,0 +1,87 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from wcr_data_extraction import fetcher
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import __main__ as runner  # noqa: E402
+from benchmarks import history, record, stub, suite  # noqa: E402
+
+
+def test_stub_session_serves_fixtures():
+    overview, pages = stub.load_fixtures()
+    session = stub.stub_session(overview, pages)
+    assert session.get(fetcher.BASE_URL).text == overview
+    unit_id = next(iter(pages))
+    response = session.get(f"{fetcher.BASE_URL}/{unit_id}")
+    assert response.status_code == 200
+    assert response.text == pages[unit_id]
+    assert session.get(f"{fetcher.BASE_URL}/missing").status_code == 404
+
+
+def test_fetch_units_against_stub(tmp_path):
+    overview, pages = stub.load_fixtures()
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=stub.FIXTURE_DIR / "categories.json",
+        session=stub.stub_session(overview, pages),
+    )
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    recorded = json.loads((stub.FIXTURE_DIR / "units.json").read_text(encoding="utf-8"))
+    assert units == recorded
+
+
+def test_checked_in_fixtures_are_up_to_date(tmp_path):
+    # Re-render from the recorded data so updates of data/export do not matter
+    ids = record.record(
+        tmp_path,
+        units_path=stub.FIXTURE_DIR / "units.json",
+        categories_path=stub.FIXTURE_DIR / "categories.json",
+    )
+    assert len(ids) == record.SAMPLE_SIZE
+    for path in tmp_path.rglob("*"):
+        if path.is_file():
+            expected = stub.FIXTURE_DIR / path.relative_to(tmp_path)
+            assert path.read_bytes() == expected.read_bytes(), path.name
+
+
+def test_run_suite_reports_every_benchmark():
+    results = suite.run_suite(repeat=1)
+    assert list(results) == list(suite.BENCHMARKS)
+    assert all(seconds > 0 for seconds in results.values())
+
+
+def test_history_round_trip_and_baseline(tmp_path):
+    path = tmp_path / "history.jsonl"
+    for seconds in (1.0, 3.0, 2.0):
+        history.append_history(
+            history.make_entry({"parse_detail": seconds}, parser="lxml"), path
+        )
+    history.append_history(
+        history.make_entry({"parse_detail": 9.0}, parser="html.parser"), path
+    )
+    entries = history.load_history(path)
+    assert len(entries) == 4
+    assert history.find_baseline(entries, parser="lxml") == {"parse_detail": 2.0}
+    assert history.find_baseline(entries, parser="selectolax") is None
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = {"a": 1.0, "b": 1.0, "c": 0.0}
+    current = {"a": 1.1, "b": 1.5, "c": 1.0, "d": 1.0}
+    assert history.compare(baseline, current, 0.2) == {"b": 0.5}
+
+
+def test_main_compare_exit_code(tmp_path, capsys):
+    path = tmp_path / "history.jsonl"
+    args = ["--history", str(path), "--compare"]
+    with patch.object(runner, "run_suite", return_value={"merge": 1.0}):
+        assert runner.main(args) == 0
+    with patch.object(runner, "run_suite", return_value={"merge": 1.1}):
+        assert runner.main(args) == 0
+    with patch.object(runner, "run_suite", return_value={"merge": 2.0}):
+        assert runner.main(args + ["--no-save"]) == 1
+    assert "REGRESSION merge" in capsys.readouterr().out
+    assert len(history.load_history(path)) == 2
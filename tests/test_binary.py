@@ -0,0 +1,75 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from wcr_data_extraction import cli
+from wcr_data_extraction.binary import (
+    build_indexes,
+    export_binary,
+    load_binary,
+    write_binary,
+)
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import stub  # noqa: E402
+
+UNITS = [
+    {"id": "footman", "faction_ids": ["alliance"], "type_id": "troop", "cost": 2},
+    {
+        "id": "ghoul",
+        "faction_ids": ["undead"],
+        "trait_ids": ["melee"],
+        "type_id": "troop",
+        "cost": 2,
+    },
+    {"id": "tower", "faction_ids": [], "type_id": None, "cost": None},
+]
+
+
+def test_build_indexes_maps_values_to_unit_ids():
+    indexes = build_indexes(UNITS)
+    assert indexes["id"] == {"footman": 0, "ghoul": 1, "tower": 2}
+    assert indexes["faction"] == {"alliance": ["footman"], "undead": ["ghoul"]}
+    assert indexes["trait"] == {"melee": ["ghoul"]}
+    assert indexes["type"] == {"troop": ["footman", "ghoul"]}
+    assert indexes["cost"] == {2: ["footman", "ghoul"]}
+
+
+def test_export_round_trip_is_smaller_than_json(tmp_path):
+    units_path = stub.FIXTURE_DIR / "units.json"
+    cats_path = stub.FIXTURE_DIR / "categories.json"
+    out_path = tmp_path / "wcr.msgpack"
+    assert export_binary(out_path, units_path, cats_path)
+    payload = load_binary(out_path)
+    units = json.loads(units_path.read_text(encoding="utf-8"))
+    assert payload["units"] == units
+    assert payload["categories"] == json.loads(cats_path.read_text(encoding="utf-8"))
+    assert payload["indexes"] == build_indexes(units)
+    assert out_path.stat().st_size < units_path.stat().st_size
+    # An unchanged export keeps the existing file
+    assert not export_binary(out_path, units_path, cats_path)
+
+
+def test_load_binary_rejects_other_versions(tmp_path):
+    path = tmp_path / "wcr.msgpack"
+    write_binary(path, UNITS, {})
+    with patch("wcr_data_extraction.binary.BINARY_VERSION", 2):
+        with pytest.raises(ValueError):
+            load_binary(path)
+
+
+def test_cli_writes_binary_export(tmp_path):
+    out_path = tmp_path / "wcr.msgpack"
+    args = ["--log-file", str(tmp_path / "log.json"), "--binary-export", str(out_path)]
+    with patch.object(cli, "create_session"), patch.object(
+        cli, "fetch_overview"
+    ), patch.object(cli, "fetch_units"), patch.object(
+        cli, "fetch_categories"
+    ), patch.object(
+        cli, "export_binary"
+    ) as mock_export:
+        cli.main(args + ["--output", "u.json", "--categories", "c.json"])
+    mock_export.assert_called_once_with(str(out_path), "u.json", "c.json")
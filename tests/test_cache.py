@@ -0,0 +1,57 @@
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.cache import CachingAdapter, cache_stats
+
+
+def test_cache_revalidates_with_etag(tmp_path, site):
+    site.headers = {"ETag": '"v1"'}
+    session = site.session(tmp_path)
+
+    first = session.get(fetcher.BASE_URL)
+    second = session.get(fetcher.BASE_URL)
+
+    assert first.text == second.text == site.overview()
+    assert second.status_code == 200
+    assert "If-None-Match" not in site.requests[0].headers
+    assert site.requests[1].headers["If-None-Match"] == '"v1"'
+    assert cache_stats(session) == {"hits": 0, "revalidated": 1, "misses": 1}
+
+
+def test_cache_persists_between_sessions(tmp_path, site):
+    site.headers = {"ETag": '"v1"'}
+    site.session(tmp_path).get(fetcher.BASE_URL)
+
+    session = site.session(tmp_path)
+    response = session.get(fetcher.BASE_URL)
+
+    assert response.text == site.overview()
+    assert site.requests[1].headers["If-None-Match"] == '"v1"'
+    assert cache_stats(session)["revalidated"] == 1
+
+
+def test_cache_serves_fresh_entries_without_request(tmp_path, site):
+    site.headers = {"Cache-Control": "max-age=600"}
+    session = site.session(tmp_path)
+
+    session.get(fetcher.BASE_URL)
+    response = session.get(fetcher.BASE_URL)
+
+    assert response.text == site.overview()
+    assert len(site.requests) == 1
+    assert cache_stats(session) == {"hits": 1, "revalidated": 0, "misses": 1}
+
+
+def test_cache_skips_responses_without_validators(tmp_path, site):
+    session = site.session(tmp_path)
+
+    session.get(fetcher.BASE_URL)
+    session.get(fetcher.BASE_URL)
+
+    assert "If-None-Match" not in site.requests[1].headers
+    assert cache_stats(session)["misses"] == 2
+
+
+def test_create_session_mounts_cache(tmp_path):
+    session = fetcher.create_session(tmp_path / "http")
+    assert isinstance(session.get_adapter("https://example.com"), CachingAdapter)
+    assert cache_stats(session) == {"hits": 0, "revalidated": 0, "misses": 0}
+    assert cache_stats(fetcher.create_session()) is None
@@ -1,5 +1,6 @@
+import os
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 import pytest
 
 
@@ -15,6 +16,25 @@ def test_parse_args_defaults(tmp_path):
         assert Path(args.categories) == tmp_path / "categories.json"
         assert args.timeout == 10
         assert args.workers == 1
+        assert args.cache_dir is None
+        assert args.engine == "threads"
+        assert args.http2 is False
+        assert args.parser == "html.parser"
+        assert args.incremental is False
+        assert args.refresh_ttl == 86400
+        assert args.adaptive is False
+        assert args.site_url == "https://www.method.gg"
+        assert args.profile is None
+        assert args.format == "json"
+        assert args.parse_processes == 0
+        assert args.resume is False
+        assert args.only_if_changed is False
+        assert args.delta is False
+        assert args.binary_export is None
+        assert args.sqlite is None
+        assert args.mirror_images is None
+        assert args.watch is None
+        assert args.status_file is None
         assert Path(args.log_file).parent == Path("logs")
         assert Path(args.log_file).name.startswith("runtime-")
 
@@ -31,27 +51,95 @@ def test_main_invokes_fetchers(tmp_path):
         "DEBUG",
     ]
     with patch.object(cli, "configure_structlog") as mock_conf, patch.object(
+        cli, "create_session"
+    ) as mock_session, patch.object(
+        cli, "fetch_overview"
+    ) as mock_overview, patch.object(
         cli,
         "fetch_units",
-    ) as mock_units, patch.object(cli, "fetch_categories") as mock_cats:
+    ) as mock_units, patch.object(
+        cli, "fetch_categories"
+    ) as mock_cats:
         mock_units.return_value = {"ambush": "desc"}
         cli.main(args)
         called_path = mock_conf.call_args.args[1]
         assert called_path.parent == Path("logs")
         assert called_path.name.startswith("runtime-")
+        session = mock_session.return_value
+        mock_session.assert_called_once_with(
+            None, pool_size=1, http2=False, adaptive=False
+        )
+        mock_overview.assert_called_once_with(
+            session, timeout=7, parser="html.parser", timings=ANY
+        )
         mock_units.assert_called_once_with(
             out_path=Path(args[1]),
             categories_path=Path(args[3]),
             timeout=7,
             max_workers=1,
+            session=session,
+            overview=mock_overview.return_value,
+            parser="html.parser",
+            incremental=False,
+            refresh_ttl=86400,
+            adaptive=False,
+            timings=ANY,
+            output_format="json",
+            parse_processes=0,
+            resume=False,
+            only_if_changed=False,
+            delta=False,
         )
         mock_cats.assert_called_once_with(
             out_path=Path(args[3]),
             timeout=7,
+            session=session,
             existing_path=Path(args[3]),
             units_path=Path(args[1]),
             trait_desc_map=mock_units.return_value,
+            overview=mock_overview.return_value,
+            timings=ANY,
+            only_if_changed=False,
+            delta=False,
         )
+        session.close.assert_called_once()
+
+
+def test_main_async_engine(tmp_path):
+    args = [
+        "--output",
+        str(tmp_path / "u.json"),
+        "--categories",
+        str(tmp_path / "c.json"),
+        "--engine",
+        "async",
+        "--workers",
+        "50",
+    ]
+
+    async def fake_async(**kwargs):
+        return {"ambush": "desc"}
+
+    with patch.object(cli, "configure_structlog"), patch.object(
+        cli, "create_session"
+    ), patch.object(cli, "fetch_overview"), patch.object(
+        cli, "fetch_units"
+    ) as mock_units, patch.object(
+        cli, "fetch_units_async", side_effect=fake_async
+    ) as mock_async, patch.object(
+        cli, "fetch_categories"
+    ) as mock_cats:
+        cli.main(args)
+        mock_units.assert_not_called()
+        assert mock_async.call_args.kwargs["max_concurrency"] == 50
+        assert mock_cats.call_args.kwargs["trait_desc_map"] == {"ambush": "desc"}
+
+
+def test_parse_args_site_url():
+    args = cli.parse_args(["--site-url", "http://127.0.0.1:8000"])
+    assert args.site_url == "http://127.0.0.1:8000"
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--site-url", "http://example.com"])
 
 
 def test_parse_args_invalid_timeout():
@@ -62,3 +150,20 @@ def test_parse_args_invalid_timeout():
 def test_parse_args_invalid_workers():
     with pytest.raises(SystemExit):
         cli.parse_args(["--workers", "-1"])
+
+
+def test_parse_args_parse_processes_defaults_to_cpu_count():
+    assert cli.parse_args(["--parse-processes"]).parse_processes == (
+        os.cpu_count() or 1
+    )
+    assert cli.parse_args(["--parse-processes", "3"]).parse_processes == 3
+    with pytest.raises(SystemExit):
+        cli.parse_args(["--parse-processes", "-1"])
+
+
+def test_parse_args_rejects_delta_with_ndjson(capsys):
+    assert cli.parse_args(["--delta"]).delta
+    with pytest.raises(SystemExit) as exc_info:
+        cli.parse_args(["--format", "ndjson", "--delta"])
+    assert exc_info.value.code == 2
+    assert "--delta requires --format json" in capsys.readouterr().err
@@ -0,0 +1,166 @@
+import threading
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+import requests
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.concurrency import AdaptiveLimiter
+
+OVERVIEW = (
+    "<div class='mini-wrapper' data-name='Footman' data-family='Alliance' "
+    "data-type='Troop' data-cost='2'>"
+    "<a class='mini-link' href='/warcraft-rumble/minis/footman'></a></div>"
+    "<div class='mini-wrapper' data-name='Ghoul' data-family='Undead' "
+    "data-type='Troop' data-cost='1'>"
+    "<a class='mini-link' href='/warcraft-rumble/minis/ghoul'></a></div>"
+)
+DETAIL = (
+    "<div class='mini-section'><h2>Stats</h2><div class='mini-details-tile'>"
+    "<div class='detail-label'>Health</div><div class='detail-info'>1</div>"
+    "</div></div>"
+)
+FOOTMAN_URL = "https://www.method.gg/warcraft-rumble/minis/footman"
+
+
+def complete(limiter, count, latency=0.01, overloaded=False):
+    tokens = [limiter.acquire() for _ in range(count)]
+    for token in tokens:
+        limiter.release(token, latency, overloaded=overloaded)
+
+
+def test_limiter_grows_up_to_ceiling():
+    limiter = AdaptiveLimiter(8)
+    assert limiter.limit == 1
+    for _ in range(10):
+        complete(limiter, limiter.limit)
+    assert limiter.limit == 8
+    assert limiter.peak == 8
+
+
+def test_limiter_halves_once_per_window_on_overload():
+    limiter = AdaptiveLimiter(8, initial=8)
+    complete(limiter, 8, overloaded=True)
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+    complete(limiter, 4, overloaded=True)
+    assert limiter.limit == 2
+
+
+def test_limiter_grows_additively_after_decrease():
+    limiter = AdaptiveLimiter(16, initial=8)
+    complete(limiter, 1, overloaded=True)
+    assert limiter.limit == 4
+    complete(limiter, 4)
+    complete(limiter, 1)
+    assert limiter.limit == 5
+
+
+def test_limiter_cuts_on_rising_latency():
+    limiter = AdaptiveLimiter(16, initial=8)
+    complete(limiter, 8, latency=0.1)
+    limit = limiter.limit
+    complete(limiter, limit, latency=2.0)
+    assert limiter.limit < limit
+    assert limiter.decreases == 1
+
+
+def test_limiter_blocks_when_full():
+    limiter = AdaptiveLimiter(4)
+    token = limiter.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        limiter.release(limiter.acquire(), 0.01)
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not acquired.wait(0.1)
+    limiter.release(token, 0.01)
+    assert acquired.wait(5)
+    thread.join()
+
+
+def test_is_overload():
+    assert fetcher._is_overload(fetcher.FetchError("x", 429))
+    assert fetcher._is_overload(fetcher.FetchError("x", 503))
+    assert not fetcher._is_overload(fetcher.FetchError("x", 404))
+    assert not fetcher._is_overload(fetcher.FetchError("x"))
+    try:
+        raise fetcher.FetchError("x") from requests.exceptions.RetryError("5xx")
+    except fetcher.FetchError as exc:
+        assert fetcher._is_overload(exc)
+
+
+def session_with(statuses: dict[str, list[int]]) -> Mock:
+    def get(url, **_):
+        if url == fetcher.BASE_URL:
+            return Mock(status_code=200, text=OVERVIEW)
+        queue = statuses.get(url)
+        return Mock(status_code=queue.pop(0) if queue else 200, text=DETAIL)
+
+    session = Mock()
+    session.get.side_effect = get
+    return session
+
+
+def test_fetch_units_adaptive_retries_overload(tmp_path):
+    session = session_with({FOOTMAN_URL: [429, 503]})
+    with patch.object(fetcher.time, "sleep") as sleep:
+        fetcher.fetch_units(
+            out_path=tmp_path / "units.json",
+            categories_path=tmp_path / "cats.json",
+            session=session,
+            max_workers=4,
+            adaptive=True,
+        )
+    assert sleep.call_count == 2
+    detail_calls = [c for c in session.get.call_args_list if c.args[0] == FOOTMAN_URL]
+    assert len(detail_calls) == 3
+
+
+def test_fetch_units_adaptive_gives_up(tmp_path):
+    session = session_with({FOOTMAN_URL: [503] * 10})
+    with patch.object(fetcher.time, "sleep"), pytest.raises(fetcher.FetchError):
+        fetcher.fetch_units(
+            out_path=tmp_path / "units.json",
+            categories_path=tmp_path / "cats.json",
+            session=session,
+            adaptive=True,
+        )
+
+
+def test_fetch_units_adaptive_does_not_retry_client_errors(tmp_path):
+    session = session_with({FOOTMAN_URL: [404]})
+    with pytest.raises(fetcher.FetchError) as exc_info:
+        fetcher.fetch_units(
+            out_path=tmp_path / "units.json",
+            categories_path=tmp_path / "cats.json",
+            session=session,
+            adaptive=True,
+        )
+    assert exc_info.value.status == 404
+
+
+async def test_fetch_units_async_adaptive_retries_overload(tmp_path):
+    answers = [503]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == FOOTMAN_URL and answers:
+            return httpx.Response(answers.pop())
+        return httpx.Response(200, text=DETAIL)
+
+    with patch.object(fetcher, "OVERLOAD_BACKOFF", 0):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await fetcher.fetch_units_async(
+                out_path=tmp_path / "units.json",
+                categories_path=tmp_path / "cats.json",
+                client=client,
+                overview=fetcher._parse_overview(OVERVIEW),
+                max_concurrency=4,
+                adaptive=True,
+            )
+    assert answers == []
+    assert (tmp_path / "units.json").exists()
@@ -0,0 +1,88 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from wcr_data_extraction.database import export_sqlite, talent_key
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import stub  # noqa: E402
+
+
+def build(tmp_path) -> sqlite3.Connection:
+    path = tmp_path / "wcr.sqlite"
+    export_sqlite(
+        path, stub.FIXTURE_DIR / "units.json", stub.FIXTURE_DIR / "categories.json"
+    )
+    return sqlite3.connect(path)
+
+
+def test_tables_hold_every_unit_and_category(tmp_path):
+    units = json.loads((stub.FIXTURE_DIR / "units.json").read_text(encoding="utf-8"))
+    cats = json.loads(
+        (stub.FIXTURE_DIR / "categories.json").read_text(encoding="utf-8")
+    )
+    conn = build(tmp_path)
+    ids = [row[0] for row in conn.execute("SELECT id FROM units ORDER BY position")]
+    assert ids == [unit["id"] for unit in units]
+    (count,) = conn.execute("SELECT COUNT(*) FROM categories").fetchone()
+    assert count == sum(len(items) for items in cats.values())
+    unit = units[0]
+    traits = {
+        row[0]
+        for row in conn.execute(
+            "SELECT trait_id FROM unit_traits WHERE unit_id = ?", (unit["id"],)
+        )
+    }
+    assert traits == set(unit["trait_ids"])
+    stats = dict(
+        conn.execute("SELECT name, value FROM stats WHERE unit_id = ?", (unit["id"],))
+    )
+    assert stats == unit["details"]["stats"]
+    (name,) = conn.execute(
+        "SELECT text FROM translations WHERE owner = 'talent' AND owner_id = ?"
+        " AND field = 'name' AND language = 'en'",
+        (talent_key(unit["id"], 0),),
+    ).fetchone()
+    assert name == unit["details"]["talents"][0]["name"]["en"]
+
+
+def test_trait_query_uses_index(tmp_path):
+    conn = build(tmp_path)
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT unit_id FROM unit_traits WHERE trait_id = 'aoe'"
+    ).fetchall()
+    assert "unit_traits_trait" in plan[0][-1]
+
+
+def test_stats_carry_normalized_numbers(tmp_path):
+    units = json.loads((stub.FIXTURE_DIR / "units.json").read_text(encoding="utf-8"))
+    conn = build(tmp_path)
+    unit = units[0]
+    rows = {
+        row[0]: row[1:]
+        for row in conn.execute(
+            "SELECT name, key, number, unit FROM stats WHERE unit_id = ?",
+            (unit["id"],),
+        )
+    }
+    assert rows["Health"] == ("health", 3400, None)
+    assert rows["Attack Speed"] == ("attack_speed", 2.5, "s")
+    assert rows["Speed"] == (None, None, None)
+    query = "SELECT unit_id FROM stats WHERE key = 'health' AND number > 1000"
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+    assert "stats_key_number" in plan[0][-1]
+    healthy = {row[0] for row in conn.execute(query)}
+    assert healthy == {
+        u["id"]
+        for u in units
+        if u["details"]["stats_normalized"].get("health", {}).get("value", 0) > 1000
+    }
+
+
+def test_export_replaces_existing_database(tmp_path):
+    build(tmp_path).close()
+    conn = build(tmp_path)
+    (count,) = conn.execute("SELECT COUNT(*) FROM units").fetchone()
+    assert count == 16
+    assert not (tmp_path / "wcr.tmp").exists()
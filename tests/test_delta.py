@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.delta import apply_patch, delta_path, diff
+
+
+def read(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_diff_matches_units_by_id():
+    old = [
+        {"id": "a", "cost": 1, "names": {"en": "A"}},
+        {"id": "b", "cost": 2},
+        {"id": "c", "cost": 3},
+    ]
+    new = [
+        {"id": "c", "cost": 3},
+        {"id": "d", "cost": 4},
+        {"id": "a", "cost": 5, "names": {"en": "A", "de": "A"}},
+    ]
+    ops = diff(old, new)
+    assert {"op": "remove", "path": "/1"} in ops
+    assert {"op": "replace", "path": "/2/cost", "value": 5} in ops
+    assert {"op": "add", "path": "/2/names/de", "value": "A"} in ops
+    assert apply_patch(old, ops) == new
+    assert diff(new, new) == []
+
+
+def test_diff_escapes_pointer_tokens():
+    old = {"a/b": 1, "m~n": [1, 2]}
+    new = {"a/b": 2, "m~n": [2]}
+    ops = diff(old, new)
+    assert ops == [
+        {"op": "replace", "path": "/a~1b", "value": 2},
+        {"op": "replace", "path": "/m~0n", "value": [2]},
+    ]
+    assert apply_patch(old, ops) == new
+
+
+def test_fetch_units_writes_delta(tmp_path, site, run_units):
+    out_path = tmp_path / "units.json"
+    run_units()
+    old = read(out_path)
+
+    site.minis = {"footman": 3, "grunt": 2}
+    run_units(delta=True)
+    ops = read(delta_path(out_path))
+    assert delta_path(out_path).name == "units.patch.json"
+    assert {"op": "replace", "path": "/0/cost", "value": 3} in ops
+    assert [op["op"] for op in ops].count("add") == 1
+    assert apply_patch(old, ops) == read(out_path)
+
+    run_units(delta=True)
+    assert read(delta_path(out_path)) == []
+
+
+def test_fetch_categories_writes_delta(tmp_path, site, run_units):
+    units_path = tmp_path / "units.json"
+    site.minis = {"footman": 2}
+    run_units()
+    out_path = tmp_path / "categories.json"
+    out_path.write_text(json.dumps({"factions": [], "types": [], "speeds": []}))
+    old = read(out_path)
+    fetcher.fetch_categories(
+        out_path=out_path,
+        units_path=units_path,
+        overview=site.parse_overview(),
+        delta=True,
+    )
+    ops = read(tmp_path / "categories.patch.json")
+    assert apply_patch(old, ops) == read(out_path)
+
+
+def test_delta_requires_json_format(tmp_path, run_units):
+    with pytest.raises(ValueError):
+        run_units(
+            out_path=tmp_path / "units.ndjson", output_format="ndjson", delta=True
+        )
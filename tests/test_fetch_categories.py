@@ -167,3 +167,33 @@ def test_fetch_categories_prefers_non_null_descriptions(tmp_path):
     data = json.loads(out_file.read_text())
     trait = next(t for t in data["traits"] if t["id"] == "ambush")
     assert trait["descriptions"]["en"] == "Ambush foes"
+
+
+def test_fetch_categories_reuses_overview(tmp_path):
+    units_path = tmp_path / "units.json"
+    units_path.write_text(json.dumps(make_units()))
+    mock_session = Mock()
+    mock_session.get.return_value = Mock(status_code=200, text=make_html())
+
+    overview = fetcher.fetch_overview(mock_session)
+    # Only the parsed cards are kept, not the page
+    assert not hasattr(overview, "html")
+    out_file = tmp_path / "cats.json"
+    fetcher.fetch_units(
+        out_path=tmp_path / "new_units.json",
+        categories_path=out_file,
+        session=mock_session,
+        overview=overview,
+    )
+    fetcher.fetch_categories(
+        out_path=out_file,
+        session=mock_session,
+        units_path=units_path,
+        overview=overview,
+    )
+
+    mock_session.get.assert_called_once_with(
+        fetcher.BASE_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=10
+    )
+    data = json.loads(out_file.read_text())
+    assert {s["id"] for s in data["speeds"]} == {"slow", "fast"}
@@ -1,77 +1,150 @@
+import json
+import os
 import sys
 from pathlib import Path
 from argparse import Namespace
-from unittest.mock import patch
+from unittest.mock import ANY, Mock, patch
+
+import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 from scripts import fetch_method  # noqa: E402
 
 
-def test_script_invokes_fetchers(tmp_path):
-    args = Namespace(
+def make_args(tmp_path, **overrides) -> Namespace:
+    args = dict(
         output=str(tmp_path / "u.json"),
         categories=str(tmp_path / "c.json"),
         timeout=5,
         workers=2,
         log_level="INFO",
         log_file=str(tmp_path / "log.json"),
+        cache_dir=None,
+        engine="threads",
+        http2=False,
+        parser="html.parser",
+        site_url="https://www.method.gg",
+        incremental=False,
+        refresh_ttl=86400,
+        adaptive=False,
+        profile=None,
+        format="json",
+        parse_processes=0,
+        resume=False,
+        only_if_changed=False,
+        delta=False,
+        binary_export=None,
+        sqlite=None,
+        mirror_images=None,
+        watch=None,
+        status_file=None,
     )
+    args.update(overrides)
+    return Namespace(**args)
+
+
+def test_script_invokes_fetchers(tmp_path):
+    args = make_args(tmp_path)
     with patch.object(fetch_method.cli, "parse_args", return_value=args):
         with patch.object(fetch_method, "configure_structlog") as conf, patch.object(
-            fetch_method, "fetch_categories"
-        ) as fc, patch.object(fetch_method, "fetch_units") as fu:
+            fetch_method, "create_session"
+        ) as cs, patch.object(fetch_method, "fetch_overview") as fo, patch.object(
+            fetch_method.cli, "fetch_categories"
+        ) as fc, patch.object(
+            fetch_method.cli, "fetch_units"
+        ) as fu:
             fu.return_value = {"ambush": "desc"}
             fetch_method.main([])
             conf.assert_called_once_with("INFO", Path(args.log_file))
-            unit_tmp = Path(args.output).with_suffix(".tmp")
+            cs.assert_called_once_with(None, pool_size=2, http2=False, adaptive=False)
+            fo.assert_called_once_with(
+                cs.return_value, timeout=5, parser="html.parser", timings=ANY
+            )
             fu.assert_called_once_with(
-                out_path=unit_tmp,
+                out_path=Path(args.output),
                 categories_path=Path(args.categories),
                 timeout=5,
                 max_workers=2,
-                existing_path=Path(args.output),
+                session=cs.return_value,
+                overview=fo.return_value,
+                parser="html.parser",
+                incremental=False,
+                refresh_ttl=86400,
+                adaptive=False,
+                timings=ANY,
+                output_format="json",
+                parse_processes=0,
+                resume=False,
+                only_if_changed=True,
+                delta=False,
             )
-            cat_tmp = Path(args.categories).with_suffix(".tmp")
             fc.assert_called_once_with(
-                out_path=cat_tmp,
+                out_path=Path(args.categories),
                 timeout=5,
+                session=cs.return_value,
                 existing_path=Path(args.categories),
                 units_path=Path(args.output),
                 trait_desc_map=fu.return_value,
+                overview=fo.return_value,
+                timings=ANY,
+                only_if_changed=True,
+                delta=False,
             )
+            cs.return_value.close.assert_called_once()
 
 
 def test_no_overwrite_when_unchanged(tmp_path):
-    units_file = tmp_path / "units.json"
-    cats_file = tmp_path / "cats.json"
-    units_file.write_text("[]")
-    cats_file.write_text("{}")
-
-    args = Namespace(
-        output=str(units_file),
-        categories=str(cats_file),
-        timeout=5,
-        workers=1,
-        log_level="INFO",
-        log_file=str(tmp_path / "log.json"),
+    card = (
+        "<div class='mini-wrapper' data-name='Footman' data-family='Alliance' "
+        "data-type='Troop' data-cost='2'>"
+        "<a class='mini-link' href='/warcraft-rumble/minis/footman'></a></div>"
     )
-
-    def write_same(out_path, **_):
-        Path(out_path).write_text(
-            units_file.read_text() if "unit" in str(out_path) else cats_file.read_text()
-        )
+    session = Mock()
+    session.get.side_effect = lambda url, **_: Mock(
+        status_code=200, text=card if url == fetch_method.fetcher.BASE_URL else ""
+    )
+    args = make_args(tmp_path, workers=1)
+    units_file = Path(args.output)
+    cats_file = Path(args.categories)
 
     with patch.object(fetch_method.cli, "parse_args", return_value=args):
         with patch.object(fetch_method, "configure_structlog"), patch.object(
-            fetch_method,
-            "fetch_categories",
-            side_effect=write_same,
-        ), patch.object(
-            fetch_method,
-            "fetch_units",
-            side_effect=lambda *a, **k: (write_same(*a, **k) or {}),
+            fetch_method, "create_session", return_value=session
         ):
             fetch_method.main([])
-            # temp files removed
-            assert units_file.read_text() == "[]"
-            assert cats_file.read_text() == "{}"
+            # The first run writes both files
+            assert [u["id"] for u in json.loads(units_file.read_text())] == ["footman"]
+            first = (units_file.read_text(), cats_file.read_text())
+
+            # A fresh checkout has the exports but not the manifest
+            (tmp_path / "manifest.json").unlink()
+            for path in (units_file, cats_file):
+                os.utime(path, ns=(0, 0))
+            fetch_method.main([])
+            assert units_file.stat().st_mtime_ns == cats_file.stat().st_mtime_ns == 0
+            assert (tmp_path / "manifest.json").exists()
+
+            with patch("pathlib.Path.replace") as replace:
+                fetch_method.main([])
+            replace.assert_not_called()
+    assert (units_file.read_text(), cats_file.read_text()) == first
+    assert units_file.stat().st_mtime_ns == cats_file.stat().st_mtime_ns == 0
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_watch_retries_failed_update(tmp_path):
+    args = make_args(tmp_path, watch=30)
+    overview = fetch_method.fetcher._parse_overview("")
+    with patch.object(fetch_method.cli, "parse_args", return_value=args), patch.object(
+        fetch_method, "configure_structlog"
+    ), patch.object(fetch_method, "create_session"), patch.object(
+        fetch_method.cli, "Watcher"
+    ) as watcher_cls, patch.object(
+        fetch_method.cli.signal, "signal"
+    ), patch.object(
+        fetch_method.cli, "fetch_units", side_effect=fetch_method.FetchError("boom")
+    ):
+        fetch_method.main([])
+        scrape = watcher_cls.call_args.args[0]
+        with pytest.raises(fetch_method.FetchError):
+            scrape(overview)
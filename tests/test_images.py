@@ -0,0 +1,168 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import ANY, patch
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from wcr_data_extraction import cli
+from wcr_data_extraction.cache import CachingAdapter, HTTPCache, cache_stats
+from wcr_data_extraction.images import IMAGE_MANIFEST, image_path, mirror_images
+from wcr_data_extraction.instrumentation import Timings
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.stub import FIXTURE_DIR  # noqa: E402
+
+UNITS = json.loads((FIXTURE_DIR / "units.json").read_text(encoding="utf-8"))
+
+
+class ImageAdapter(BaseAdapter):
+    """Serve ``images`` by URL path with ETags."""
+
+    def __init__(self, images: dict[str, bytes]) -> None:
+        super().__init__()
+        self.images = images
+        self.requests: list = []
+
+    def send(self, request, **kwargs) -> Response:
+        self.requests.append(request)
+        path = request.url.split("method.gg", 1)[1]
+        body = self.images.get(path)
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.headers = CaseInsensitiveDict({"Content-Type": "image/png"})
+        if body is None:
+            response.status_code = 404
+            response._content = b""
+            return response
+        etag = f'"{len(body)}-{body[:8].hex()}"'
+        response.headers["ETag"] = etag
+        if request.headers.get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response._content = body
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def image_session(images: dict[str, bytes]) -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", ImageAdapter(images))
+    return session
+
+
+def fixture_images() -> dict[str, bytes]:
+    return {unit["image"]: unit["id"].encode() * 10 for unit in UNITS}
+
+
+def test_images_are_stored_by_content_hash(tmp_path):
+    images = fixture_images()
+    shared = images[UNITS[1]["image"]]
+    images[UNITS[0]["image"]] = shared
+    session = image_session(images)
+    timings = Timings()
+
+    manifest = mirror_images(UNITS, tmp_path, session=session, timings=timings)
+
+    assert len(session.get_adapter("https://x").requests) == len(images)
+    assert set(manifest["units"]) == {unit["id"] for unit in UNITS}
+    first, second = (manifest["units"][unit["id"]] for unit in UNITS[:2])
+    assert first == second
+    assert (tmp_path / first["path"]).read_bytes() == shared
+    assert first["path"] == image_path(first["sha256"], ".png")
+    assert len(list(tmp_path.glob("*/*.png"))) == len(images) - 1
+    saved = json.loads((tmp_path / IMAGE_MANIFEST).read_text(encoding="utf-8"))
+    assert saved == manifest
+    assert timings.bandwidth()["requests"] == len(images)
+
+
+def test_unchanged_images_are_revalidated(tmp_path):
+    images = fixture_images()
+    first = mirror_images(UNITS, tmp_path, session=image_session(images))
+    changed = UNITS[0]
+    images[changed["image"]] = b"new artwork"
+    session = image_session(images)
+
+    second = mirror_images(UNITS, tmp_path, session=session)
+
+    sent = session.get_adapter("https://x").requests
+    assert all("If-None-Match" in request.headers for request in sent)
+    assert second["units"][UNITS[1]["id"]] == first["units"][UNITS[1]["id"]]
+    new_path = second["units"][changed["id"]]["path"]
+    assert (tmp_path / new_path).read_bytes() == b"new artwork"
+    # The old file stays for clients still referencing it
+    assert (tmp_path / first["units"][changed["id"]]["path"]).exists()
+
+
+def test_mirror_bypasses_http_cache(tmp_path):
+    inner = ImageAdapter(fixture_images())
+    session = requests.Session()
+    session.mount("https://", CachingAdapter(HTTPCache(tmp_path / "http"), inner))
+    first = mirror_images(UNITS, tmp_path / "images", session=session)
+    timings = Timings()
+
+    second = mirror_images(UNITS, tmp_path / "images", session=session, timings=timings)
+
+    assert second == first
+    assert all(r.headers.get("If-None-Match") for r in inner.requests[len(UNITS) :])
+    assert timings.bandwidth()["body_bytes"] == 0
+    assert not list((tmp_path / "http").rglob("*.*"))
+    assert cache_stats(session) == {"hits": 0, "revalidated": 0, "misses": 0}
+    assert isinstance(session.get_adapter("https://x"), CachingAdapter)
+
+
+def test_failed_downloads_keep_previous_image(tmp_path):
+    images = fixture_images()
+    first = mirror_images(UNITS, tmp_path, session=image_session(images))
+    missing = UNITS[0]
+    del images[missing["image"]]
+    (tmp_path / first["units"][UNITS[1]["id"]]["path"]).unlink()
+    session = image_session(images)
+
+    second = mirror_images(UNITS, tmp_path, session=session)
+
+    assert second["units"][missing["id"]] == first["units"][missing["id"]]
+    # A deleted file is downloaded again without validators
+    restored = second["units"][UNITS[1]["id"]]
+    assert (tmp_path / restored["path"]).exists()
+    sent = {r.url: r.headers for r in session.get_adapter("https://x").requests}
+    assert "If-None-Match" not in sent["https://www.method.gg" + UNITS[1]["image"]]
+
+    third = mirror_images(UNITS, tmp_path / "fresh", session=session)
+    assert missing["id"] not in third["units"]
+
+
+def test_cli_mirrors_images(tmp_path):
+    mirror_dir = tmp_path / "images"
+    args = [
+        "--log-file",
+        str(tmp_path / "log.json"),
+        "--mirror-images",
+        str(mirror_dir),
+    ]
+    with patch.object(cli, "create_session") as mock_session, patch.object(
+        cli, "fetch_overview"
+    ), patch.object(cli, "fetch_units"), patch.object(
+        cli, "fetch_categories"
+    ), patch.object(
+        cli, "load_existing_units", return_value={"a": UNITS[0]}
+    ), patch.object(
+        cli, "mirror_images"
+    ) as mock_mirror:
+        cli.main(args + ["--output", "u.json", "--categories", "c.json"])
+    mock_mirror.assert_called_once_with(
+        ANY,
+        str(mirror_dir),
+        session=mock_session.return_value,
+        timeout=10,
+        timings=ANY,
+    )
+    assert list(mock_mirror.call_args.args[0]) == [UNITS[0]]
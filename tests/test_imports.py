@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.imports import HEAVY_MODULES, cli_import_time, importtime  # noqa: E402
+
+
+def heavy(modules: dict[str, int]) -> list[str]:
+    return sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES)
+
+
+def test_package_and_loaders_skip_http_stack():
+    modules = importtime(
+        "import wcr_data_extraction as w; w.load_existing_units; w.UnitIndex"
+    )
+    # Imported by fetcher, so the loaders were really resolved
+    assert "wcr_data_extraction.parsing" in modules
+    assert heavy(modules) == []
+
+
+def test_cli_help_skips_http_stack():
+    modules = importtime(
+        "from wcr_data_extraction import cli\n"
+        "try:\n    cli.parse_args(['--help'])\nexcept SystemExit:\n    pass"
+    )
+    assert heavy(modules) == []
+
+
+def test_fetch_imports_http_stack_on_use():
+    modules = importtime("from wcr_data_extraction import fetcher; fetcher.adapter")
+    assert "requests" in modules
+
+
+def test_cli_import_time_is_measured():
+    assert 0 < cli_import_time(1) < 5
@@ -0,0 +1,71 @@
+import json
+from unittest.mock import patch
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.incremental import fingerprint_path, load_fingerprints
+
+
+def test_incremental_skips_unchanged_units(tmp_path, site, run_units):
+    run_units(incremental=True)
+    assert len(site.detail_urls()) == 2
+    before = (tmp_path / "units.json").read_bytes()
+    state = load_fingerprints(fingerprint_path(tmp_path / "units.json"))
+    assert sorted(state) == ["footman", "ghoul"]
+
+    run_units(incremental=True)
+    assert site.detail_urls() == []
+    assert (tmp_path / "units.json").read_bytes() == before
+
+
+def test_incremental_refetches_changed_card(tmp_path, site, run_units):
+    run_units(incremental=True)
+    site.minis["footman"] = 3
+    run_units(incremental=True)
+    assert site.detail_urls() == ["https://www.method.gg/warcraft-rumble/minis/footman"]
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    assert units[0]["cost"] == 3
+    assert units[1]["details"]["stats"] == {"Health": "1,200"}
+    assert units[1]["details"]["stats_normalized"] == {
+        "health": {"value": 1200, "label": "Health"}
+    }
+
+
+def test_incremental_refetches_after_ttl(tmp_path, site, run_units):
+    with patch.object(fetcher.time, "time", return_value=1000.0):
+        run_units(incremental=True)
+    with patch.object(fetcher.time, "time", return_value=1500.0):
+        run_units(incremental=True, refresh_ttl=600)
+        assert site.detail_urls() == []
+    with patch.object(fetcher.time, "time", return_value=1700.0):
+        run_units(incremental=True, refresh_ttl=600)
+        assert len(site.detail_urls()) == 2
+    state = load_fingerprints(fingerprint_path(tmp_path / "units.json"))
+    assert state["ghoul"]["fetched_at"] == 1700.0
+
+
+def test_incremental_without_state_fetches_everything(tmp_path, site, run_units):
+    run_units(incremental=True)
+    fingerprint_path(tmp_path / "units.json").write_text("{broken")
+    run_units(incremental=True)
+    assert len(site.detail_urls()) == 2
+
+
+def test_incremental_keeps_state_next_to_output(tmp_path, site, run_units):
+    existing = tmp_path / "committed.json"
+    run_units(out_path=existing, incremental=True)
+    site.minis["footman"] = 3
+
+    run_units(existing_path=existing, incremental=True)
+    run_units(existing_path=existing, incremental=True)
+    assert site.detail_urls() == []
+    state = load_fingerprints(fingerprint_path(tmp_path / "units.json"))
+    assert sorted(state) == ["footman", "ghoul"]
+
+
+async def test_incremental_async_skips_unchanged_units(
+    site, run_units, run_units_async
+):
+    run_units(incremental=True)
+    site.minis["footman"] = 3
+    await run_units_async(overview=site.parse_overview(), incremental=True)
+    assert site.detail_urls() == ["https://www.method.gg/warcraft-rumble/minis/footman"]
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from wcr_data_extraction import UnitIndex
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import stub  # noqa: E402
+
+UNITS_PATH = stub.FIXTURE_DIR / "units.json"
+
+
+@pytest.fixture(scope="module")
+def index() -> UnitIndex:
+    return UnitIndex.from_file(UNITS_PATH)
+
+
+def scan(index, predicate) -> set:
+    return {unit["id"] for unit in index.units if predicate(unit)}
+
+
+def test_get_by_id(index):
+    assert index.get("abomination")["cost"] == 6
+    assert index.get("missing") is None
+    assert len(index) == 16
+
+
+def test_queries_match_linear_scan(index):
+    query = index.where(trait_ids="aoe").between("cost", high=4)
+    assert set(query.ids()) == scan(
+        index, lambda u: "aoe" in u["trait_ids"] and u["cost"] <= 4
+    )
+    query = index.where(faction_ids="undead", type_id="troop")
+    assert set(query.ids()) == scan(
+        index, lambda u: "undead" in u["faction_ids"] and u["type_id"] == "troop"
+    )
+    assert index.query().count() == len(index)
+
+
+def test_range_query_yields_ascending_values(index):
+    health = [unit["health"] for unit in index.between("health", low=1000)]
+    assert health == sorted(health)
+    assert health and min(health) >= 1000
+    assert index.between("cost", low=5, high=1).count() == 0
+
+
+def test_queries_are_lazy_and_immutable(index):
+    base = index.where(faction_ids="undead")
+    narrowed = base.between("cost", high=2)
+    assert base.count() > narrowed.count()
+    units = iter(base)
+    assert next(units)["faction_ids"] == ["undead"]
+
+
+def test_unindexed_field_is_rejected(index):
+    with pytest.raises(ValueError):
+        index.where(image="x.png")
+    with pytest.raises(ValueError):
+        index.between("speed_id", low=1)
@@ -0,0 +1,112 @@
+import pstats
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from wcr_data_extraction import cli, fetcher
+from wcr_data_extraction.instrumentation import Timings, _percentile, profiled
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import stub  # noqa: E402
+
+
+def fetch(tmp_path, **kwargs) -> None:
+    overview, pages = stub.load_fixtures()
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=stub.FIXTURE_DIR / "categories.json",
+        session=stub.stub_session(overview, pages),
+        **kwargs,
+    )
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 21)]
+    assert _percentile(values, 50) == 10.0
+    assert _percentile(values, 95) == 19.0
+    assert _percentile([3.0], 95) == 3.0
+
+
+def test_summary_ranks_slowest_units():
+    timings = Timings()
+    timings.record("unit", 0.2, "footman")
+    timings.record("request", 0.15, "footman")
+    timings.record("unit", 0.5, "ghoul")
+    timings.record("merge", 0.01)
+    summary = timings.summary(slowest=1)
+    assert summary["phases"]["unit"]["count"] == 2
+    assert summary["phases"]["unit"]["max_ms"] == 500.0
+    assert summary["slowest_units"] == [{"unit": "ghoul", "unit_ms": 500.0}]
+
+
+def test_bandwidth_sums_transfers():
+    timings = Timings()
+    timings.transfer("u/a", wire_bytes=100, body_bytes=400, encoding="gzip")
+    timings.transfer("u/b", wire_bytes=0, body_bytes=800, encoding="cached")
+    timings.transfer(
+        "u/c", wire_bytes=100, body_bytes=100, encoding="identity", ttfb=0.2, unit="c"
+    )
+    bandwidth = timings.bandwidth(largest=1)
+    assert bandwidth["requests"] == 3
+    assert bandwidth["wire_bytes"] == 200
+    assert bandwidth["body_bytes"] == 1300
+    assert bandwidth["compression_ratio"] == 6.5
+    assert bandwidth["encodings"] == {"gzip": 1, "cached": 1, "identity": 1}
+    assert bandwidth["largest_pages"][0]["url"] == "u/b"
+    assert timings.units == {"c": {"ttfb": 0.2}}
+    assert Timings().bandwidth()["compression_ratio"] is None
+
+
+def test_fetch_units_records_phases(tmp_path):
+    timings = Timings()
+    fetch(tmp_path, timings=timings)
+    phases = timings.summary()["phases"]
+    for name in ("overview_request", "unit", "request", "parse", "merge", "json_dump"):
+        assert name in phases, name
+    assert phases["unit"]["count"] == len(stub.load_fixtures()[1])
+    assert timings.bandwidth()["requests"] == len(stub.load_fixtures()[1]) + 1
+
+
+def test_profiled_includes_worker_threads(tmp_path):
+    path = tmp_path / "run.prof"
+    with profiled(path):
+        fetch(tmp_path, max_workers=4)
+    functions = {func for _, _, func in pstats.Stats(str(path)).stats}
+    assert "parse_unit_details" in functions
+    assert "fetch_units" in functions
+
+
+def square_sum(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_profiled_thread_pool(tmp_path):
+    path = tmp_path / "pool.prof"
+    with profiled(path):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert len(list(executor.map(square_sum, [1000] * 8))) == 8
+    calls = {
+        func: stat[1] for (_, _, func), stat in pstats.Stats(str(path)).stats.items()
+    }
+    assert calls["square_sum"] == 8
+
+
+def test_profiled_without_path_does_nothing(tmp_path):
+    with profiled(None):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cli_profile_writes_stats(tmp_path):
+    path = tmp_path / "cli.prof"
+    with patch.object(cli, "configure_structlog"), patch.object(
+        cli, "create_session"
+    ), patch.object(cli, "fetch_overview"), patch.object(
+        cli, "fetch_units", return_value={}
+    ), patch.object(
+        cli, "fetch_categories"
+    ) as mock_cats:
+        cli.main(["--profile", str(path), "--log-file", str(tmp_path / "log")])
+    assert isinstance(mock_cats.call_args.kwargs["timings"], Timings)
+    assert pstats.Stats(str(path)).total_calls > 0
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.journal import Journal, journal_path
+
+
+def crash(site, run_units) -> None:
+    """Run until the Ghoul detail page fails, leaving a journal behind."""
+
+    site.failing = "ghoul"
+    with pytest.raises(fetcher.FetchError):
+        run_units()
+    site.failing = None
+
+
+def test_resume_skips_units_journaled_before_crash(tmp_path, site, run_units):
+    crash(site, run_units)
+    assert not (tmp_path / "units.json").exists()
+    assert journal_path(tmp_path / "units.json").exists()
+
+    trait_descs = run_units(resume=True)
+    assert site.detail_urls() == [f"{fetcher.BASE_URL}/ghoul"]
+    assert trait_descs == {"melee": "Fights up close"}
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    assert [unit["id"] for unit in units] == ["footman", "ghoul"]
+    assert units[0]["details"] == units[1]["details"]
+    assert not journal_path(tmp_path / "units.json").exists()
+
+
+def test_resume_ignores_journal_of_other_overview(site, run_units):
+    crash(site, run_units)
+    site.minis["ghoul"] = 3
+    run_units(resume=True)
+    assert len(site.detail_urls()) == 2
+
+
+def test_without_resume_journal_starts_over(site, run_units):
+    crash(site, run_units)
+    run_units()
+    assert len(site.detail_urls()) == 2
+
+
+async def test_async_resume(tmp_path, site, run_units, run_units_async):
+    crash(site, run_units)
+    await run_units_async(resume=True)
+    assert site.urls() == [fetcher.BASE_URL, f"{fetcher.BASE_URL}/ghoul"]
+    assert not journal_path(tmp_path / "units.json").exists()
+
+
+def test_journal_tolerates_cut_off_line(tmp_path):
+    path = tmp_path / "units.journal"
+    journal = Journal(path, "snap")
+    journal.record("footman", {"cost": 2})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": "gho')
+
+    journal = Journal(path, "snap", resume=True)
+    assert journal.entries == {"footman": {"cost": 2}}
+    journal.record("ghoul", {"cost": 1})
+    journal.close()
+    assert set(Journal(path, "snap", resume=True).entries) == {"footman", "ghoul"}
+    assert Journal(path, "other", resume=True).entries == {}
@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.manifest import (
+    commit_export,
+    load_manifest,
+    manifest_path,
+    unordered_digest,
+)
+
+CARD = (
+    "<div class='mini-wrapper' data-name='{name}' data-family='Alliance' "
+    "data-type='Troop' data-cost='1'></div>"
+)
+
+
+def run(tmp_path, names=("Footman", "Ghoul"), **kwargs) -> None:
+    html = "".join(CARD.format(name=name) for name in names)
+    fetcher.fetch_units(
+        out_path=tmp_path / kwargs.pop("name", "units.json"),
+        categories_path=tmp_path / "cats.json",
+        overview=fetcher._parse_overview(html),
+        **kwargs,
+    )
+
+
+def test_manifest_records_hash_of_written_bytes(tmp_path):
+    run(tmp_path)
+    units_path = tmp_path / "units.json"
+    entry = load_manifest(manifest_path(units_path))["units.json"]
+    assert entry["sha256"] == hashlib.sha256(units_path.read_bytes()).hexdigest()
+    assert entry["size"] == units_path.stat().st_size
+
+
+def test_only_if_changed_keeps_unchanged_file(tmp_path):
+    run(tmp_path)
+    units_path = tmp_path / "units.json"
+    mtime = units_path.stat().st_mtime_ns
+    run(tmp_path, only_if_changed=True)
+    assert units_path.stat().st_mtime_ns == mtime
+    run(tmp_path, names=("Footman", "Ghoul", "Grunt"), only_if_changed=True)
+    assert units_path.stat().st_mtime_ns != mtime
+
+
+def test_touched_file_is_still_unchanged(tmp_path):
+    run(tmp_path)
+    units_path = tmp_path / "units.json"
+    os.utime(units_path, ns=(0, 0))
+    run(tmp_path, only_if_changed=True)
+    assert units_path.stat().st_mtime_ns == 0
+
+
+def test_without_manifest_compares_content(tmp_path):
+    # A fresh checkout has the exports but not the manifest
+    run(tmp_path)
+    units_path = tmp_path / "units.json"
+    digest = load_manifest(manifest_path(units_path))["units.json"]["sha256"]
+    manifest_path(units_path).unlink()
+    os.utime(units_path, ns=(0, 0))
+    run(tmp_path, only_if_changed=True)
+    assert units_path.stat().st_mtime_ns == 0
+    assert load_manifest(manifest_path(units_path))["units.json"] == {
+        "sha256": digest,
+        "size": units_path.stat().st_size,
+    }
+
+    manifest_path(units_path).unlink()
+    units_path.write_text(units_path.read_text().replace("Ghoul", "Ghuol"))
+    run(tmp_path, only_if_changed=True)
+    assert '"Ghoul"' in units_path.read_text()
+
+
+def test_hand_edited_file_is_rewritten(tmp_path):
+    run(tmp_path)
+    units_path = tmp_path / "units.json"
+    units_path.write_text(units_path.read_text().replace("Ghoul", "Ghul"))
+    os.utime(units_path, ns=(0, 0))
+    run(tmp_path, only_if_changed=True)
+    assert '"Ghoul"' in units_path.read_text()
+
+
+def test_ndjson_hash_ignores_line_order(tmp_path):
+    run(tmp_path, name="units.ndjson", output_format="ndjson")
+    path = tmp_path / "units.ndjson"
+    lines = path.read_bytes().splitlines(keepends=True)
+    digests = [hashlib.sha256(line).digest() for line in reversed(lines)]
+    entry = load_manifest(manifest_path(path))["units.ndjson"]
+    assert entry["sha256"] == unordered_digest(digests)
+
+
+def test_commit_export_without_manifest(tmp_path):
+    tmp = tmp_path / "data.tmp"
+    tmp.write_text("{}")
+    assert commit_export(tmp, tmp_path / "data.json", "abc", only_if_changed=True)
+    assert (tmp_path / "data.json").read_text() == "{}"
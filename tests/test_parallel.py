@@ -1,7 +1,15 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import patch, Mock
 
 
 from wcr_data_extraction import fetcher  # noqa: E402
+from wcr_data_extraction.instrumentation import Timings
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import stub  # noqa: E402
 
 
 def test_fetch_units_uses_max_workers(tmp_path):
@@ -11,10 +19,8 @@ def test_fetch_units_uses_max_workers(tmp_path):
     mock_session = Mock()
     mock_session.get.return_value = mock_response
     with patch.object(fetcher, "create_session", return_value=mock_session), patch(
-        "concurrent.futures.ThreadPoolExecutor"
+        "concurrent.futures.ThreadPoolExecutor", wraps=ThreadPoolExecutor
     ) as executor_mock, patch.object(fetcher, "OUT_PATH", tmp_path / "u.json"):
-        executor = executor_mock.return_value.__enter__.return_value
-        executor.map.return_value = []
         fetcher.fetch_units(max_workers=5, session=mock_session)
         executor_mock.assert_called_once_with(max_workers=5)
         mock_session.get.assert_called_once_with(
@@ -22,3 +28,58 @@ def test_fetch_units_uses_max_workers(tmp_path):
             headers={"User-Agent": "Mozilla/5.0"},
             timeout=10,
         )
+
+
+def test_parse_processes_match_threaded_output(tmp_path):
+    overview, pages = stub.load_fixtures()
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=stub.FIXTURE_DIR / "categories.json",
+        session=stub.stub_session(overview, pages),
+        max_workers=4,
+        parse_processes=2,
+    )
+    assert (tmp_path / "units.json").read_bytes() == (
+        stub.FIXTURE_DIR / "units.json"
+    ).read_bytes()
+
+
+def test_parse_stage_applies_backpressure():
+    cards = fetcher._parse_overview(
+        "".join(
+            f"<div class='mini-wrapper' data-name='M{index}'></div>"
+            for index in range(20)
+        )
+    ).cards
+    release = threading.Event()
+    downloaded = []
+
+    def fetch(card):
+        downloaded.append(card)
+        return "<html></html>"
+
+    def blocked_parse(html, cats, parser):
+        assert release.wait(5)
+        return {}
+
+    cats = {"faction": {}, "type": {}, "trait": {}, "speed": {}}
+    with ThreadPoolExecutor(max_workers=1) as pool, patch.object(
+        fetcher, "parse_unit_details", side_effect=blocked_parse
+    ):
+        units = fetcher._stream_units(
+            fetch,
+            cards,
+            {},
+            cats,
+            {},
+            max_workers=1,
+            trait_descs={},
+            timings=Timings(),
+            parse_pool=pool,
+            parse_slots=1,
+        )
+        threading.Timer(0.3, release.set).start()
+        first = next(units)
+        # One page parsing plus a full download window, nothing more
+        assert len(downloaded) <= 1 + fetcher.PREFETCH_FACTOR + 1
+        assert len([first, *units]) == 20
@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.parsing import PARSERS, get_parser
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.pages import (  # noqa: E402
+    load_dataset,
+    render_detail,
+    render_overview,
+)
+
+ALT_PARSERS = [name for name in PARSERS if name != "html.parser"]
+
+EDGE_CASES = """
+    <h2>Talents</h2>
+    <div class="mini-section">
+        <h2> Stats </h2>
+        <div class="mini-details-tile">
+            <div class="detail-label">Health <!-- hp --></div>
+            <div class="detail-info">3,400&nbsp;</div>
+        </div>
+        <div class="mini-details-tile">
+            <div class="detail-label">Empty</div>
+        </div>
+    </div>
+    <div class="mini-section other">
+        <div><h2>Advanced Mini Information</h2></div>
+        <div class="mini-content">
+            <p>Line <b>one</b></p><script>ignored()</script><p>  two </p>
+        </div>
+    </div>
+"""
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return load_dataset()
+
+
+@pytest.mark.parametrize("name", ALT_PARSERS)
+def test_detail_extraction_matches_html_parser(name, dataset):
+    units, categories = dataset
+    cats = fetcher.load_categories()
+    for unit in units:
+        html = render_detail(unit, categories)
+        expected = fetcher.parse_unit_details(html, cats)
+        assert fetcher.parse_unit_details(html, cats, parser=name) == expected
+
+
+@pytest.mark.parametrize("name", ALT_PARSERS)
+def test_detail_edge_cases_match_html_parser(name):
+    cats = fetcher.load_categories()
+    expected = fetcher.parse_unit_details(EDGE_CASES, cats)
+    assert expected["stats"] == {"Health": "3,400"}
+    assert fetcher.parse_unit_details(EDGE_CASES, cats, parser=name) == expected
+
+
+@pytest.mark.parametrize("name", ALT_PARSERS)
+def test_overview_cards_match_html_parser(name, dataset, tmp_path):
+    units, categories = dataset
+    html = render_overview(units, categories)
+    cats = fetcher.load_categories()
+    expected = [
+        fetcher._build_unit(card, {}, cats)
+        for card in fetcher._parse_overview(html).cards
+    ]
+    actual = [
+        fetcher._build_unit(card, {}, cats)
+        for card in fetcher._parse_overview(html, name).cards
+    ]
+    assert len(actual) == len(units)
+    assert actual == expected
+
+
+def test_get_parser_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        get_parser("html5lib")
+
+
+@pytest.mark.parametrize("name", PARSERS)
+def test_rendered_details_round_trip(name, dataset):
+    units, categories = dataset
+    cats = fetcher.load_categories()
+    for unit in units[:10]:
+        details = fetcher.parse_unit_details(
+            render_detail(unit, categories), cats, parser=name
+        )
+        details.pop("trait_descriptions", None)
+        assert details == unit["details"]
+
+
+@pytest.mark.parametrize("name", ["html.parser", "lxml"])
+def test_partial_parse_skips_page_chrome(name, dataset):
+    units, categories = dataset
+    backend = get_parser(name)
+    doc = backend.parse(render_detail(units[0], categories), only="mini-section")
+    assert doc.select("nav") == []
+    assert doc.select("footer") == []
+    assert len(doc.select("div.mini-section")) == 5
+    overview = backend.parse(render_overview(units, categories), only="mini-wrapper")
+    assert overview.select("li.nav-item") == []
+    assert len(overview.select("div.mini-wrapper")) == len(units)
@@ -0,0 +1,207 @@
+import asyncio
+import http.client
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from wcr_data_extraction import fetcher, transport
+from wcr_data_extraction.instrumentation import Timings
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import load  # noqa: E402
+from benchmarks.server import Faults, StandInServer, synthetic_pages  # noqa: E402
+from benchmarks.stub import FIXTURE_DIR, load_fixtures  # noqa: E402
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    # Registers the current URLs so monkeypatch restores them afterwards
+    monkeypatch.setattr(fetcher, "SITE_URL", fetcher.SITE_URL)
+    monkeypatch.setattr(fetcher, "BASE_URL", fetcher.BASE_URL)
+    servers = []
+
+    def start(faults=None, pages=None):
+        overview, details = pages or load_fixtures()
+        server = StandInServer(overview, details, faults=faults).start()
+        servers.append(server)
+        fetcher.set_site_url(server.url)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_fetch_units_from_stand_in_server(serve, tmp_path):
+    server = serve()
+    assert fetcher.BASE_URL == server.url + "/warcraft-rumble/minis"
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        max_workers=4,
+    )
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    expected = json.loads((FIXTURE_DIR / "units.json").read_text(encoding="utf-8"))
+    assert units == expected
+    assert server.stats["ok"] == len(units) + 1
+
+
+def test_cached_run_revalidates_with_etags(serve, tmp_path):
+    server = serve()
+    for _ in range(2):
+        fetcher.fetch_units(
+            out_path=tmp_path / "units.json",
+            categories_path=FIXTURE_DIR / "categories.json",
+            cache_dir=tmp_path / "cache",
+        )
+    assert server.stats["not_modified"] == server.stats["ok"]
+
+
+@pytest.mark.parametrize("engine", ["threads", "http2", "async"])
+def test_transfers_count_compressed_bytes(serve, tmp_path, engine):
+    serve(Faults(gzip=True))
+    timings = Timings()
+    kwargs = dict(
+        out_path=tmp_path / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        timings=timings,
+    )
+    if engine == "async":
+        asyncio.run(fetcher.fetch_units_async(**kwargs))
+    else:
+        session = fetcher.create_session(http2=engine == "http2")
+        fetcher.fetch_units(session=session, **kwargs)
+    bandwidth = timings.bandwidth()
+    assert bandwidth["requests"] == len(load_fixtures()[1]) + 1
+    assert bandwidth["encodings"] == {"gzip": bandwidth["requests"]}
+    assert bandwidth["body_bytes"] > 3 * bandwidth["wire_bytes"] > 0
+    assert timings.phases["ttfb"]
+
+
+def test_cached_pages_transfer_no_body(serve, tmp_path):
+    serve()
+    cache_dir = tmp_path / "cache"
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        cache_dir=cache_dir,
+    )
+    session = fetcher.create_session(cache_dir)
+    timings = Timings()
+    fetcher.fetch_overview(session, timings=timings)
+    [transfer] = timings.transfers
+    assert transfer["encoding"] == "cached"
+    assert transfer["wire_bytes"] == 0 < transfer["body_bytes"]
+
+
+def test_accept_encoding_lists_installed_codecs(monkeypatch):
+    assert fetcher.accept_encoding().endswith("gzip, deflate")
+    monkeypatch.setattr(fetcher, "find_spec", lambda name: name != "brotli")
+    assert fetcher.accept_encoding() == "br, zstd, gzip, deflate"
+    session = fetcher.create_session()
+    assert session.headers["Accept-Encoding"] == "br, zstd, gzip, deflate"
+
+
+def test_throttled_requests_raise_with_status(serve):
+    serve(Faults(throttle_rate=1.0, retry_after=None))
+    with pytest.raises(fetcher.FetchError) as exc_info:
+        fetcher.fetch_overview()
+    assert exc_info.value.status == 429
+
+
+def test_reset_drops_connection(serve):
+    server = serve(Faults(reset_rate=1.0))
+    host, port = server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    conn.request("GET", "/warcraft-rumble/minis")
+    with pytest.raises(ConnectionError):
+        conn.getresponse()
+    assert server.stats["resets"] == 1
+
+
+def test_latency_and_bandwidth_slow_down_answers(serve):
+    server = serve(Faults(latency=0.1, bandwidth=100_000))
+    start = time.perf_counter()
+    response = requests.get(fetcher.BASE_URL, timeout=5)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    assert elapsed >= 0.1 + len(response.content) / 100_000 * 0.9
+    assert server.stats["requests"] == 1
+
+
+def test_failures_repeat_for_the_same_seed():
+    outcomes = []
+    for _ in range(2):
+        server = StandInServer("", {}, faults=Faults(error_rate=0.5, seed=7))
+        outcomes.append([server.decide()[0] for _ in range(20)])
+        server.server_close()
+    assert outcomes[0] == outcomes[1]
+    assert {"ok", "error"} == set(outcomes[0])
+
+
+def test_synthetic_pages(serve, tmp_path):
+    overview, details = synthetic_pages(40)
+    assert len(details) == 40
+    assert len(fetcher._parse_overview(overview).cards) == 40
+    serve(pages=(overview, details))
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        max_workers=8,
+    )
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    assert len({unit["id"] for unit in units}) == 40
+
+
+def test_set_site_url_rejects_remote_http(monkeypatch):
+    monkeypatch.setattr(fetcher, "SITE_URL", fetcher.SITE_URL)
+    monkeypatch.setattr(fetcher, "BASE_URL", fetcher.BASE_URL)
+    assert fetcher.is_allowed_url("http://localhost:8000")
+    assert fetcher.is_allowed_url("http://[::1]:8000/x")
+    assert not fetcher.is_allowed_url("http://example.com")
+    with pytest.raises(fetcher.FetchError):
+        fetcher.set_site_url("http://example.com")
+    fetcher.set_site_url("https://mirror.example/")
+    assert fetcher.BASE_URL == "https://mirror.example/warcraft-rumble/minis"
+
+
+def test_load_run_once_counts_requests(monkeypatch, tmp_path):
+    monkeypatch.setattr(fetcher, "SITE_URL", fetcher.SITE_URL)
+    monkeypatch.setattr(fetcher, "BASE_URL", fetcher.BASE_URL)
+    overview, details = load_fixtures()
+    with StandInServer(overview, details) as server:
+        row = load.run_once(server, tmp_path, workers=4)
+    assert row["error"] is None
+    assert row["requests"] == row["ok"] == len(details) + 1
+    assert row["wire_bytes"] == row["body_bytes"] > 0
+    assert fetcher.SITE_URL == "https://www.method.gg"
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+@pytest.mark.parametrize("adaptive", [False, True])
+def test_failing_page_is_retried_once_per_budget(
+    serve, tmp_path, monkeypatch, engine, adaptive
+):
+    monkeypatch.setattr(fetcher, "OVERLOAD_BACKOFF", 0)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    monkeypatch.setattr(transport, "RETRY_BACKOFF", 0)
+    server = serve(Faults(error_rate=1.0))
+    overview = fetcher._parse_overview(load_fixtures()[0])
+    # A single detail page, so every request goes to the same URL
+    overview = fetcher.Overview(cards=overview.cards[:1])
+    kwargs = dict(
+        out_path=tmp_path / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        overview=overview,
+        adaptive=adaptive,
+    )
+    with pytest.raises(fetcher.FetchError):
+        if engine == "async":
+            asyncio.run(fetcher.fetch_units_async(**kwargs))
+        else:
+            fetcher.fetch_units(**kwargs)
+    assert server.stats["requests"] == fetcher.OVERLOAD_RETRIES + 1 == 4
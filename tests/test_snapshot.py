@@ -0,0 +1,82 @@
+import copy
+import json
+
+import pytest
+
+from wcr_data_extraction import fetcher
+from wcr_data_extraction.manifest import commit_export
+from wcr_data_extraction.snapshot import freeze, load_snapshot
+
+
+def counting_loads(calls: list):
+    def build(text: str):
+        calls.append(text)
+        return json.loads(text)
+
+    return build
+
+
+def test_file_is_parsed_once_until_it_changes(tmp_path):
+    path = tmp_path / "units.json"
+    path.write_text('[{"id": "footman"}]')
+    calls: list = []
+    build = counting_loads(calls)
+    first = load_snapshot(path, build)
+    assert load_snapshot(path, build) is first
+    assert len(calls) == 1
+    path.write_text('[{"id": "footman"}, {"id": "ghoul"}]')
+    assert len(load_snapshot(path, build)) == 2
+    assert len(calls) == 2
+
+
+def test_own_writer_invalidates_snapshot(tmp_path):
+    path = tmp_path / "units.json"
+    path.write_text('[{"id": "footman"}]')
+    assert set(fetcher.load_existing_units(path)) == {"footman"}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text('[{"id": "grunt!"}]')
+    commit_export(tmp, path, "digest")
+    assert set(fetcher.load_existing_units(path)) == {"grunt!"}
+
+
+def test_snapshots_are_read_only():
+    data = freeze({"names": {"en": "Footman"}, "trait_ids": ["melee"]})
+    with pytest.raises(TypeError):
+        data["names"]["de"] = "Fußsoldat"
+    with pytest.raises(TypeError):
+        data["trait_ids"].append("tank")
+    assert json.loads(json.dumps(data)) == data
+    clone = copy.deepcopy(data)
+    clone["names"]["de"] = "Fußsoldat"
+    clone["trait_ids"].append("tank")
+    assert data == {"names": {"en": "Footman"}, "trait_ids": ["melee"]}
+
+
+def test_loaders_return_snapshots_and_iter_units_copies(tmp_path, site, run_units):
+    run_units()
+    existing = fetcher.load_existing_units(tmp_path / "units.json")
+    with pytest.raises(TypeError):
+        existing["footman"]["names"]["de"] = "Fußsoldat"
+
+    site.minis["grunt"] = 2
+    units = fetcher.iter_units(
+        categories_path=tmp_path / "cats.json",
+        existing_path=tmp_path / "units.json",
+        session=site.session(),
+    )
+    for unit in units:
+        unit["names"]["de"] = unit["names"]["en"]
+        unit["details"]["stats"]["Speed"] = "Slow"
+    assert (
+        "de"
+        not in fetcher.load_existing_units(tmp_path / "units.json")["footman"]["names"]
+    )
+
+
+def test_categories_loaded_once_per_content(tmp_path):
+    path = tmp_path / "cats.json"
+    path.write_text(
+        json.dumps({"factions": [{"id": "horde", "names": {"en": "Horde"}}]})
+    )
+    assert fetcher.load_categories(path) is fetcher.load_categories(path)
+    assert fetcher.load_categories(path)["faction"] == {"Horde": "horde"}
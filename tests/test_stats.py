@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import pytest
+
+from wcr_data_extraction import fetcher, stats
+from wcr_data_extraction.stats import normalize_stats, parse_stat, stat_key
+
+CATEGORIES = {"trait": {}, "trait_desc": {}}
+
+
+@pytest.mark.parametrize(
+    "label, key",
+    [
+        ("Health", "health"),
+        ("Attack Speed", "attack_speed"),
+        ("Rend Dmg", "rend_damage"),
+        ("Lvl Advantage", "level_advantage"),
+        ("Burn Damage (8s DoT)", "burn_damage_8s_dot"),
+        ("Moonfire DoT (2.5s)", "moonfire_dot_2_5s"),
+    ],
+)
+def test_stat_key(label, key):
+    assert stat_key(label) == key
+
+
+@pytest.mark.parametrize(
+    "value, parsed",
+    [
+        ("3,400", (3400, None)),
+        ("2.5", (2.5, None)),
+        (" 1,000.5 ", (1000.5, None)),
+        ("0.5 sec", (0.5, "s")),
+        ("5%", (5, "%")),
+        ("Slow", None),
+        ("Melee", None),
+        ("", None),
+    ],
+)
+def test_parse_stat(value, parsed):
+    assert parse_stat(value) == parsed
+
+
+def test_normalize_stats_adds_units_and_skips_text():
+    stats = {
+        "Health": "3,400",
+        "Attack Speed": "2.5",
+        "Roots Duration": "3",
+        "Percent Dmg": "50",
+        "Lvl Advantage": "0.5 sec",
+        "Speed": "Slow",
+    }
+    assert normalize_stats(stats) == {
+        "health": {"value": 3400, "label": "Health"},
+        "attack_speed": {"value": 2.5, "label": "Attack Speed", "unit": "s"},
+        "roots_duration": {"value": 3, "label": "Roots Duration", "unit": "s"},
+        "percent_damage": {"value": 50, "label": "Percent Dmg", "unit": "%"},
+        "level_advantage": {"value": 0.5, "label": "Lvl Advantage", "unit": "s"},
+    }
+
+
+def test_normalize_stats_logs_key_collisions():
+    with patch.object(stats, "logger") as mock_logger:
+        normalized = normalize_stats({"Rend Dmg": "10", "Rend Damage": "12"})
+    assert normalized == {"rend_damage": {"value": 10, "label": "Rend Dmg"}}
+    mock_logger.warning.assert_called_once()
+    assert "rend_damage" in mock_logger.warning.call_args.args
+
+
+def test_parse_unit_details_keeps_display_strings():
+    html = """
+    <div class="mini-section">
+        <h2>Stats</h2>
+        <div class="mini-details-tile">
+            <div class="detail-label">Health</div>
+            <div class="detail-info">3,400</div>
+        </div>
+        <div class="mini-details-tile">
+            <div class="detail-label">Speed</div>
+            <div class="detail-info">Slow</div>
+        </div>
+    </div>
+    """
+    details = fetcher.parse_unit_details(html, CATEGORIES)
+    assert details["stats"] == {"Health": "3,400", "Speed": "Slow"}
+    assert details["stats_normalized"] == {"health": {"value": 3400, "label": "Health"}}
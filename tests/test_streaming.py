@@ -0,0 +1,108 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from wcr_data_extraction import fetcher
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks import stub  # noqa: E402
+
+
+def read_lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_iter_units_yields_in_completion_order(tmp_path, site):
+    release = threading.Event()
+    answer = site.answer
+
+    def held_answer(url, etag):
+        if url.endswith("/footman"):
+            assert release.wait(5)
+        return answer(url, etag)
+
+    site.answer = held_answer
+    units = fetcher.iter_units(
+        categories_path=tmp_path / "cats.json",
+        existing_path=tmp_path / "units.json",
+        session=site.session(),
+        max_workers=2,
+    )
+    # Footman is still downloading when Ghoul is handed out
+    assert next(units)["id"] == "ghoul"
+    release.set()
+    assert [unit["id"] for unit in units] == ["footman"]
+
+
+def test_iter_units_limits_pages_ahead_of_consumer(tmp_path, site):
+    site.minis = {f"mini-{index}": 1 for index in range(20)}
+    units = fetcher.iter_units(
+        categories_path=tmp_path / "cats.json",
+        existing_path=tmp_path / "units.json",
+        session=site.session(),
+    )
+    next(units)
+    assert len(site.requests) <= 2 + fetcher.PREFETCH_FACTOR
+    units.close()
+    assert len(site.requests) < len(site.minis)
+
+
+def test_ndjson_output_matches_json(tmp_path):
+    overview, pages = stub.load_fixtures()
+    for output_format in fetcher.OUTPUT_FORMATS:
+        fetcher.fetch_units(
+            out_path=tmp_path / f"units.{output_format}",
+            categories_path=stub.FIXTURE_DIR / "categories.json",
+            session=stub.stub_session(overview, pages),
+            max_workers=4,
+            output_format=output_format,
+        )
+    expected = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    lines = read_lines(tmp_path / "units.ndjson")
+    assert sorted(lines, key=lambda unit: unit["id"]) == sorted(
+        expected, key=lambda unit: unit["id"]
+    )
+    existing = fetcher.load_existing_units(tmp_path / "units.ndjson")
+    assert set(existing) == {unit["id"] for unit in expected}
+
+
+async def test_async_ndjson_keeps_stale_units(tmp_path, site, run_units_async):
+    out_path = tmp_path / "units.ndjson"
+    out_path.write_text(json.dumps({"id": "old", "names": {"en": "Old"}}) + "\n")
+    site.minis = {"footman": 1}
+    await run_units_async(out_path=out_path, output_format="ndjson")
+    assert [unit["id"] for unit in read_lines(out_path)] == ["footman", "old"]
+
+
+def test_unknown_format_keeps_existing_file(tmp_path, site, run_units):
+    out_path = tmp_path / "units.json"
+    out_path.write_text("[]")
+    site.minis = {}
+    with pytest.raises(ValueError):
+        run_units(output_format="xml")
+    assert out_path.read_text() == "[]"
+    assert not out_path.with_suffix(".tmp").exists()
+
+
+async def test_async_parse_processes_match_threaded_output(tmp_path):
+    overview, pages = stub.load_fixtures()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        html = overview if url == fetcher.BASE_URL else pages[url.rsplit("/", 1)[1]]
+        return httpx.Response(200, text=html)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await fetcher.fetch_units_async(
+            out_path=tmp_path / "units.json",
+            categories_path=stub.FIXTURE_DIR / "categories.json",
+            client=client,
+            parse_processes=2,
+        )
+    assert (tmp_path / "units.json").read_bytes() == (
+        stub.FIXTURE_DIR / "units.json"
+    ).read_bytes()
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import ssl
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+
+from wcr_data_extraction import fetcher, transport
+from wcr_data_extraction.cache import CachingAdapter, HTTPCache
+from wcr_data_extraction.transport import HTTP2Adapter, pool_stats
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.server import Faults, StandInServer  # noqa: E402
+from benchmarks.stub import FIXTURE_DIR, load_fixtures  # noqa: E402
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # Registers the current URLs so monkeypatch restores them afterwards
+    monkeypatch.setattr(fetcher, "SITE_URL", fetcher.SITE_URL)
+    monkeypatch.setattr(fetcher, "BASE_URL", fetcher.BASE_URL)
+    monkeypatch.setattr(transport.time, "sleep", lambda _: None)
+    overview, details = load_fixtures()
+    servers = []
+
+    def start(faults=None):
+        stand_in = StandInServer(overview, details, faults=faults).start()
+        servers.append(stand_in)
+        fetcher.set_site_url(stand_in.url)
+        return stand_in
+
+    yield start
+    for stand_in in servers:
+        stand_in.stop()
+
+
+def _expected_units() -> list:
+    return json.loads((FIXTURE_DIR / "units.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("http2", [False, True])
+def test_pooled_session_reuses_connections(server, tmp_path, http2):
+    stand_in = server()
+    session = fetcher.create_session(pool_size=4, http2=http2)
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        max_workers=4,
+        session=session,
+    )
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    assert units == _expected_units()
+
+    stats = pool_stats(session)
+    requests = stand_in.stats["requests"]
+    assert 1 <= stats["opened"] <= 4
+    assert stats["reused"] == requests - stats["opened"]
+    assert stats["discarded"] == 0
+    session.close()
+
+
+def test_pool_size_gives_session_own_adapter():
+    session = fetcher.create_session(pool_size=32)
+    mounted = session.get_adapter("https://www.method.gg")
+    assert mounted is not fetcher.adapter
+    assert mounted._pool_maxsize == 32
+    assert (
+        fetcher.create_session(pool_size=2)
+        .get_adapter("https://www.method.gg")
+        ._pool_maxsize
+        == fetcher.DEFAULT_POOL_SIZE
+    )
+    assert fetcher.create_session().get_adapter("https://x") is fetcher.adapter
+
+
+def test_http2_adapter_retries_server_errors(server):
+    stand_in = server(Faults(error_rate=1.0))
+    session = fetcher.create_session(http2=True)
+    with pytest.raises(fetcher.FetchError) as exc_info:
+        fetcher.fetch_overview(session)
+    assert fetcher._is_overload(exc_info.value)
+    assert stand_in.stats["requests"] == transport.RETRIES + 1
+    session.close()
+
+
+def test_adaptive_session_leaves_detail_retries_to_limiter(server):
+    stand_in = server(Faults(error_rate=1.0))
+    session = fetcher.create_session(http2=True, adaptive=True)
+    with pytest.raises(fetcher.FetchError) as exc_info:
+        fetcher._fetch_unit_page(
+            fetcher.BASE_URL + "/footman",
+            timeout=5,
+            session=session,
+            timings=fetcher.Timings(),
+        )
+    assert exc_info.value.status == 503
+    assert stand_in.stats["requests"] == 1
+    # The overview keeps the transport retries
+    with pytest.raises(fetcher.FetchError):
+        fetcher.fetch_overview(session)
+    assert stand_in.stats["requests"] == 1 + transport.RETRIES + 1
+    session.close()
+
+
+def test_http2_adapter_raises_connection_errors(server):
+    stand_in = server(Faults(reset_rate=1.0))
+    session = fetcher.create_session(http2=True)
+    with pytest.raises(fetcher.FetchError):
+        fetcher.fetch_overview(session)
+    assert stand_in.stats["resets"] == transport.RETRIES + 1
+    session.close()
+
+
+def test_adaptive_http2_run_survives_connection_resets(server, tmp_path):
+    stand_in = server(Faults(reset_rate=0.2, seed=3))
+    session = fetcher.create_session(pool_size=4, http2=True, adaptive=True)
+    fetcher.fetch_units(
+        out_path=tmp_path / "units.json",
+        categories_path=FIXTURE_DIR / "categories.json",
+        max_workers=4,
+        session=session,
+        adaptive=True,
+    )
+    assert stand_in.stats["resets"] > 0
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    assert units == _expected_units()
+    session.close()
+
+
+def test_http2_adapter_honours_connection_settings(server):
+    site = server()
+    proxy = StandInServer(*load_fixtures()).start()
+    session = requests.Session()
+    session.mount("http://", HTTP2Adapter())
+    try:
+        session.get(fetcher.BASE_URL, proxies={"http": proxy.url}, timeout=5)
+        assert proxy.stats["requests"] == 1
+        assert site.stats["requests"] == 0
+        session.get(fetcher.BASE_URL, verify=False, timeout=5)
+        assert site.stats["requests"] == 1
+    finally:
+        session.close()
+        proxy.stop()
+    assert transport._ssl_context(False, None) is False
+    context = transport._ssl_context(DEFAULT_CA_BUNDLE_PATH, None)
+    assert context.verify_mode == ssl.CERT_REQUIRED
+
+
+def test_pool_stats_looks_through_cache(tmp_path):
+    adapter = HTTP2Adapter(max_connections=2)
+    session = MagicMock(
+        adapters={
+            "https://": CachingAdapter(HTTPCache(tmp_path), adapter),
+            "http://": adapter,
+        }
+    )
+    assert pool_stats(session) == {"opened": 0, "reused": 0, "discarded": 0}
+    assert pool_stats(MagicMock()) is None
+    assert pool_stats(MagicMock(adapters={"https://": MagicMock()})) is None
+    adapter.close()
+
+
+def test_async_engine_over_http2(server, tmp_path):
+    server()
+    asyncio.run(
+        fetcher.fetch_units_async(
+            out_path=tmp_path / "units.json",
+            categories_path=FIXTURE_DIR / "categories.json",
+            max_concurrency=4,
+            http2=True,
+        )
+    )
+    units = json.loads((tmp_path / "units.json").read_text(encoding="utf-8"))
+    assert units == _expected_units()
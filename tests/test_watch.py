@@ -0,0 +1,137 @@
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from wcr_data_extraction import cli, fetcher
+from wcr_data_extraction.cache import CachingAdapter, HTTPCache
+from wcr_data_extraction.watch import Watcher
+
+CARD = (
+    "<div class='mini-wrapper' data-name='{name}' data-family='Alliance' "
+    "data-type='Troop' data-cost='{cost}'></div>"
+)
+
+
+def page(cost: int = 2, status: int = 200, **headers) -> Mock:
+    return Mock(
+        status_code=status, text=CARD.format(name="Footman", cost=cost), headers=headers
+    )
+
+
+def make_watcher(responses, scrape=None, **kwargs) -> Watcher:
+    session = Mock()
+    session.get.side_effect = responses
+    return Watcher(scrape or Mock(), session=session, interval=60, **kwargs)
+
+
+def test_scrapes_only_when_cards_change(tmp_path):
+    watcher = make_watcher(
+        [page(ETag='"a"'), page(status=304), page(ETag='"b"'), page(cost=3)],
+        status_path=tmp_path / "status.json",
+    )
+    assert [watcher.tick() for _ in range(4)] == [True, False, False, True]
+    assert watcher.scrape.call_count == 2
+    second_probe = watcher.session.get.call_args_list[1]
+    assert second_probe.kwargs["headers"]["If-None-Match"] == '"a"'
+    status = json.loads((tmp_path / "status.json").read_text())
+    assert status["scrapes"] == 2
+    assert status["last_success"] >= status["last_change"]
+    assert status["last_error"] is None
+
+
+def test_failed_scrape_is_retried():
+    scrape = Mock(side_effect=[fetcher.FetchError("boom"), None])
+    watcher = make_watcher([page(ETag='"a"'), page(ETag='"a"')], scrape)
+    assert not watcher.tick()
+    assert watcher.status["last_error"] == "boom"
+    assert watcher.status["last_success"] is None
+    # The failed answer's validators were not kept, so the page is re-read
+    assert "If-None-Match" not in watcher.session.get.call_args.kwargs["headers"]
+    assert watcher.tick()
+    assert scrape.call_count == 2
+
+
+def test_probe_error_keeps_running():
+    watcher = make_watcher([page(status=503)])
+    assert not watcher.tick()
+    assert "503" in watcher.status["last_error"]
+
+
+def test_run_stops_after_current_tick():
+    watcher = make_watcher([page()], jitter=0.5)
+    watcher.scrape.side_effect = lambda overview: watcher.stop()
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert watcher.scrape.call_count == 1
+    assert 30 <= watcher.delay() <= 90
+
+
+def test_cli_watch_uses_one_session(tmp_path):
+    args = ["--log-file", str(tmp_path / "log.json"), "--watch", "30"]
+    with patch.object(cli, "create_session") as cs, patch.object(
+        cli, "Watcher"
+    ) as watcher_cls, patch.object(cli.signal, "signal") as sig:
+        cli.main(args)
+    assert watcher_cls.call_args.kwargs["interval"] == 30
+    assert watcher_cls.call_args.kwargs["session"] is cs.return_value
+    sig.assert_any_call(cli.signal.SIGTERM, watcher_cls.return_value.stop)
+    watcher_cls.return_value.run.assert_called_once()
+    cs.return_value.close.assert_called_once()
+
+
+class OverviewAdapter(BaseAdapter):
+    """Answer with one overview page and ``304`` for its ETag."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.statuses: list[int] = []
+
+    def send(self, request, **kwargs) -> Response:
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.headers = CaseInsensitiveDict({"ETag": '"a"'})
+        if request.headers.get("If-None-Match") == '"a"':
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response._content = CARD.format(name="Footman", cost=2).encode()
+        self.statuses.append(response.status_code)
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def test_cached_not_modified_skips_parsing(tmp_path):
+    adapter = OverviewAdapter()
+    session = requests.Session()
+    session.mount("https://", CachingAdapter(HTTPCache(tmp_path), adapter))
+    watcher = Watcher(Mock(), session=session, interval=60)
+    with patch.object(
+        fetcher, "_parse_overview", wraps=fetcher._parse_overview
+    ) as parse:
+        assert [watcher.tick() for _ in range(3)] == [True, False, False]
+    assert adapter.statuses == [200, 304, 304]
+    assert parse.call_count == 1
+
+
+def test_unexpected_error_keeps_running(tmp_path):
+    scrape = Mock(side_effect=[OSError("disk full"), None])
+    watcher = make_watcher(
+        [page(ETag='"a"'), page(ETag='"a"')],
+        scrape,
+        status_path=tmp_path / "status.json",
+    )
+    assert not watcher.tick()
+    assert watcher.status["last_error"] == "OSError: disk full"
+    assert watcher.tick()
+    assert watcher.status["last_error"] is None